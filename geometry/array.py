@@ -0,0 +1,286 @@
+"""
+Array-backed containers for batched point operations.
+
+This module needs numpy. The rest of the package does not, so it is not
+imported by ``geometry/__init__.py``; import it explicitly:
+
+    from geometry.array import PointArray
+"""
+import numpy as np
+
+from .exception import filldedent
+from .line import Line, Ray, Segment
+from .point import Point
+from .tolerance import resolve
+
+
+class PointArray(object):
+    """A batch of 2D or 3D points stored in one ``(N, 2)`` or ``(N, 3)`` float array.
+
+    The methods mirror those of ``Point``/``Point2D`` but work on every point at
+    once. ``other`` arguments may be a single point (broadcast to every row) or
+    another PointArray of the same length (paired row by row).
+    """
+    __slots__ = ('coords',)
+
+    def __init__(self, coords, dim=None):
+        if isinstance(coords, PointArray):
+            coords = coords.coords
+        elif not isinstance(coords, np.ndarray):
+            coords = [tuple(p) for p in coords]
+        coords = np.asarray(coords, dtype=float)
+        if coords.size == 0:
+            coords = coords.reshape(0, dim or 2)
+        if coords.ndim != 2 or coords.shape[1] not in (2, 3):
+            raise ValueError(filldedent('''
+                PointArray needs an array of shape (N, 2) or (N, 3), got %s''' % (coords.shape,)))
+        if dim is not None and coords.shape[1] != dim:
+            raise ValueError(filldedent('''
+                PointArray of dimension %s can't hold %sD points''' % (dim, coords.shape[1])))
+        self.coords = coords
+
+    @classmethod
+    def from_points(cls, points):
+        """Build a PointArray from an iterable of Point objects or coordinate tuples."""
+        return cls([tuple(p) for p in points])
+
+    def to_points(self):
+        """Return the points as a list of ``Point2D``/``Point3D`` objects."""
+        return [Point(c) for c in self.coords.tolist()]
+
+    def __len__(self):
+        return self.coords.shape[0]
+
+    def __iter__(self):
+        for c in self.coords.tolist():
+            yield Point(c)
+
+    def __getitem__(self, item):
+        """An integer index returns a Point, anything else returns a PointArray."""
+        if isinstance(item, (int, np.integer)):
+            return Point(self.coords[item].tolist())
+        return PointArray(self.coords[item])
+
+    def __repr__(self):
+        return type(self).__name__ + '(' + repr(self.coords.tolist()) + ')'
+
+    __str__ = __repr__
+
+    def __eq__(self, other):
+        if not isinstance(other, PointArray):
+            return False
+        return np.array_equal(self.coords, other.coords)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    @property
+    def dim(self):
+        """Return the dimension of the points"""
+        return self.coords.shape[1]
+
+    @property
+    def x(self):
+        return self.coords[:, 0]
+
+    @property
+    def y(self):
+        return self.coords[:, 1]
+
+    @property
+    def z(self):
+        if self.dim < 3:
+            raise AttributeError("2D points don't have z coordinates")
+        return self.coords[:, 2]
+
+    @property
+    def bounds(self):
+        """Return a tuple (xmin, ymin, xmax, ymax) of all the points."""
+        if not len(self):
+            raise ValueError("bounds of an empty PointArray")
+        lo = self.coords[:, :2].min(axis=0)
+        hi = self.coords[:, :2].max(axis=0)
+        return (float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1]))
+
+    def _other(self, p):
+        """Return the coordinates of p as an array that broadcasts against self.coords"""
+        if isinstance(p, PointArray):
+            other = p.coords
+            if other.shape != self.coords.shape:
+                raise ValueError(filldedent('''
+                    PointArray shapes %s and %s don't match''' % (self.coords.shape, other.shape)))
+            return other
+        other = np.asarray(tuple(p), dtype=float)
+        if other.shape != (self.dim,):
+            raise ValueError(filldedent('''
+                Point %s doesn't match the dimension of the PointArray''' % (p,)))
+        return other
+
+    def __add__(self, other):
+        return PointArray(self.coords + self._other(other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return PointArray(self.coords - self._other(other))
+
+    def __rsub__(self, other):
+        return PointArray(self._other(other) - self.coords)
+
+    def __mul__(self, factor):
+        """Multiply every point by a scalar, or by one scalar per point."""
+        factor = np.asarray(factor, dtype=float)
+        if factor.ndim == 1:
+            factor = factor[:, None]
+        return PointArray(self.coords * factor)
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return PointArray(-self.coords)
+
+    def __abs__(self):
+        """Return the distances between every point and the origin"""
+        return np.sqrt(np.einsum('ij,ij->i', self.coords, self.coords))
+
+    def distance(self, p=None):
+        """Return the Euclidean distance from every point to p (the origin by default)."""
+        if p is None:
+            return abs(self)
+        d = self.coords - self._other(p)
+        return np.sqrt(np.einsum('ij,ij->i', d, d))
+
+    def taxicab_distance(self, p):
+        """Return the Taxicab Distance from every point to p."""
+        return np.abs(self.coords - self._other(p)).sum(axis=1)
+
+    def dot(self, p):
+        """Return the dot product of every point with p"""
+        other = np.broadcast_to(self._other(p), self.coords.shape)
+        return np.einsum('ij,ij->i', self.coords, other)
+
+    def midpoint(self, p):
+        """Return the midpoints between every point and p"""
+        return PointArray((self.coords + self._other(p)) / 2)
+
+    def project(self, p):
+        """Project every point onto the line between p and the origin"""
+        other = np.broadcast_to(self._other(p), self.coords.shape)
+        num = np.einsum('ij,ij->i', self.coords, other)
+        den = np.einsum('ij,ij->i', other, other)
+        return PointArray(other * (num / den)[:, None])
+
+    def unit(self):
+        """Return every point scaled to a distance of 1 from the origin"""
+        return PointArray(self.coords / abs(self)[:, None])
+
+    def cross(self, p):
+        """Return the 2D cross product of every point with p"""
+        self._require_2d('cross')
+        other = np.broadcast_to(self._other(p), self.coords.shape)
+        return self.coords[:, 0] * other[:, 1] - self.coords[:, 1] * other[:, 0]
+
+    def rotate(self, angle, pt=(0, 0)):
+        """Rotate every point counterclockwise about Point ``pt``
+
+        :param angle: arc system
+        Coordinates are rounded like ``Point2D.rotate`` does.
+        """
+        self._require_2d('rotate')
+        origin = self._other(pt)
+        s, c = np.sin(angle), np.cos(angle)
+        x, y = (self.coords - origin).T
+        return PointArray(np.round(np.column_stack((x * c - y * s, x * s + y * c)), 6))
+
+    def translate(self, x=0, y=0, z=0):
+        if self.dim == 2:
+            return PointArray(self.coords + (x, y))
+        return PointArray(self.coords + (x, y, z))
+
+    def scale(self, x=1, y=1, z=1):
+        if self.dim == 2:
+            return PointArray(self.coords * (x, y))
+        return PointArray(self.coords * (x, y, z))
+
+    def equals(self, p, tol=None):
+        """Vectorized ``Point.equals``: whether every point equals p, or the
+        matching point of a PointArray, within the tolerance ``tol`` or the one
+        in effect"""
+        return nearly_eq(self.coords, self._other(p), tol).all(axis=1)
+
+    def on(self, entity, tol=None):
+        """Vectorized ``entity.contains(point)``: whether every point lies on
+        the Line, Ray or Segment, within the tolerance ``tol`` or the one in effect"""
+        if isinstance(entity, Segment):
+            lo, hi = 0.0, 1.0
+        elif isinstance(entity, Ray):
+            lo, hi = 0.0, np.inf
+        elif isinstance(entity, Line):
+            lo, hi = -np.inf, np.inf
+        else:
+            raise ValueError("expected a Line, Ray or Segment, got %s" % type(entity).__name__)
+        p1, p2 = self._other(entity.p1), self._other(entity.p2)
+        d = p2 - p1
+        rel = self.coords - p1
+        tol = resolve(tol)
+        if not tol.exact:
+            t = np.clip(rel.dot(d) / d.dot(d), lo, hi)
+            return nearly_eq(p1 + t[:, None] * d, self.coords, tol).all(axis=1)
+
+        # the exact tests of the scalar contains methods
+        from .intersect import _orient_zero
+        n = len(self)
+        c = self.coords
+        on_line = np.ones(n, dtype=bool)
+        for i, j in ((0, 1), (0, 2), (1, 2))[:1 if self.dim == 2 else 3]:
+            on_line &= _orient_zero(np.full(n, p1[i]), np.full(n, p1[j]), c[:, i], c[:, j],
+                                    np.full(n, p2[i]), np.full(n, p2[j]))
+        if lo == 0.0 and hi == 1.0:
+            return on_line & (np.einsum('ij,ij->i', p1 - c, p2 - c) <= 0)
+        if lo == 0.0:
+            return on_line & (rel.dot(d) >= 0)
+        return on_line
+
+    def _require_2d(self, name):
+        if self.dim != 2:
+            raise ValueError("%s is only defined for 2D points" % name)
+
+
+def _ordinal(x):
+    """Map floats to int64 so that adjacent floats map to adjacent ints"""
+    i = np.asarray(x, dtype=np.float64).view(np.int64)
+    return np.where(i >= 0, i, -(i & np.int64(0x7fffffffffffffff)))
+
+
+def ulp_distance(a, b):
+    """Vectorized ``tolerance.ulp_distance``, saturating at the int64 maximum"""
+    oa, ob = np.broadcast_arrays(_ordinal(np.asarray(a, dtype=float)), _ordinal(np.asarray(b, dtype=float)))
+    far = np.abs(oa.astype(float) - ob.astype(float)) > 2.0 ** 62
+    with np.errstate(over='ignore'):
+        d = np.abs(oa - ob)
+    return np.where(far, np.iinfo(np.int64).max, d)
+
+
+def nearly_eq(a, b, tol=None):
+    """Vectorized ``Tolerance.eq``: elementwise whether a and b are equal within
+    the tolerance ``tol`` or the one in effect (see geometry.tolerance)"""
+    tol = resolve(tol)
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    eq = a == b
+    if tol.exact:
+        return eq
+    d = np.abs(a - b)
+    eq |= d <= tol.abs
+    if tol.rel:
+        eq |= d <= tol.rel * np.maximum(np.abs(a), np.abs(b))
+    if tol.ulps:
+        eq |= ulp_distance(a, b) <= tol.ulps
+    return eq
+
+
+def nearly_zero(v, tol=None):
+    """Vectorized ``Tolerance.zero``"""
+    return nearly_eq(v, 0.0, tol)
@@ -1,5 +1,33 @@
+from . import settings
+
+
+class cached_property(object):
+    """A read-only property computed once per instance.
+
+    Entities are immutable, so the value is stored in the instance ``__dict__``
+    on first access and found there directly afterwards. Nothing is stored while
+    ``settings.CACHE_PROPERTIES`` is False. Only for classes whose instances
+    have a ``__dict__``, i.e. not the slotted points.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        value = self.func(obj)
+        if settings.CACHE_PROPERTIES:
+            obj.__dict__[self.name] = value
+        return value
+
 
 class GeometryEntity():
+    # Subclasses that declare their own __slots__ (e.g. Point2D) don't get a
+    # per-instance __dict__; the others still do.
+    __slots__ = ('_args', '_mhash')
 
     def __new__(cls, *args, **kwargs):
         obj = object.__new__(cls)
@@ -18,6 +46,12 @@ class GeometryEntity():
     def args(self):
         return self._args
 
+    def clear_cache(self):
+        """Drop the values kept by cached properties"""
+        d = getattr(self, '__dict__', None)
+        if d:
+            d.clear()
+
     def __ne__(self, o):
         """Test inequality of two geometrical entities."""
         return not self.__eq__(o)
@@ -25,7 +59,7 @@ class GeometryEntity():
     def __getnewargs__(self):
         return tuple(self.args)
 
-
-
-
-
+    def __reduce__(self):
+        """Rebuild from the args alone, so slotted entities pickle with every
+        protocol and cached values are never written out."""
+        return (type(self), self.__getnewargs__())
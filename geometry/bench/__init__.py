@@ -0,0 +1,117 @@
+"""
+Benchmark suite for the geometry package.
+
+Every case is timed with ``timeit``; when sympy is installed the same
+operation is also timed on ``sympy.geometry`` for comparison. Results are
+saved as JSON and can be compared against a saved baseline to catch
+regressions. Nothing here needs a network connection.
+
+Run it with ``python -m geometry.bench --help``.
+"""
+import json
+import platform
+import time
+import timeit
+
+try:
+    import sympy as _sympy
+    import sympy.geometry as sympy_geometry
+except ImportError:
+    _sympy = sympy_geometry = None
+
+FORMAT_VERSION = 1
+
+# registered cases, in the order they were defined: (group, name, factory, sympy_factory)
+CASES = []
+
+
+def case(group, name, sympy=None):
+    """Register a benchmark.
+
+    The decorated function builds the inputs and returns a zero-argument
+    callable doing the timed work. ``sympy`` is an optional factory returning
+    the equivalent callable on ``sympy.geometry`` objects; it is passed the
+    ``sympy.geometry`` module.
+    """
+    def register(factory):
+        CASES.append((group, name, factory, sympy))
+        return factory
+    return register
+
+
+def _time(func, repeat, min_time):
+    """Seconds per call: the best of ``repeat`` runs of at least ``min_time`` each"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(pattern=None, repeat=5, min_time=0.2, with_sympy=True, out=None):
+    """Time every registered case whose "group.name" contains ``pattern``.
+
+    :return: dict as written by ``save``
+    """
+    results = {}
+    for group, name, factory, sympy_factory in CASES:
+        key = group + '.' + name
+        if pattern and pattern not in key:
+            continue
+        entry = {'seconds': _time(factory(), repeat, min_time), 'sympy_seconds': None}
+        if with_sympy and sympy_factory is not None and sympy_geometry is not None:
+            entry['sympy_seconds'] = _time(sympy_factory(sympy_geometry), repeat, min_time)
+        results[key] = entry
+        if out is not None:
+            out.write(format_line(key, entry) + '\n')
+            out.flush()
+    return {
+        'version': FORMAT_VERSION,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sympy': _sympy.__version__ if _sympy is not None else None,
+        'results': results,
+    }
+
+
+def format_line(key, entry):
+    line = "{:<40} {:>12.3f} us".format(key, entry['seconds'] * 1e6)
+    if entry.get('sympy_seconds'):
+        line += "   sympy {:>12.3f} us  ({:.1f}x faster)".format(
+            entry['sympy_seconds'] * 1e6, entry['sympy_seconds'] / entry['seconds'])
+    return line
+
+
+def save(report, path):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def load(path):
+    with open(path) as f:
+        report = json.load(f)
+    if report.get('version') != FORMAT_VERSION:
+        raise ValueError("unsupported benchmark file version %s" % report.get('version'))
+    return report
+
+
+def compare(report, baseline, threshold=1.25):
+    """Compare two reports case by case.
+
+    :param threshold: a case regressed when it takes more than threshold times
+        its baseline time
+    :return: list of (key, baseline seconds, seconds, ratio) for the regressed cases
+    """
+    regressions = []
+    old = baseline['results']
+    for key, entry in sorted(report['results'].items()):
+        if key not in old:
+            continue
+        ratio = entry['seconds'] / old[key]['seconds']
+        if ratio > threshold:
+            regressions.append((key, old[key]['seconds'], entry['seconds'], ratio))
+    return regressions
+
+
+# importing the cases registers them
+from . import cases  # noqa: E402,F401
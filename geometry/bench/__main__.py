@@ -0,0 +1,45 @@
+"""
+Command line entry point:
+
+    python -m geometry.bench                       # run and print everything
+    python -m geometry.bench -k polygon            # only cases matching "polygon"
+    python -m geometry.bench --save base.json      # store the results
+    python -m geometry.bench --baseline base.json  # flag cases slower than base.json
+
+The exit status is 1 when a regression was found.
+"""
+import argparse
+import sys
+
+from . import compare, load, run, save
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m geometry.bench', description=__doc__.split('\n\n')[0])
+    parser.add_argument('-k', dest='pattern', help='only run cases whose "group.name" contains this')
+    parser.add_argument('--save', metavar='PATH', help='write the results as JSON')
+    parser.add_argument('--baseline', metavar='PATH', help='compare against results saved earlier')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='slowdown ratio counted as a regression (default 1.25)')
+    parser.add_argument('--repeat', type=int, default=5, help='timing runs per case (default 5)')
+    parser.add_argument('--min-time', type=float, default=0.2, help='seconds per timing run (default 0.2)')
+    parser.add_argument('--no-sympy', action='store_true', help="don't time sympy even if it is installed")
+    args = parser.parse_args(argv)
+
+    report = run(args.pattern, repeat=args.repeat, min_time=args.min_time,
+                 with_sympy=not args.no_sympy, out=sys.stdout)
+    if args.save:
+        save(report, args.save)
+
+    if args.baseline:
+        regressions = compare(report, load(args.baseline), args.threshold)
+        for key, old, new, ratio in regressions:
+            print("REGRESSION {:<40} {:>10.3f} us -> {:>10.3f} us ({:.2f}x)".format(key, old * 1e6, new * 1e6, ratio))
+        if regressions:
+            return 1
+        print("no regressions against %s" % args.baseline)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,416 @@
+"""
+The benchmark cases. Each factory builds its inputs once and returns the
+callable that is timed; the sympy factories mirror them on sympy.geometry,
+with the same inputs so that the ratios compare like with like.
+"""
+import math
+
+from . import case
+from ..line import Line, Ray, Segment
+from ..point import Point
+from ..polygon import Polygon
+
+
+def _ring(n, r=10.0):
+    """n vertices of a regular polygon, counterclockwise"""
+    return [(r * math.cos(2 * math.pi * k / n), r * math.sin(2 * math.pi * k / n)) for k in range(n)]
+
+
+SQUARE_A = [(0, 0), (4, 0), (4, 4), (0, 4)]
+SQUARE_B = [(2, 1), (6, 1), (6, 5), (2, 5)]
+RING = _ring(100)
+P, Q = (1.5, -2.25), (0.75, 4.0)
+
+
+# ---------------- point arithmetic ----------------
+
+@case('point', 'construct', sympy=lambda sg: lambda: sg.Point(*P))
+def point_construct():
+    return lambda: Point(*P)
+
+
+@case('point', 'add', sympy=lambda sg: (lambda p, q: lambda: p + q)(sg.Point(*P), sg.Point(*Q)))
+def point_add():
+    p, q = Point(*P), Point(*Q)
+    return lambda: p + q
+
+
+@case('point', 'sub', sympy=lambda sg: (lambda p, q: lambda: p - q)(sg.Point(*P), sg.Point(*Q)))
+def point_sub():
+    p, q = Point(*P), Point(*Q)
+    return lambda: p - q
+
+
+@case('point', 'mul', sympy=lambda sg: (lambda p: lambda: p * 3)(sg.Point(*P)))
+def point_mul():
+    p = Point(*P)
+    return lambda: p * 3
+
+
+@case('point', 'distance', sympy=lambda sg: (lambda p, q: lambda: p.distance(q))(sg.Point(*P), sg.Point(*Q)))
+def point_distance():
+    p, q = Point(*P), Point(*Q)
+    return lambda: p.distance(q)
+
+
+@case('point', 'midpoint', sympy=lambda sg: (lambda p, q: lambda: p.midpoint(q))(sg.Point(*P), sg.Point(*Q)))
+def point_midpoint():
+    p, q = Point(*P), Point(*Q)
+    return lambda: p.midpoint(q)
+
+
+# ---------------- lines, segments and rays ----------------
+
+def _pair(cls_a, a, cls_b, b):
+    ea, eb = cls_a(*a), cls_b(*b)
+    return lambda: ea.intersection(eb)
+
+
+CROSSING = (((0, 0), (4, 4)), ((0, 4), (4, 0)))
+OVERLAP = (((0, 0), (4, 0)), ((2, 0), (6, 0)))
+DISJOINT = (((0, 0), (1, 1)), ((3, 0), (4, -1)))
+
+
+@case('line', 'construct', sympy=lambda sg: lambda: sg.Segment(sg.Point(0, 0), sg.Point(4, 4)))
+def segment_construct():
+    p, q = Point(0, 0), Point(4, 4)
+    return lambda: Segment(p, q)
+
+
+@case('line', 'line_x_line', sympy=lambda sg: _pair(sg.Line, [sg.Point(*p) for p in CROSSING[0]],
+                                                   sg.Line, [sg.Point(*p) for p in CROSSING[1]]))
+def line_line():
+    return _pair(Line, CROSSING[0], Line, CROSSING[1])
+
+
+@case('line', 'segment_x_segment', sympy=lambda sg: _pair(sg.Segment, [sg.Point(*p) for p in CROSSING[0]],
+                                                         sg.Segment, [sg.Point(*p) for p in CROSSING[1]]))
+def segment_segment():
+    return _pair(Segment, CROSSING[0], Segment, CROSSING[1])
+
+
+@case('line', 'segment_x_segment_overlap', sympy=lambda sg: _pair(sg.Segment, [sg.Point(*p) for p in OVERLAP[0]],
+                                                                 sg.Segment, [sg.Point(*p) for p in OVERLAP[1]]))
+def segment_segment_overlap():
+    return _pair(Segment, OVERLAP[0], Segment, OVERLAP[1])
+
+
+@case('line', 'segment_x_segment_disjoint', sympy=lambda sg: _pair(sg.Segment, [sg.Point(*p) for p in DISJOINT[0]],
+                                                                  sg.Segment, [sg.Point(*p) for p in DISJOINT[1]]))
+def segment_segment_disjoint():
+    return _pair(Segment, DISJOINT[0], Segment, DISJOINT[1])
+
+
+@case('line', 'ray_x_segment', sympy=lambda sg: _pair(sg.Ray, [sg.Point(*p) for p in CROSSING[0]],
+                                                     sg.Segment, [sg.Point(*p) for p in CROSSING[1]]))
+def ray_segment():
+    return _pair(Ray, CROSSING[0], Segment, CROSSING[1])
+
+
+# ---------------- polygons ----------------
+
+def _sympy_polygon(sg, ring):
+    return sg.Polygon(*[sg.Point(*p) for p in ring])
+
+
+def _uncached(entity, func):
+    """Time func with the cached properties of entity cleared on every call,
+    so the computation itself is measured"""
+    def call():
+        entity.clear_cache()
+        return func()
+    return call
+
+
+@case('polygon', 'construct_4', sympy=lambda sg: lambda: _sympy_polygon(sg, SQUARE_A))
+def polygon_construct_4():
+    return lambda: Polygon(*SQUARE_A)
+
+
+@case('polygon', 'construct_100')
+def polygon_construct_100():
+    pts = [Point(*p) for p in RING]
+    return lambda: Polygon(*pts)
+
+
+@case('polygon', 'construct_100_trusted')
+def polygon_construct_100_trusted():
+    pts = [Point(*p) for p in RING]
+    return lambda: Polygon(*pts, validate=False)
+
+
+@case('polygon', 'area', sympy=lambda sg: (lambda pg: lambda: pg.area)(_sympy_polygon(sg, RING)))
+def polygon_area():
+    pg = Polygon(*RING)
+    return _uncached(pg, lambda: pg.area)
+
+
+@case('polygon', 'perimeter', sympy=lambda sg: (lambda pg: lambda: pg.perimeter)(_sympy_polygon(sg, RING)))
+def polygon_perimeter():
+    pg = Polygon(*RING)
+    return _uncached(pg, lambda: pg.perimeter)
+
+
+@case('polygon', 'centroid', sympy=lambda sg: (lambda pg: lambda: pg.centroid)(_sympy_polygon(sg, RING)))
+def polygon_centroid():
+    pg = Polygon(*RING)
+    return _uncached(pg, lambda: pg.centroid)
+
+
+@case('polygon', 'second_moment_of_area', sympy=lambda sg: (lambda pg: lambda: pg.second_moment_of_area())(
+    _sympy_polygon(sg, RING)))
+def polygon_second_moment():
+    pg = Polygon(*RING)
+    return _uncached(pg, lambda: pg.second_moment_of_area())
+
+
+@case('polygon', 'intersection', sympy=lambda sg: (lambda a, b: lambda: a.intersection(b))(
+    _sympy_polygon(sg, SQUARE_A), _sympy_polygon(sg, SQUARE_B)))
+def polygon_intersection():
+    a, b = Polygon(*SQUARE_A), Polygon(*SQUARE_B)
+    return lambda: a.intersection(b)
+
+
+@case('polygon', 'encloses_point', sympy=lambda sg: (lambda pg, p: lambda: pg.encloses_point(p))(
+    _sympy_polygon(sg, RING), sg.Point(1.0, 1.0)))
+def polygon_encloses_point():
+    pg = Polygon(*RING)
+    p = Point(1.0, 1.0)
+    return _uncached(pg, lambda: pg.encloses_point(p))
+
+
+@case('polygon', 'is_convex', sympy=lambda sg: (lambda pg: lambda: pg.is_convex())(_sympy_polygon(sg, RING)))
+def polygon_is_convex():
+    pg = Polygon(*RING)
+    return lambda: pg.is_convex()
+
+
+# ---------------- cached properties ----------------
+# The "_uncached" twins drop the cache before every call, which is what each
+# call cost before derived values were kept on the entity.
+
+@case('cache', 'polygon_contains_point')
+def cache_contains():
+    pg = Polygon(*RING)
+    p = pg.args[50].midpoint(pg.args[51])
+    return lambda: p in pg
+
+
+@case('cache', 'polygon_contains_point_uncached')
+def cache_contains_uncached():
+    pg = Polygon(*RING)
+    p = pg.args[50].midpoint(pg.args[51])
+    return _uncached(pg, lambda: p in pg)
+
+
+@case('cache', 'polygon_encloses_point')
+def cache_encloses():
+    pg, p = Polygon(*RING), Point(1.0, 1.0)
+    return lambda: pg.encloses_point(p)
+
+
+@case('cache', 'polygon_encloses_point_uncached')
+def cache_encloses_uncached():
+    pg, p = Polygon(*RING), Point(1.0, 1.0)
+    return _uncached(pg, lambda: pg.encloses_point(p))
+
+
+@case('cache', 'polygon_area_bounds')
+def cache_area_bounds():
+    pg = Polygon(*RING)
+    return lambda: (pg.area, pg.perimeter, pg.bounds)
+
+
+@case('cache', 'polygon_area_bounds_uncached')
+def cache_area_bounds_uncached():
+    pg = Polygon(*RING)
+    return _uncached(pg, lambda: (pg.area, pg.perimeter, pg.bounds))
+
+
+@case('cache', 'line_x_line')
+def cache_line_line():
+    return _pair(Line, CROSSING[0], Line, CROSSING[1])
+
+
+@case('cache', 'line_x_line_uncached')
+def cache_line_line_uncached():
+    a, b = Line(*CROSSING[0]), Line(*CROSSING[1])
+    def call():
+        a.clear_cache()
+        b.clear_cache()
+        return a.intersection(b)
+    return call
+
+
+# ---------------- interning ----------------
+
+GRID = [[(i, j), (i + 1, j), (i + 1, j + 1), (i, j + 1)] for i in range(10) for j in range(10)]
+
+
+def _grid_polygons():
+    return [Polygon(*q, validate=False) for q in GRID]
+
+
+@case('interning', 'grid_polygons')
+def grid_polygons():
+    return _grid_polygons
+
+
+@case('interning', 'grid_polygons_pooled')
+def grid_polygons_pooled():
+    from .. import interning
+
+    def call():
+        interning.enable(1000)
+        try:
+            return _grid_polygons()
+        finally:
+            interning.disable()
+    return call
+
+
+# ---------------- memoized intersections ----------------
+
+@case('memo', 'polygon_intersection_repeat')
+def memo_intersection():
+    from .. import cache
+    a, b = Polygon(*_ring(30)), Polygon(*[(x + 5, y) for x, y in _ring(30)])
+
+    def call():
+        cache.enable_intersection_cache(16)
+        try:
+            for _ in range(5):
+                a.intersection(b)
+                b.intersection(a)
+        finally:
+            cache.disable_intersection_cache()
+    return call
+
+
+@case('memo', 'polygon_intersection_repeat_uncached')
+def memo_intersection_uncached():
+    a, b = Polygon(*_ring(30)), Polygon(*[(x + 5, y) for x, y in _ring(30)])
+
+    def call():
+        for _ in range(5):
+            a.intersection(b)
+            b.intersection(a)
+    return call
+
+
+# ---------------- predicates ----------------
+
+@case('predicates', 'orient2d')
+def orient2d_filtered():
+    from ..predicates import orient2d
+    a, b, c = (0.1, 0.25), (0.3, 0.6), (0.5, 1.0)
+    return lambda: orient2d(a, b, c)
+
+
+@case('predicates', 'orient2d_exact')
+def orient2d_exact():
+    from ..predicates import orient2d
+    # collinear, so the float filter can't decide
+    a, b, c = (0.1, 0.2), (0.3, 0.6), (0.5, 1.0)
+    return lambda: orient2d(a, b, c)
+
+
+@case('predicates', 'is_collinear', sympy=lambda sg: (lambda a, b, c: lambda: sg.Point.is_collinear(a, b, c))(
+    sg.Point(0.1, 0.25), sg.Point(0.3, 0.6), sg.Point(0.5, 1.0)))
+def is_collinear():
+    a, b, c = Point(0.1, 0.25), Point(0.3, 0.6), Point(0.5, 1.0)
+    return lambda: a.is_collinear(b, c)
+
+
+# ---------------- boolean operations ----------------
+
+@case('boolean', 'union_4')
+def boolean_union_4():
+    a, b = Polygon(*SQUARE_A), Polygon(*SQUARE_B)
+    return lambda: a.union(b)
+
+
+@case('boolean', 'intersection_area_100')
+def boolean_intersection_area_100():
+    a = Polygon(*RING)
+    b = Polygon(*[(x + 3.0, y + 2.0) for x, y in RING])
+    return lambda: a.intersection_area(b)
+
+
+@case('boolean', 'clip_100')
+def boolean_clip_100():
+    pg = Polygon(*RING)
+    return lambda: pg.clip((-5.0, -5.0, 5.0, 20.0))
+
+
+# ---------------- batched moments ----------------
+
+@case('moments', 'batch_1000x100')
+def moments_batch():
+    from ..moments import moments
+    from ..wkb import polygons_to_arrays
+    arrays = polygons_to_arrays([Polygon(*[(x + i, y) for x, y in RING]) for i in range(1000)])
+    return lambda: moments(arrays)
+
+
+@case('moments', 'loop_1000x100')
+def moments_loop():
+    pgs = [Polygon(*[(x + i, y) for x, y in RING]) for i in range(1000)]
+
+    def run():
+        for pg in pgs:
+            pg.clear_cache()
+            pg.second_moment_of_area()
+    return run
+
+
+# ---------------- polygon collections ----------------
+
+@case('collection', 'area_perimeter_bounds_1000x100')
+def collection_measures():
+    from ..collection import PolygonCollection
+    from ..wkb import polygons_to_arrays
+    coords, offsets = polygons_to_arrays([Polygon(*[(x + i, y) for x, y in RING]) for i in range(1000)])
+
+    def run():
+        pc = PolygonCollection(coords, offsets)
+        return pc.area, pc.perimeter, pc.bounds
+    return run
+
+
+@case('collection', 'area_perimeter_bounds_loop_1000x100')
+def collection_measures_loop():
+    pgs = [Polygon(*[(x + i, y) for x, y in RING]) for i in range(1000)]
+
+    def run():
+        for pg in pgs:
+            pg.clear_cache()
+        return [(pg.area, pg.perimeter, pg.bounds) for pg in pgs]
+    return run
+
+
+# ---------------- triangulation ----------------
+
+@case('triangulate', 'earclip_100')
+def triangulate_earclip_100():
+    pg = Polygon(*RING)
+    return lambda: pg.triangulate(method='earclip')
+
+
+@case('triangulate', 'monotone_100')
+def triangulate_monotone_100():
+    pg = Polygon(*RING)
+    return lambda: pg.triangulate(method='monotone')
+
+
+@case('triangulate', 'auto_100')
+def triangulate_auto_100():
+    pg = Polygon(*RING)
+    return lambda: pg.triangulate()
+
+
+@case('triangulate', 'auto_star_100')
+def triangulate_auto_star_100():
+    # every other vertex pulled in: 50 reflex vertices, the monotone case
+    pg = Polygon(*[(x * (1.0 if k % 2 else 0.6), y * (1.0 if k % 2 else 0.6)) for k, (x, y) in enumerate(RING)])
+    return lambda: pg.triangulate()
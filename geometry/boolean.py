@@ -0,0 +1,267 @@
+"""
+Boolean operations on polygons: union, intersection, difference and
+symmetric difference, and clipping to a rectangle.
+
+The overlay works in three passes, in the manner of Martinez-Rueda
+("A new algorithm for computing Boolean operations on polygons", 2009):
+
+1. the sides of both polygons are split wherever they cross or touch, found
+   with the sweep line of ``geometry.sweep``, O((n + k) log n);
+2. a second sweep over the split edges, which no longer cross, records on
+   each edge how many times each polygon winds around the region just below
+   and just above it;
+3. an edge is on the boundary of the result when the operation is true on
+   one side of it and false on the other. These edges are chained into rings.
+
+A polygon encloses the points it winds around (the nonzero rule, as
+``Polygon.encloses_point``). The results are lists of Polygons: outer
+boundaries counterclockwise and holes, which a Polygon can't have, as
+separate clockwise Polygons, so ``sum(p.area for p in result)`` is the area
+of the result. Parts that touch at a vertex come out as separate rings.
+
+``clip`` is the fast path for cutting a polygon to a rectangle, such as a
+tile: Sutherland-Hodgman against the four sides of the bounds, O(n).
+"""
+import math
+from functools import cmp_to_key
+
+from .polygon import Polygon
+from .predicates import orient2d
+from .sweep import sweep_intersections
+
+OPERATIONS = {
+    'union': lambda a, b: a or b,
+    'intersection': lambda a, b: a and b,
+    'difference': lambda a, b: a and not b,
+    'symmetric_difference': lambda a, b: a != b,
+}
+
+
+def _split_edges(a, b):
+    """Return {(p, q): [wa, wb]} for the pieces of the sides of a and b cut at
+    every point where sides meet; p < q, and wa (wb) is how much crossing the
+    piece from below to above changes the winding number of a (b)."""
+    segments = [((x1, y1), (x2, y2)) for x1, y1, x2, y2 in a._edges]
+    na = len(segments)
+    segments.extend(((x1, y1), (x2, y2)) for x1, y1, x2, y2 in b._edges)
+
+    cuts = [[] for _ in segments]
+    for p, ids in sweep_intersections(segments):
+        for i in ids:
+            if p != segments[i][0] and p != segments[i][1]:
+                cuts[i].append(p)
+
+    pieces = {}
+    for i, (start, end) in enumerate(segments):
+        side = 0 if i < na else 1
+        points = [start] + sorted(cuts[i], reverse=start > end) + [end]
+        for u, v in zip(points, points[1:]):
+            if u == v:
+                continue
+            key, sign = ((u, v), 1) if u < v else ((v, u), -1)
+            w = pieces.get(key)
+            if w is None:
+                w = pieces[key] = [0, 0]
+            w[side] += sign
+    return pieces
+
+
+def _windings(pieces):
+    """Return {(p, q): (below, above)}, the winding numbers (wa, wb) of the two
+    polygons on each side of every piece. Above means left of p -> q."""
+    edges = [key for key, w in pieces.items() if w[0] or w[1]]
+    starts = {}
+    for e in edges:
+        starts.setdefault(e[0], []).append(e)
+    events = sorted(set(p for e in edges for p in e))
+
+    status = []
+    sides = {}
+
+    def above(e, p):
+        # an edge's own endpoint is on it; orient2d would need its exact stage
+        if p == e[1] or p == e[0]:
+            return 0
+        return orient2d(e[0], e[1], p)
+
+    for p in events:
+        # status[lo:hi] are the edges through p, which end there
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if above(status[mid], p) > 0:
+                lo = mid + 1
+            else:
+                hi = mid
+        hi = lo
+        while hi < len(status) and above(status[hi], p) == 0:
+            hi += 1
+
+        new = [e for e in status[lo:hi] if e[1] != p] + starts.get(p, [])
+        if len(new) > 1:
+            new.sort(key=cmp_to_key(lambda s, t: -orient2d(p, s[1], t[1])))
+        status[lo:hi] = new
+
+        below = sides[status[lo - 1]][1] if lo > 0 else (0, 0)
+        for e in new:
+            if e not in sides:
+                wa, wb = pieces[e]
+                sides[e] = (below, (below[0] + wa, below[1] + wb))
+            below = sides[e][1]
+    return sides
+
+
+def _boundary(a, b, operation):
+    """The directed edges of the boundary of the result, interior on the left"""
+    try:
+        inside = OPERATIONS[operation]
+    except KeyError:
+        raise ValueError("unknown operation %r, expected one of %s" % (operation, ', '.join(OPERATIONS)))
+    for poly in (a, b):
+        if len(poly.args[0]) != 2:
+            raise ValueError("boolean operations need 2D polygons")
+    edges = []
+    for (p, q), (below, above) in _windings(_split_edges(a, b)).items():
+        lower = inside(below[0] != 0, below[1] != 0)
+        upper = inside(above[0] != 0, above[1] != 0)
+        if upper and not lower:
+            edges.append((p, q))
+        elif lower and not upper:
+            edges.append((q, p))
+    return edges
+
+
+def _rings(edges):
+    """Chain directed edges into closed rings, turning as sharply left as
+    possible wherever several edges leave a vertex"""
+    out = {}
+    for u, v in edges:
+        out.setdefault(u, []).append(v)
+
+    def turn(u, v, w):
+        # clockwise angle from v -> u round to v -> w, in (0, 2 pi]
+        back = math.atan2(u[1] - v[1], u[0] - v[0])
+        ahead = math.atan2(w[1] - v[1], w[0] - v[0])
+        return (back - ahead) % (2 * math.pi) or 2 * math.pi
+
+    used = set()
+    rings = []
+    for first in edges:
+        if first in used:
+            continue
+        ring = [first[0]]
+        u, v = first
+        used.add(first)
+        while True:
+            ring.append(v)
+            targets = out[v]
+            w = targets[0] if len(targets) == 1 else min(targets, key=lambda w: turn(u, v, w))
+            if (v, w) == first or (v, w) in used:
+                break
+            used.add((v, w))
+            u, v = v, w
+        # the walk ends back at the first vertex
+        ring.pop()
+        rings.append(ring)
+    return rings
+
+
+def overlay(a, b, operation):
+    """Return the result of a boolean operation on the polygons a and b as a
+    list of Polygons; holes are clockwise.
+
+    :param operation: 'union', 'intersection', 'difference' or 'symmetric_difference'
+    """
+    result = []
+    for ring in _rings(_boundary(a, b, operation)):
+        poly = Polygon(*ring)
+        # rings that collapse to a line or a point have no area
+        if isinstance(poly, Polygon):
+            result.append(poly)
+    return result
+
+
+def union(a, b):
+    """Return the union of the polygons a and b, see ``overlay``"""
+    return overlay(a, b, 'union')
+
+
+def intersection(a, b):
+    """Return the region common to the polygons a and b, see ``overlay``"""
+    return overlay(a, b, 'intersection')
+
+
+def difference(a, b):
+    """Return the region of a outside b, see ``overlay``"""
+    return overlay(a, b, 'difference')
+
+
+def symmetric_difference(a, b):
+    """Return the region covered by exactly one of a and b, see ``overlay``"""
+    return overlay(a, b, 'symmetric_difference')
+
+
+def intersection_area(a, b):
+    """Return the area common to the polygons a and b, without building the
+    result polygons"""
+    edges = _boundary(a, b, 'intersection')
+    return sum(p[0] * q[1] - p[1] * q[0] for p, q in edges) / 2
+
+
+def _clip_side(points, inside, cut):
+    """One Sutherland-Hodgman pass: keep the part of the ring where inside(p)"""
+    result = []
+    if not points:
+        return result
+    prev = points[-1]
+    prev_in = inside(prev)
+    for p in points:
+        p_in = inside(p)
+        if p_in != prev_in:
+            result.append(cut(prev, p))
+        if p_in:
+            result.append(p)
+        prev, prev_in = p, p_in
+    return result
+
+
+def clip(polygon, bounds):
+    """Return the part of the polygon inside the rectangle
+    ``bounds = (xmin, ymin, xmax, ymax)``, or None if nothing of it is left.
+
+    Where a concave polygon leaves the rectangle and comes back, the pieces
+    stay joined by edges running along the rectangle's sides, as is usual for
+    Sutherland-Hodgman; the area is right.
+    """
+    xmin, ymin, xmax, ymax = bounds
+    if xmin > xmax or ymin > ymax:
+        raise ValueError("bounds must be (xmin, ymin, xmax, ymax)")
+    pxmin, pymin, pxmax, pymax = polygon.bounds
+    if pxmin >= xmin and pymin >= ymin and pxmax <= xmax and pymax <= ymax:
+        return polygon
+    if pxmin >= xmax or pymin >= ymax or pxmax <= xmin or pymax <= ymin:
+        return None
+
+    def at_x(x):
+        def cut(p, q):
+            return (x, p[1] + (x - p[0]) * (q[1] - p[1]) / (q[0] - p[0]))
+        return cut
+
+    def at_y(y):
+        def cut(p, q):
+            return (p[0] + (y - p[1]) * (q[0] - p[0]) / (q[1] - p[1]), y)
+        return cut
+
+    points = [p.args for p in polygon.args]
+    if pxmin < xmin:
+        points = _clip_side(points, lambda p: p[0] >= xmin, at_x(xmin))
+    if pxmax > xmax:
+        points = _clip_side(points, lambda p: p[0] <= xmax, at_x(xmax))
+    if pymin < ymin:
+        points = _clip_side(points, lambda p: p[1] >= ymin, at_y(ymin))
+    if pymax > ymax:
+        points = _clip_side(points, lambda p: p[1] <= ymax, at_y(ymax))
+    if len(points) < 3:
+        return None
+    result = Polygon(*points)
+    return result if isinstance(result, Polygon) else None
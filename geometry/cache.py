@@ -0,0 +1,116 @@
+"""
+Bounded caches shared by the optional memoization features.
+
+``LRUCache`` is a small dict-like cache that forgets the least recently used
+entry once it holds ``maxsize`` of them and counts its hits and misses.
+``IntersectionCache`` memoizes ``Polygon.intersection``; it is off until
+``enable_intersection_cache`` is called.
+"""
+from collections import OrderedDict
+
+from .tolerance import get_tolerance
+
+
+class LRUCache(object):
+    """A mapping of at most ``maxsize`` entries, evicting the least recently used.
+
+    :param maxsize: the most entries kept
+    """
+
+    def __init__(self, maxsize):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __repr__(self):
+        return "%s(%d/%d entries, %d hits, %d misses)" % (
+            type(self).__name__, len(self), self.maxsize, self.hits, self.misses)
+
+    def get(self, key):
+        """Return the value for key, or None (counted as a miss) if it isn't cached"""
+        entries = self._entries
+        value = entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            entries.move_to_end(key)
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store value, which must not be None, and return it"""
+        entries = self._entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        """Return the counters as a dict, with the hit rate"""
+        total = self.hits + self.misses
+        return {'size': len(self), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0}
+
+    def reset_stats(self):
+        self.hits = self.misses = 0
+
+    def clear(self):
+        """Forget every entry and reset the counters"""
+        self._entries.clear()
+        self.reset_stats()
+
+
+class IntersectionCache(LRUCache):
+    """Results of ``intersection`` keyed by the pair of entities, in either order.
+
+    Entities are keyed by their type and coordinates, not their identity, so a
+    polygon rebuilt from the same vertices finds the entry too. The tolerance
+    in effect is part of the key, since it decides which points are merged.
+    """
+
+    def __init__(self, maxsize=1024):
+        super(IntersectionCache, self).__init__(maxsize)
+
+    @staticmethod
+    def key(a, b):
+        """The same key for (a, b) and (b, a), under the current tolerance"""
+        return (frozenset(((type(a).__name__, a.args), (type(b).__name__, b.args))),
+                get_tolerance())
+
+    def intersection(self, a, b, compute):
+        """Return a copy of the cached ``compute(a, b)``, computing it on a miss"""
+        key = self.key(a, b)
+        result = self.get(key)
+        if result is None:
+            result = self.put(key, tuple(compute(a, b)))
+        return list(result)
+
+
+_intersections = None
+
+
+def enable_intersection_cache(maxsize=1024):
+    """Start memoizing ``Polygon.intersection`` in a new cache and return it"""
+    global _intersections
+    _intersections = IntersectionCache(maxsize)
+    return _intersections
+
+
+def disable_intersection_cache():
+    global _intersections
+    _intersections = None
+
+
+def intersection_cache():
+    """Return the active IntersectionCache, or None when it is off"""
+    return _intersections
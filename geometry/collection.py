@@ -0,0 +1,112 @@
+"""
+Many 2D polygons in one coordinate buffer.
+
+A ``PolygonCollection`` holds its polygons as the ``(coords, offsets)`` pair
+used throughout the package (see geometry.wkb): polygon i is the open ring
+``coords[offsets[i]:offsets[i + 1]]``. Area, perimeter, bounds, orientation
+and moments are computed for the whole collection with one segmented numpy
+reduction each, and indexing builds a Polygon only for the entry asked for.
+
+The arrays are not copied when they already have the right dtype; treat them
+as read-only, since derived values are cached.
+
+This module needs numpy.
+"""
+import numpy as np
+
+from .basic import cached_property
+from .point import Point
+from .polygon import Polygon
+from .moments import _segments, _sides, moments
+from .wkb import _pack_arrays, polygons_to_arrays
+
+
+class PolygonCollection(object):
+    """A sequence of 2D polygons stored in one ``(N, 2)`` float array.
+
+    :param coords: the vertices of every polygon, rings open
+    :param offsets: n + 1 ints, polygon i is ``coords[offsets[i]:offsets[i + 1]]``
+    """
+
+    def __init__(self, coords, offsets):
+        coords, offsets = _pack_arrays(coords, offsets)
+        if coords.shape[1] != 2:
+            raise ValueError("a PolygonCollection holds 2D polygons only")
+        self.coords = coords
+        self.offsets = offsets
+        # (ring of every vertex, index of the next vertex in its ring)
+        self._ring, self._next = _segments(offsets)
+
+    @classmethod
+    def from_polygons(cls, polygons):
+        """Build a PolygonCollection from an iterable of 2D Polygons"""
+        return cls(*polygons_to_arrays(list(polygons)))
+
+    def to_polygons(self):
+        """Return the polygons as a list of Polygon objects"""
+        return [self[i] for i in range(len(self))]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __repr__(self):
+        return "%s(%d polygons, %d vertices)" % (type(self).__name__, len(self), len(self.coords))
+
+    def __getitem__(self, item):
+        """An integer index returns a Polygon, a slice returns a PolygonCollection."""
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                raise ValueError("PolygonCollection slices must be contiguous")
+            stop = max(start, stop)
+            a, b = self.offsets[start], self.offsets[stop]
+            return PolygonCollection(self.coords[a:b], self.offsets[start:stop + 1] - a)
+        n = len(self)
+        if item < 0:
+            item += n
+        if not 0 <= item < n:
+            raise IndexError("polygon index out of range")
+        rows = self.coords[self.offsets[item]:self.offsets[item + 1]].tolist()
+        return Polygon(*[Point._trusted(*r) for r in rows], validate=False)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def _total(self, values):
+        """Sum values, one per vertex, over each polygon"""
+        if not len(self):
+            return np.empty(0)
+        return np.add.reduceat(values, self.offsets[:-1])
+
+    @cached_property
+    def area(self):
+        """The signed shoelace area of every polygon, summed relative to its
+        first vertex as Polygon.area does"""
+        x1, y1, x2, y2 = _sides(self.coords, self.offsets, self._ring, self._next)
+        return self._total(x1*y2 - x2*y1) / 2
+
+    @cached_property
+    def perimeter(self):
+        """The perimeter of every polygon"""
+        d = self.coords[self._next] - self.coords
+        return self._total(np.hypot(d[:, 0], d[:, 1]))
+
+    @cached_property
+    def bounds(self):
+        """The (n, 4) array of (xmin, ymin, xmax, ymax) of every polygon"""
+        if not len(self):
+            return np.empty((0, 4))
+        starts = self.offsets[:-1]
+        return np.hstack((np.minimum.reduceat(self.coords, starts),
+                          np.maximum.reduceat(self.coords, starts)))
+
+    @property
+    def orientation(self):
+        """1 for counterclockwise polygons, -1 for clockwise ones and 0 for
+        those without area, as an int8 array"""
+        return np.sign(self.area).astype(np.int8)
+
+    def moments(self, point=None):
+        """Return ``(area, cx, cy, ixx, iyy, ixy)`` per polygon, see geometry.moments"""
+        return moments((self.coords, self.offsets), point)
@@ -0,0 +1,408 @@
+"""
+Delaunay triangulations of 2D point sets and their Voronoi diagrams.
+
+``Delaunay`` inserts the points one at a time (Bowyer-Watson): the
+triangles whose circumcircle holds the new point are removed and the hole
+is filled with a fan around the point. The points are inserted in a
+biased randomized order (rounds of doubling size, each sorted along a
+Hilbert curve), so the walk that locates each point is short and the
+expected cost is O(n log n). The convex hull is closed off with "ghost"
+triangles sharing one vertex at infinity, so points outside the current
+hull need no special case. All decisions use the exact ``orient2d`` and
+``incircle`` predicates of geometry.predicates.
+
+The results are compact numpy index arrays: ``triangles`` (T, 3) holds
+counterclockwise vertex triples, ``neighbors`` (T, 3) the triangle across
+the edge opposite each vertex (-1 on the hull), ``edges`` (E, 2) each edge
+once. ``triangle(k)`` and ``edge(k)`` build a Triangle or Segment2D on
+demand. ``voronoi()`` returns the dual ``Voronoi`` diagram.
+
+Repeated points are inserted once; their copies belong to no triangle.
+While all the points are collinear there are no triangles: ``edges`` then
+joins consecutive points along the line, ``convex_hull`` is the two end
+points, and the Voronoi diagram has one ridge per edge, infinite both ways.
+
+This module needs numpy.
+"""
+import numpy as np
+
+from .distance import _as_coords
+from .line import Segment
+from .point import Point
+from .polygon import Polygon, Triangle
+from .predicates import incircle, orient2d
+
+# the vertex at infinity shared by the ghost triangles
+GHOST = -1
+
+
+def _hilbert(x, y, bits=16):
+    """Index along a Hilbert curve of the points (x, y) of the unit square"""
+    side = 1 << bits
+    xi = np.minimum((x * side).astype(np.int64), side - 1)
+    yi = np.minimum((y * side).astype(np.int64), side - 1)
+    d = np.zeros(len(xi), dtype=np.int64)
+    s = side >> 1
+    while s:
+        rx = (xi & s) > 0
+        ry = (yi & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # rotate the quadrant so that the curve is continuous
+        flip = ~ry
+        swap_x = flip & rx
+        xi = np.where(swap_x, side - 1 - xi, xi)
+        yi = np.where(swap_x, side - 1 - yi, yi)
+        xi, yi = np.where(flip, yi, xi), np.where(flip, xi, yi)
+        s >>= 1
+    return d
+
+
+def _insertion_order(pts, seed=0):
+    """A biased randomized insertion order: rounds of doubling size, each
+    sorted along a Hilbert curve"""
+    n = len(pts)
+    perm = np.random.RandomState(seed).permutation(n)
+    lo, hi = pts.min(axis=0), pts.max(axis=0)
+    span = np.where(hi > lo, hi - lo, 1.0)
+    unit = (pts - lo) / span
+    rounds = []
+    end = n
+    while end > 64:
+        start = end // 2
+        rounds.append(perm[start:end])
+        end = start
+    rounds.append(perm[:end])
+    order = []
+    for r in reversed(rounds):
+        h = _hilbert(unit[r, 0], unit[r, 1])
+        order.append(r[np.argsort(h, kind='stable')])
+    return np.concatenate(order)
+
+
+class Delaunay(object):
+    """The Delaunay triangulation of 2D points.
+
+    :param points: PointArray, (N, 2) array or sequence of points
+    """
+
+    def __init__(self, points):
+        self._points = np.empty((0, 2))
+        self._p = []
+        # triangle t is _v[3t:3t + 3], counterclockwise; _n[3t + k] is the
+        # triangle across the edge opposite _v[3t + k]
+        self._v = []
+        self._n = []
+        self._last = 0
+        self._pending = []
+        self._arrays = None
+        self._edges = None
+        self.insert(points)
+
+    def __repr__(self):
+        return "%s(%d points, %d triangles)" % (type(self).__name__, len(self._points), len(self.triangles))
+
+    @property
+    def points(self):
+        """The (N, 2) array of the points"""
+        return self._points
+
+    def insert(self, points):
+        """Insert more points, e.g. a batch from a numpy array"""
+        pts = _as_coords(points)
+        if pts.shape[1] != 2:
+            raise ValueError("Delaunay triangulations need 2D points")
+        if not len(pts):
+            return
+        first = len(self._points)
+        self._points = np.concatenate((self._points, pts)) if first else pts.copy()
+        self._p.extend(map(tuple, pts.tolist()))
+        self._arrays = self._edges = None
+        for i in (_insertion_order(pts) + first).tolist():
+            if self._v:
+                self._insert(i)
+            else:
+                self._pending.append(i)
+                self._start()
+
+    # ---- construction ----
+
+    def _start(self):
+        """Make the first triangle once the pending points aren't all collinear"""
+        p = self._p
+        pending = self._pending
+        a = pending[0]
+        b = next((i for i in pending if p[i] != p[a]), None)
+        if b is None:
+            return
+        c = next((i for i in pending if orient2d(p[a], p[b], p[i]) != 0), None)
+        if c is None:
+            return
+        if orient2d(p[a], p[b], p[c]) < 0:
+            a, b = b, a
+        # the triangle and the three ghosts beyond its sides
+        self._v = [a, b, c, c, b, GHOST, a, c, GHOST, b, a, GHOST]
+        self._n = [1, 2, 3, 3, 2, 0, 1, 3, 0, 2, 1, 0]
+        self._last = 0
+        self._pending = []
+        for i in pending:
+            if i not in (a, b, c):
+                self._insert(i)
+
+    def _conflict(self, t, q):
+        """Whether the point q lies inside the circumcircle of triangle t; for
+        a ghost, whether q lies beyond its hull edge"""
+        v, p = self._v, self._p
+        a, b, c = v[3 * t], v[3 * t + 1], v[3 * t + 2]
+        if a == GHOST:
+            a, b = b, c
+        elif b == GHOST:
+            a, b = c, a
+        elif c != GHOST:
+            return incircle(p[a], p[b], p[c], q) > 0
+        # ghost triangle over the hull edge a -> b, outside to its left
+        pa, pb = p[a], p[b]
+        o = orient2d(pa, pb, q)
+        if o != 0:
+            return o > 0
+        # on the line of the edge: in conflict if strictly between its ends
+        return (q[0] - pa[0]) * (q[0] - pb[0]) + (q[1] - pa[1]) * (q[1] - pb[1]) < 0
+
+    def _locate(self, q):
+        """A triangle in conflict with q, or None if q is already a vertex"""
+        v, nb, p = self._v, self._n, self._p
+        t = self._last
+        k0 = 0
+        while True:
+            if GHOST in v[3 * t:3 * t + 3]:
+                return t
+            for j in range(3):
+                k = (k0 + j) % 3
+                u, w = v[3 * t + (k + 1) % 3], v[3 * t + (k + 2) % 3]
+                if orient2d(p[u], p[w], q) < 0:
+                    t = nb[3 * t + k]
+                    # vary where the next triangle starts looking, so the walk can't cycle
+                    k0 = (k0 + 1) % 3
+                    break
+            else:
+                if q in (p[v[3 * t]], p[v[3 * t + 1]], p[v[3 * t + 2]]):
+                    return None
+                return t
+
+    def _insert(self, i):
+        v, nb, p = self._v, self._n, self._p
+        q = p[i]
+        t0 = self._locate(q)
+        if t0 is None:
+            return
+
+        # the cavity: the triangles in conflict with q, and the edges around it
+        cavity = [t0]
+        inside = {t0}
+        boundary = []
+        k = 0
+        while k < len(cavity):
+            t = cavity[k]
+            k += 1
+            for j in range(3):
+                s = nb[3 * t + j]
+                if s in inside:
+                    continue
+                if self._conflict(s, q):
+                    inside.add(s)
+                    cavity.append(s)
+                else:
+                    boundary.append((v[3 * t + (j + 1) % 3], v[3 * t + (j + 2) % 3], s))
+
+        # fill it with a fan of triangles (u, w, i), reusing the cavity's slots
+        slots = cavity + list(range(len(v) // 3, len(v) // 3 + len(boundary) - len(cavity)))
+        grow = len(boundary) - len(cavity)
+        v.extend([0] * (3 * grow))
+        nb.extend([0] * (3 * grow))
+        starting, ending = {}, {}
+        for (u, w, s), t in zip(boundary, slots):
+            v[3 * t], v[3 * t + 1], v[3 * t + 2] = u, w, i
+            nb[3 * t + 2] = s
+            # point the outer triangle's edge w -> u at the new triangle
+            for j in range(3):
+                if v[3 * s + (j + 1) % 3] == w and v[3 * s + (j + 2) % 3] == u:
+                    nb[3 * s + j] = t
+                    break
+            starting[u] = t
+            ending[w] = t
+        for (u, w, s), t in zip(boundary, slots):
+            nb[3 * t] = starting[w]
+            nb[3 * t + 1] = ending[u]
+            if u != GHOST and w != GHOST:
+                self._last = t
+
+    # ---- results ----
+
+    def _compact(self):
+        """(triangles, neighbors) of the real triangles, kept until the next insert"""
+        if self._arrays is None:
+            v = np.array(self._v, dtype=np.intp).reshape(-1, 3)
+            n = np.array(self._n, dtype=np.intp).reshape(-1, 3)
+            real = (v != GHOST).all(axis=1)
+            renumber = np.full(len(v) + 1, -1, dtype=np.intp)
+            renumber[:-1][real] = np.arange(int(real.sum()))
+            # ghosts, and the -1 index, map to -1
+            self._arrays = (v[real], renumber[n[real]])
+        return self._arrays
+
+    @property
+    def triangles(self):
+        """(T, 3) array of the vertex indexes of each triangle, counterclockwise"""
+        return self._compact()[0]
+
+    @property
+    def neighbors(self):
+        """(T, 3) array: the triangle across the edge opposite each vertex, -1 on the hull"""
+        return self._compact()[1]
+
+    @property
+    def edges(self):
+        """(E, 2) array of the edges, each once, lower vertex index first"""
+        if self._edges is None and not self._v:
+            chain = self._chain()
+            self._edges = np.array(list(zip(chain, chain[1:])), dtype=np.intp).reshape(-1, 2)
+            self._edges.sort(axis=1)
+        elif self._edges is None:
+            tri, nbr = self._compact()
+            u = tri[:, [1, 2, 0]].ravel()
+            w = tri[:, [2, 0, 1]].ravel()
+            # an inner edge is seen from both sides: keep the side with u < w
+            keep = (u < w) | (nbr.ravel() == -1)
+            self._edges = np.sort(np.stack((u[keep], w[keep]), axis=1), axis=1)
+        return self._edges
+
+    @property
+    def convex_hull(self):
+        """The indexes of the hull vertices, counterclockwise"""
+        v = self._v
+        following = {}
+        for t in range(len(v) // 3):
+            a, b, c = v[3 * t], v[3 * t + 1], v[3 * t + 2]
+            if c == GHOST:
+                following[b] = a
+            elif b == GHOST:
+                following[a] = c
+            elif a == GHOST:
+                following[c] = b
+        if not following:
+            chain = self._chain()
+            return np.array(chain[:1] + chain[1:][-1:], dtype=np.intp)
+        start = min(following)
+        hull = [start]
+        k = following[start]
+        while k != start:
+            hull.append(k)
+            k = following[k]
+        return np.array(hull, dtype=np.intp)
+
+    def _chain(self):
+        """The distinct points, in order along their line, while they are all
+        collinear and so still waiting for the first triangle"""
+        first = {}
+        for i in self._pending:
+            first.setdefault(self._p[i], i)
+        return [first[q] for q in sorted(first)]
+
+    def triangle(self, k):
+        """Triangle k as a Triangle"""
+        return Triangle(*(Point._trusted(*self._p[i]) for i in self.triangles[k].tolist()), validate=False)
+
+    def edge(self, k):
+        """Edge k as a Segment2D"""
+        i, j = self.edges[k].tolist()
+        return Segment(Point._trusted(*self._p[i]), Point._trusted(*self._p[j]))
+
+    def voronoi(self):
+        """The Voronoi diagram of the points"""
+        return Voronoi(self)
+
+
+class Voronoi(object):
+    """The Voronoi diagram dual to a Delaunay triangulation.
+
+    ``vertices`` (T, 2) are the circumcenters of the Delaunay triangles, in
+    the same order. Each Delaunay edge ``ridge_points[k]`` has the ridge
+    ``ridge_vertices[k]`` between the cells of its two points; -1 stands for
+    the end at infinity of the ridges of hull edges.
+    """
+
+    def __init__(self, delaunay):
+        self.delaunay = delaunay
+        tri, nbr = delaunay._compact()
+        pts = delaunay.points
+        a, b, c = pts[tri[:, 0]], pts[tri[:, 1]], pts[tri[:, 2]]
+        # circumcenters relative to a
+        bx, by = b[:, 0] - a[:, 0], b[:, 1] - a[:, 1]
+        cx, cy = c[:, 0] - a[:, 0], c[:, 1] - a[:, 1]
+        d = 2 * (bx * cy - by * cx)
+        b2, c2 = bx * bx + by * by, cx * cx + cy * cy
+        self.vertices = np.stack((a[:, 0] + (cy * b2 - by * c2) / d,
+                                  a[:, 1] + (bx * c2 - cx * b2) / d), axis=1)
+
+        u = tri[:, [1, 2, 0]].ravel()
+        w = tri[:, [2, 0, 1]].ravel()
+        own = np.repeat(np.arange(len(tri)), 3)
+        other = nbr.ravel()
+        keep = (u < w) | (other == -1)
+        self.ridge_points = np.stack((u[keep], w[keep]), axis=1)
+        self.ridge_vertices = np.stack((own[keep], other[keep]), axis=1)
+        if not len(tri):
+            # collinear points: parallel ridges between neighbours on the line
+            self.ridge_points = delaunay.edges.copy()
+            self.ridge_vertices = np.full((len(self.ridge_points), 2), -1, dtype=np.intp)
+
+        # one triangle of each point, to walk its fan from
+        self._corner = np.full(len(pts), -1, dtype=np.intp)
+        self._corner[tri.ravel()] = np.repeat(np.arange(len(tri)), 3)
+        # the triangles as lists, for walking regions
+        self._lists = None
+
+    def __repr__(self):
+        return "%s(%d vertices, %d ridges)" % (type(self).__name__, len(self.vertices), len(self.ridge_points))
+
+    def region(self, i):
+        """The Voronoi vertex indexes around the cell of point i,
+        counterclockwise; an unbounded cell starts and ends with -1"""
+        start = int(self._corner[i])
+        if start < 0:
+            return []
+        if self._lists is None:
+            tri, nbr = self.delaunay._compact()
+            self._lists = (tri.tolist(), nbr.tolist())
+        tri, nbr = self._lists
+
+        def step(t, turn):
+            # the triangle after t around i: turn 1 counterclockwise, 2 clockwise
+            return nbr[t][(tri[t].index(i) + turn) % 3]
+
+        ring = [start]
+        t = step(start, 1)
+        while t != start and t != -1:
+            ring.append(t)
+            t = step(t, 1)
+        if t == start:
+            return ring
+        back = []
+        t = step(start, 2)
+        while t != -1:
+            back.append(t)
+            t = step(t, 2)
+        return [-1] + back[::-1] + ring + [-1]
+
+    def cell(self, i):
+        """The cell of point i as a Polygon, or None if it is unbounded"""
+        region = self.region(i)
+        if not region or region[0] == -1:
+            return None
+        return Polygon(*(Point._trusted(*v) for v in self.vertices[region].tolist()))
+
+    def ridge(self, k):
+        """Ridge k as a Segment2D, or None if it goes to infinity"""
+        s, t = self.ridge_vertices[k].tolist()
+        if s < 0 or t < 0:
+            return None
+        return Segment(Point._trusted(*self.vertices[s].tolist()), Point._trusted(*self.vertices[t].tolist()))
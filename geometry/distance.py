@@ -0,0 +1,242 @@
+"""
+Distances within and between point sets, and nearest-neighbour queries.
+
+``cdist`` and ``pairwise_distances`` return full distance matrices and
+``cdist_chunks`` yields the same matrix a block of rows at a time, so that
+reductions over large sets never hold all N*M distances at once. Two metrics
+are supported: 'euclidean' (``Point.distance``) and 'taxicab'
+(``Point.taxicab_distance``).
+
+``KDTree`` answers k-nearest and fixed-radius queries without computing all
+pairs: a query only visits the leaves whose boxes could hold a closer point.
+
+This module needs numpy.
+"""
+import heapq
+import math
+
+import numpy as np
+
+from .point import Point
+
+METRICS = ('euclidean', 'taxicab')
+
+# about how many distances one block of cdist_chunks holds
+CHUNK_ELEMENTS = 1 << 20
+
+
+def _as_coords(points):
+    """Return the points as an (N, 2) or (N, 3) float array"""
+    if hasattr(points, 'coords'):
+        points = points.coords
+    elif isinstance(points, Point):
+        points = [points.args]
+    elif not isinstance(points, np.ndarray):
+        # a sequence of points, or the coordinates of a single one
+        points = [p.args if isinstance(p, Point) else p for p in points]
+    pts = np.asarray(points, dtype=float)
+    if pts.ndim == 1:
+        pts = pts.reshape(1, -1)
+    if pts.ndim != 2 or pts.shape[1] not in (2, 3):
+        raise ValueError("expected 2D or 3D points, got an array of shape %s" % (pts.shape,))
+    return pts
+
+
+def _check_metric(metric):
+    if metric not in METRICS:
+        raise ValueError("unknown metric %r, expected one of %s" % (metric, ', '.join(METRICS)))
+
+
+def _block(a, b, metric):
+    diff = a[:, None, :] - b[None, :, :]
+    if metric == 'taxicab':
+        return np.abs(diff).sum(axis=2)
+    return np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
+
+
+def cdist_chunks(a, b, metric='euclidean', max_elements=CHUNK_ELEMENTS):
+    """Yield ``(start, block)`` where block holds the distances from the points
+    ``a[start:start + len(block)]`` to every point of b.
+
+    :param a, b: PointArrays, (N, 2)/(N, 3) arrays or sequences of points
+    :param metric: 'euclidean' or 'taxicab'
+    :param max_elements: about how many distances a block may hold
+    """
+    _check_metric(metric)
+    a, b = _as_coords(a), _as_coords(b)
+    if a.shape[1] != b.shape[1]:
+        raise ValueError("can't measure between %dD and %dD points" % (a.shape[1], b.shape[1]))
+    rows = max(1, max_elements // max(len(b), 1))
+    for start in range(0, len(a), rows):
+        yield start, _block(a[start:start + rows], b, metric)
+
+
+def cdist(a, b, metric='euclidean'):
+    """Return the (len(a), len(b)) matrix of distances from every point of a to
+    every point of b"""
+    a, b = _as_coords(a), _as_coords(b)
+    out = np.empty((len(a), len(b)))
+    for start, block in cdist_chunks(a, b, metric):
+        out[start:start + len(block)] = block
+    return out
+
+
+def pairwise_distances(points, metric='euclidean'):
+    """Return the symmetric matrix of distances between all the points"""
+    return cdist(points, points, metric)
+
+
+class KDTree(object):
+    """A k-d tree over 2D or 3D points for nearest-neighbour queries.
+
+    Queries return indexes into the points the tree was built from.
+
+    :param points: PointArray, (N, 2)/(N, 3) array or sequence of points
+    :param leafsize: the most points in a leaf; leaves are searched with numpy
+    """
+
+    def __init__(self, points, leafsize=32):
+        if leafsize < 1:
+            raise ValueError("leafsize must be at least 1")
+        pts = _as_coords(points)
+        self.points = pts
+        self.leafsize = leafsize
+        n = len(pts)
+        order = np.arange(n)
+        # node k: (lo, hi, start, end, left, right) with left = -1 for leaves;
+        # the points of a node are self._data[start:end]
+        self._nodes = []
+        if n:
+            stack = [(0, n, None)]
+            while stack:
+                start, end, parent = stack.pop()
+                block = pts[order[start:end]]
+                k = len(self._nodes)
+                self._nodes.append([block.min(axis=0).tolist(), block.max(axis=0).tolist(), start, end, -1, -1])
+                if parent is not None:
+                    self._nodes[parent[0]][4 + parent[1]] = k
+                if end - start <= leafsize:
+                    continue
+                dim = int(np.argmax(block.max(axis=0) - block.min(axis=0)))
+                mid = (end - start) // 2
+                part = np.argpartition(block[:, dim], mid)
+                order[start:end] = order[start:end][part]
+                stack.append((start + mid, end, (k, 1)))
+                stack.append((start, start + mid, (k, 0)))
+        self._order = order
+        self._data = pts[order]
+
+    def __len__(self):
+        return len(self.points)
+
+    def __repr__(self):
+        return "%s(%d points, %d nodes)" % (type(self).__name__, len(self), len(self._nodes))
+
+    @staticmethod
+    def _box_distance(node, x, metric):
+        lo, hi = node[0], node[1]
+        if metric == 'taxicab':
+            return sum(max(l - c, 0.0, c - h) for l, c, h in zip(lo, x, hi))
+        return math.sqrt(sum(max(l - c, 0.0, c - h) ** 2 for l, c, h in zip(lo, x, hi)))
+
+    def _leaf_distances(self, node, x, metric):
+        diff = self._data[node[2]:node[3]] - x
+        if metric == 'taxicab':
+            return np.abs(diff).sum(axis=1)
+        return np.sqrt(np.einsum('ij,ij->i', diff, diff))
+
+    def _query_one(self, x, k, metric):
+        nodes = self._nodes
+        xl = x.tolist()
+        best = []  # heap of (-distance, index), the k nearest so far
+        worst = math.inf
+        heap = [(self._box_distance(nodes[0], xl, metric), 0)]
+        while heap:
+            d, k_node = heapq.heappop(heap)
+            if d > worst:
+                break
+            node = nodes[k_node]
+            if node[4] < 0:
+                dist = self._leaf_distances(node, x, metric)
+                close = np.flatnonzero(dist <= worst) if len(best) == k else np.arange(len(dist))
+                for j, dj in zip((close + node[2]).tolist(), dist[close].tolist()):
+                    if len(best) < k:
+                        heapq.heappush(best, (-dj, -j))
+                    elif dj < -best[0][0]:
+                        heapq.heapreplace(best, (-dj, -j))
+                if len(best) == k:
+                    worst = -best[0][0]
+            else:
+                for child in (node[4], node[5]):
+                    cd = self._box_distance(nodes[child], xl, metric)
+                    if cd <= worst:
+                        heapq.heappush(heap, (cd, child))
+        best.sort(reverse=True)
+        return [-d for d, _ in best], [int(self._order[-j]) for _, j in best]
+
+    def query(self, x, k=1, metric='euclidean'):
+        """Return ``(distances, indexes)`` of the k points nearest to x, nearest first.
+
+        :param x: one point, or many (PointArray, (M, 2)/(M, 3) array or sequence)
+        :return: for one point two lists of length k; for M points two (M, k) arrays.
+            When the tree has fewer than k points the rows are shorter.
+        """
+        _check_metric(metric)
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        single = isinstance(x, Point) or (isinstance(x, (tuple, list)) and len(x) and not hasattr(x[0], '__len__'))
+        xs = _as_coords(x)
+        if xs.shape[1] != self.points.shape[1]:
+            raise ValueError("query points don't match the dimension of the tree")
+        k = min(k, len(self))
+        results = [self._query_one(q, k, metric) if k else ([], []) for q in xs]
+        if single:
+            return results[0]
+        dist = np.array([r[0] for r in results], dtype=float).reshape(len(xs), k)
+        idx = np.array([r[1] for r in results], dtype=np.intp).reshape(len(xs), k)
+        return dist, idx
+
+    def _query_radius_one(self, x, r, metric):
+        xl = x.tolist()
+        found = []
+        stack = [0]
+        while stack:
+            node = self._nodes[stack.pop()]
+            if self._box_distance(node, xl, metric) > r:
+                continue
+            if node[4] < 0:
+                close = np.flatnonzero(self._leaf_distances(node, x, metric) <= r) + node[2]
+                found.extend(self._order[close].tolist())
+            else:
+                stack.append(node[4])
+                stack.append(node[5])
+        found.sort()
+        return found
+
+    def query_radius(self, x, r, metric='euclidean'):
+        """Return the sorted indexes of the points within distance r of x.
+
+        :param x: one point, or many (PointArray, (M, 2)/(M, 3) array or sequence)
+        :return: for one point a list of indexes; for M points a list of M such lists
+        """
+        _check_metric(metric)
+        single = isinstance(x, Point) or (isinstance(x, (tuple, list)) and len(x) and not hasattr(x[0], '__len__'))
+        xs = _as_coords(x)
+        if xs.shape[1] != self.points.shape[1]:
+            raise ValueError("query points don't match the dimension of the tree")
+        results = [self._query_radius_one(q, r, metric) if self._nodes else [] for q in xs]
+        return results[0] if single else results
+
+
+def nearest_neighbors(points, k=1, others=None, metric='euclidean'):
+    """Return ``(distances, indexes)``, two (N, k) arrays, of the k nearest
+    neighbours of every point among ``others``, or among the other points of
+    the same set when ``others`` is None."""
+    pts = _as_coords(points)
+    if others is not None:
+        return KDTree(others).query(pts, k, metric)
+    dist, idx = KDTree(pts).query(pts, k + 1, metric)
+    # drop each point itself; with duplicates it may not come first
+    keep = idx != np.arange(len(pts))[:, None]
+    keep[keep.sum(axis=1) > k, -1] = False
+    return dist[keep].reshape(len(pts), -1), idx[keep].reshape(len(pts), -1)
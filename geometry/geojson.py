@@ -0,0 +1,232 @@
+"""
+Streaming GeoJSON (RFC 7946) reading and writing.
+
+    Point                                Point2D / Point3D
+    LineString of 2 positions            Segment2D (or Line2D, Ray2D, see ``linear``)
+    Polygon with one ring                Polygon / Triangle
+    MultiPoint, MultiLineString,
+    MultiPolygon, GeometryCollection     list of the above
+
+``iter_load`` yields the geometry of each Feature of a FeatureCollection as
+soon as it has been read, decoding one feature at a time from a buffer that is
+refilled in chunks, so a FeatureCollection of any size is read in constant
+memory. Files holding a single geometry or Feature, and newline-delimited
+GeoJSON (one object per line, RFC 8142 record separators allowed), work too.
+
+``dump`` writes a FeatureCollection from any iterable of entities, one
+feature at a time.
+"""
+import json
+
+from .point import Point
+from .line import LinearEntity, Segment
+from .polygon import Polygon
+
+CHUNK_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+_SPACE = ' \t\r\n\x1e'
+
+
+class _Reader(object):
+    """Decode JSON values one at a time from a text file read in chunks"""
+
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """Read one more chunk, dropping what has been consumed; False at the end of the file"""
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """The next non-blank character, or '' at the end"""
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in _SPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ''
+
+    def take(self, expected):
+        if self.peek() != expected:
+            raise ValueError("expected %r in GeoJSON, got %r" % (expected, self.peek()))
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except ValueError:
+                # most likely cut off at the end of the buffer
+                if self._fill():
+                    continue
+                raise
+            # a number may go on in the next chunk
+            if end == len(self.buf) and not self.eof and isinstance(value, (int, float)) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+class _Builder(object):
+
+    def __init__(self, linear, validate):
+        self.linear = linear
+        self.validate = validate
+
+    def points(self, positions):
+        for p in positions:
+            if len(p) > 3:
+                raise ValueError("GeoJSON positions with more than 3 coordinates aren't supported")
+        return [Point._trusted(*p) for p in positions]
+
+    def polygon(self, rings):
+        if len(rings) != 1:
+            raise ValueError("only Polygons without holes can be read, got %d rings" % len(rings))
+        ring = self.points(rings[0])
+        if len(ring) > 1 and ring[0] == ring[-1]:
+            ring.pop()
+        return Polygon(*ring, validate=self.validate)
+
+    def linestring(self, positions):
+        if len(positions) != 2:
+            raise ValueError("only 2-point LineStrings can be read, got %d points" % len(positions))
+        return self.linear(*self.points(positions))
+
+    def geometry(self, obj):
+        kind = obj.get('type')
+        if kind == 'Feature':
+            geometry = obj.get('geometry')
+            return None if geometry is None else self.geometry(geometry)
+        if kind == 'GeometryCollection':
+            return [self.geometry(g) for g in obj['geometries']]
+        coords = obj.get('coordinates')
+        if kind == 'Point':
+            return self.points([coords])[0]
+        if kind == 'LineString':
+            return self.linestring(coords)
+        if kind == 'Polygon':
+            return self.polygon(coords)
+        if kind == 'MultiPoint':
+            return self.points(coords)
+        if kind == 'MultiLineString':
+            return [self.linestring(c) for c in coords]
+        if kind == 'MultiPolygon':
+            return [self.polygon(c) for c in coords]
+        raise ValueError("unknown GeoJSON type %r" % kind)
+
+
+def _objects(reader, build, properties):
+    """Yield the entities of the top-level JSON objects read by reader"""
+    while reader.peek():
+        reader.take('{')
+        members = {}
+        while reader.peek() != '}':
+            if members:
+                reader.take(',')
+            key = reader.value()
+            reader.take(':')
+            if key == 'features' and members.get('type', 'FeatureCollection') == 'FeatureCollection':
+                # stream the features instead of decoding the whole array
+                reader.take('[')
+                first = True
+                while reader.peek() != ']':
+                    if not first:
+                        reader.take(',')
+                    first = False
+                    feature = reader.value()
+                    e = build.geometry(feature)
+                    yield (e, feature.get('properties')) if properties else e
+                reader.take(']')
+                members[key] = None
+            else:
+                members[key] = reader.value()
+        reader.take('}')
+        if members.get('type') != 'FeatureCollection':
+            e = build.geometry(members)
+            yield (e, members.get('properties')) if properties else e
+
+
+def iter_load(source, linear=Segment, validate=True, properties=False, chunk_size=CHUNK_SIZE):
+    """Yield the entities of a GeoJSON file one at a time.
+
+    Features without a geometry give None.
+
+    :param source: a text file object, or a path
+    :param linear: the class built from a 2-point LineString: Segment, Line or Ray
+    :param validate: passed to Polygon; False skips the vertex normalization
+        for input known to be clean
+    :param properties: yield ``(entity, properties)`` pairs instead of entities
+    """
+    if isinstance(source, str):
+        with open(source) as fp:
+            for e in iter_load(fp, linear, validate, properties, chunk_size):
+                yield e
+        return
+    for e in _objects(_Reader(source, chunk_size), _Builder(linear, validate), properties):
+        yield e
+
+
+def loads(text, linear=Segment, validate=True):
+    """Return the entity of a GeoJSON geometry or Feature string
+    (a list for multi geometries, collections and FeatureCollections)"""
+    obj = json.loads(text)
+    build = _Builder(linear, validate)
+    if obj.get('type') == 'FeatureCollection':
+        return [build.geometry(f) for f in obj['features']]
+    return build.geometry(obj)
+
+
+def to_geometry(entity):
+    """Return the GeoJSON geometry of an entity, as a dict"""
+    if isinstance(entity, Point):
+        return {'type': 'Point', 'coordinates': list(entity.args)}
+    if isinstance(entity, LinearEntity):
+        return {'type': 'LineString', 'coordinates': [list(p.args) for p in entity.args]}
+    if isinstance(entity, Polygon):
+        args = entity.args
+        return {'type': 'Polygon', 'coordinates': [[list(p.args) for p in args + args[:1]]]}
+    if isinstance(entity, (list, tuple)):
+        return {'type': 'GeometryCollection', 'geometries': [to_geometry(e) for e in entity]}
+    raise ValueError("can't write %s as GeoJSON" % type(entity).__name__)
+
+
+def dumps(entity):
+    """Return the GeoJSON geometry of an entity as a string"""
+    return json.dumps(to_geometry(entity))
+
+
+def dump(entities, fp, properties=None):
+    """Write the entities to a text file object as a FeatureCollection, one
+    feature per line. Returns the number written.
+
+    :param properties: optional iterable of property dicts, one per entity
+    """
+    fp.write('{"type": "FeatureCollection", "features": [\n')
+    props = iter(properties) if properties is not None else None
+    n = 0
+    for e in entities:
+        feature = {'type': 'Feature', 'geometry': to_geometry(e),
+                   'properties': next(props) if props is not None else None}
+        if n:
+            fp.write(',\n')
+        fp.write(json.dumps(feature))
+        n += 1
+    fp.write('\n]}\n')
+    return n
@@ -0,0 +1,287 @@
+"""
+Convex hulls of point sets.
+
+2D hulls use Andrew's monotone chain, O(n log n). For large inputs the points
+inside the octagon spanned by the extreme points in 8 directions (the
+Akl-Toussaint heuristic) are first discarded with numpy, so the chain usually
+only walks a small fraction of the cloud.
+
+3D hulls are built with Quickhull's conflict lists, O(n log n) expected,
+after the same kind of prefilter.
+
+This module needs numpy.
+"""
+import numpy as np
+
+from .point import Point
+from .polygon import Polygon
+from .predicates import orient3d, _ORIENT3D_BOUND
+
+# below this many points the prefilter costs more than it saves
+PREFILTER_MIN = 64
+
+# the 3D hull tests this many point/face pairs or more with numpy, fewer one by one
+BLOCK_MIN = 256
+
+
+def _as_array(points):
+    """Return the points as an (N, 2) or (N, 3) float array"""
+    if hasattr(points, 'coords'):
+        points = points.coords
+    elif not isinstance(points, np.ndarray):
+        points = [tuple(Point._convert(p)) for p in points]
+    pts = np.asarray(points, dtype=float)
+    if pts.ndim != 2 or pts.shape[1] not in (2, 3):
+        raise ValueError("convex_hull needs 2D or 3D points")
+    return pts
+
+
+def akl_toussaint(pts):
+    """Drop the 2D points strictly inside the polygon of the extreme points in
+    the directions 0, 45, ..., 315 degrees; they can't be hull vertices."""
+    x, y = pts[:, 0], pts[:, 1]
+    s, d = x + y, x - y
+    extremes = [np.argmax(x), np.argmax(s), np.argmax(y), np.argmin(d),
+                np.argmin(x), np.argmin(s), np.argmin(y), np.argmax(d)]
+    poly = []
+    for i in extremes:
+        p = tuple(pts[i])
+        if not poly or p != poly[-1]:
+            poly.append(p)
+    while len(poly) > 1 and poly[0] == poly[-1]:
+        poly.pop()
+    if len(poly) < 3:
+        return pts
+
+    inside = np.ones(len(pts), dtype=bool)
+    for k in range(len(poly)):
+        (ax, ay), (bx, by) = poly[k - 1], poly[k]
+        inside &= (bx - ax)*(y - ay) - (by - ay)*(x - ax) > 0
+    return pts[~inside]
+
+
+def _monotone_chain(pts):
+    """Hull vertices of lexicographically sorted, distinct (x, y) tuples, counterclockwise"""
+    if len(pts) < 3:
+        return pts
+
+    def half(points):
+        chain = []
+        for p in points:
+            while len(chain) >= 2:
+                (ox, oy), (ax, ay) = chain[-2], chain[-1]
+                if (ax - ox)*(p[1] - oy) - (ay - oy)*(p[0] - ox) > 0:
+                    break
+                chain.pop()
+            chain.append(p)
+        return chain
+
+    lower = half(pts)
+    upper = half(reversed(pts))
+    return lower[:-1] + upper[:-1]
+
+
+def convex_hull(points, prefilter=True):
+    """Return the convex hull of the points.
+
+    :param points: sequence of Points or coordinate tuples, PointArray, or (N, 2)/(N, 3) array
+    :param prefilter: discard interior points with the Akl-Toussaint heuristic first
+    :return: for 2D points a counterclockwise Polygon, or a Segment or Point when
+        the points are collinear or all equal; for 3D points see ``convex_hull_3d``
+    """
+    pts = _as_array(points)
+    if not len(pts):
+        raise ValueError("convex_hull of no points")
+    if pts.shape[1] == 3:
+        return convex_hull_3d(pts, prefilter)
+
+    if prefilter and len(pts) >= PREFILTER_MIN:
+        pts = akl_toussaint(pts)
+    # sorted rows without duplicates
+    pts = np.unique(pts, axis=0)
+    hull = _monotone_chain([tuple(p) for p in pts.tolist()])
+    if len(hull) == 1:
+        return Point._trusted(*hull[0])
+    return Polygon(*hull)
+
+
+def _octahedron_filter(pts):
+    """3D counterpart of akl_toussaint using the 6 axis extremes"""
+    ids = []
+    for k in range(3):
+        for i in (np.argmin(pts[:, k]), np.argmax(pts[:, k])):
+            if i not in ids:
+                ids.append(i)
+    if len(ids) < 4:
+        return pts
+    try:
+        faces = _hull_faces(pts[ids])
+    except ValueError:
+        return pts
+    v = pts[ids]
+    inside = np.ones(len(pts), dtype=bool)
+    for a, b, c in faces:
+        normal = np.cross(v[b] - v[a], v[c] - v[a])
+        # rounding can put points of the face itself slightly behind it
+        tol = 1e-12 * np.abs(normal).sum() * np.abs(v).max()
+        inside &= (pts - v[a]).dot(normal) < -tol
+    inside[ids] = False
+    return pts[~inside]
+
+
+def _above(pts, P, faces, ids):
+    """(len(ids), len(faces)) bool array: whether each point lies strictly
+    outside each face, decided exactly as predicates.orient3d does"""
+    f = np.asarray(faces)
+    a, b, c = (pts[f[:, k]][None, :, :] for k in range(3))
+    d = pts[ids][:, None, :]
+    ad, bd, cd = a - d, b - d, c - d
+    adx, ady, adz = ad[..., 0], ad[..., 1], ad[..., 2]
+    bdx, bdy, bdz = bd[..., 0], bd[..., 1], bd[..., 2]
+    cdx, cdy, cdz = cd[..., 0], cd[..., 1], cd[..., 2]
+    bdxcdy, cdxbdy = bdx * cdy, cdx * bdy
+    cdxady, adxcdy = cdx * ady, adx * cdy
+    adxbdy, bdxady = adx * bdy, bdx * ady
+    det = adz * (bdxcdy - cdxbdy) + bdz * (cdxady - adxcdy) + cdz * (adxbdy - bdxady)
+    permanent = ((np.abs(bdxcdy) + np.abs(cdxbdy)) * np.abs(adz)
+                 + (np.abs(cdxady) + np.abs(adxcdy)) * np.abs(bdz)
+                 + (np.abs(adxbdy) + np.abs(bdxady)) * np.abs(cdz))
+    above = det < 0
+    for i, j in zip(*np.nonzero(np.abs(det) <= _ORIENT3D_BOUND * permanent)):
+        above[i, j] = orient3d(P[f[j, 0]], P[f[j, 1]], P[f[j, 2]], P[ids[i]]) < 0
+    return above
+
+
+def _hull_faces(pts, seed=0):
+    """3D hull with conflict lists (Quickhull). Returns outward-facing (i, j, k)
+    triangles indexing pts.
+
+    Every point not yet on the hull waits in the outside list of one face it
+    sees; the farthest point of a face is added next and the points of the
+    faces it replaces are handed to the new faces or dropped as inside. The
+    points are shuffled first so that the lists stay balanced whatever the
+    input order. Sides are decided exactly (predicates.orient3d); a point in
+    the plane of a face replaces that face too, so points inside the faces
+    and edges of the hull don't become vertices, as the 2D hull drops
+    collinear points.
+    """
+    pts = np.asarray(pts, dtype=float)
+    n = len(pts)
+    if n < 4:
+        raise ValueError("points are coplanar or collinear, the 3D hull is flat")
+    P = [tuple(p) for p in pts.tolist()]
+
+    # initial tetrahedron from far apart points
+    i0 = int(np.argmin(pts[:, 0]))
+    i1 = int(np.argmax(((pts - pts[i0]) ** 2).sum(axis=1)))
+    line = pts[i1] - pts[i0]
+    i2 = int(np.argmax((np.cross(pts - pts[i0], line) ** 2).sum(axis=1)))
+    normal = np.cross(line, pts[i2] - pts[i0])
+    i3 = int(np.argmax(np.abs((pts - pts[i0]).dot(normal))))
+    o = orient3d(P[i0], P[i1], P[i2], P[i3])
+    if o == 0 or i2 in (i0, i1):
+        raise ValueError("points are coplanar or collinear, the 3D hull is flat")
+    if o < 0:
+        i1, i2 = i2, i1
+
+    faces = {}
+    edges = {}
+    outside = {}
+
+    def add(a, b, c):
+        key = (a, b, c)
+        faces[key] = True
+        edges[(a, b)] = edges[(b, c)] = edges[(c, a)] = key
+        return key
+
+    def assign(ids, new):
+        """Put each point in the outside list of the first new face it sees"""
+        lists = dict((f, []) for f in new)
+        if len(ids) * len(new) > BLOCK_MIN:
+            ids = np.asarray(ids)
+            above = _above(pts, P, new, ids)
+            sees = above.any(axis=1)
+            first = above.argmax(axis=1)
+            for j, f in enumerate(new):
+                lists[f] = ids[sees & (first == j)].tolist()
+        else:
+            for q in ids:
+                for f in new:
+                    if orient3d(P[f[0]], P[f[1]], P[f[2]], P[q]) < 0:
+                        lists[f].append(q)
+                        break
+        for f, mine in lists.items():
+            if mine:
+                outside[f] = mine
+                pending.append(f)
+
+    # i3 lies below the plane (i0, i1, i2), so these all face outwards
+    new = [add(i0, i1, i2), add(i0, i3, i1), add(i1, i3, i2), add(i2, i3, i0)]
+    rest = np.setdiff1d(np.arange(n), [i0, i1, i2, i3])
+    pending = []
+    assign(np.random.RandomState(seed).permutation(rest), new)
+
+    while pending:
+        f = pending.pop()
+        ids = outside.pop(f, None)
+        if ids is None:
+            continue
+        # the farthest point from the plane of f
+        (ax, ay, az), (bx, by, bz), (cx, cy, cz) = P[f[0]], P[f[1]], P[f[2]]
+        ux, uy, uz = bx - ax, by - ay, bz - az
+        vx, vy, vz = cx - ax, cy - ay, cz - az
+        nx, ny, nz = uy*vz - uz*vy, uz*vx - ux*vz, ux*vy - uy*vx
+        if len(ids) > BLOCK_MIN:
+            k = int(np.argmax((pts[ids] - pts[f[0]]).dot((nx, ny, nz))))
+        else:
+            k = max(range(len(ids)), key=lambda k: (nx*(P[ids[k]][0] - ax) + ny*(P[ids[k]][1] - ay)
+                                                   + nz*(P[ids[k]][2] - az)))
+        p = ids[k]
+        orphans = ids[:k] + ids[k + 1:]
+
+        # the faces p sees or lies in the plane of, a connected patch around f
+        visible = {f}
+        stack = [f]
+        while stack:
+            g = stack.pop()
+            for e in ((g[1], g[0]), (g[2], g[1]), (g[0], g[2])):
+                h = edges[e]
+                if h not in visible and orient3d(P[h[0]], P[h[1]], P[h[2]], P[p]) <= 0:
+                    visible.add(h)
+                    stack.append(h)
+
+        horizon = []
+        for g in visible:
+            for e in ((g[0], g[1]), (g[1], g[2]), (g[2], g[0])):
+                if edges[(e[1], e[0])] not in visible:
+                    horizon.append(e)
+        for g in visible:
+            del faces[g]
+            orphans += outside.pop(g, [])
+            for e in ((g[0], g[1]), (g[1], g[2]), (g[2], g[0])):
+                if edges.get(e) == g:
+                    del edges[e]
+        assign(orphans, [add(a, b, p) for a, b in horizon])
+    return list(faces)
+
+
+def convex_hull_3d(points, prefilter=True):
+    """Return the convex hull of 3D points as ``(vertices, faces)``.
+
+    ``vertices`` is a list of the Point3D on the hull and ``faces`` a list of
+    (i, j, k) index triples into it, counterclockwise seen from outside.
+    Raises ValueError if the points are coplanar.
+    """
+    pts = _as_array(points)
+    if pts.shape[1] != 3:
+        raise ValueError("convex_hull_3d needs 3D points")
+    pts = np.unique(pts, axis=0)
+    if prefilter and len(pts) >= PREFILTER_MIN:
+        pts = _octahedron_filter(pts)
+    if len(pts) < 4:
+        raise ValueError("points are coplanar or collinear, the 3D hull is flat")
+    faces = _hull_faces(pts)
+    used = sorted(set(i for f in faces for i in f))
+    new_index = dict((old, new) for new, old in enumerate(used))
+    vertices = [Point._trusted(*pts[i].tolist()) for i in used]
+    return vertices, [tuple(new_index[i] for i in f) for f in faces]
@@ -0,0 +1,285 @@
+"""
+Spatial index over geometry entities, bulk-loaded from their ``bounds``.
+
+``STRtree`` packs points, segments and polygons into an R-tree with the
+Sort-Tile-Recursive algorithm. The tree is built once and never changes,
+which suits a fixed set of entities queried many times.
+
+``save``/``load`` use a small binary format of their own rather than pickle,
+so loading a file never runs code from it: a header (magic ``b'STRT'``,
+format version, node capacity), the entities as type codes and float
+coordinates, then the nodes depth first.
+"""
+import heapq
+import math
+import struct
+
+from .point import Point, Point2D
+from .line import Segment, Segment2D
+from .polygon import Polygon, Triangle
+
+_MAGIC = b'STRT'
+_FORMAT_VERSION = 2
+
+# entity type codes of the file format
+_POINT, _SEGMENT, _POLYGON, _TRIANGLE, _PREPARED = 1, 2, 3, 4, 5
+
+
+def _window(window):
+    """Return (xmin, ymin, xmax, ymax) for a bounds tuple, a Point or any entity with bounds"""
+    if isinstance(window, tuple) and len(window) == 4:
+        return window
+    if not hasattr(window, 'bounds'):
+        window = Point._convert(window)
+    return window.bounds
+
+
+def _box_dist2(node, x, y):
+    """Squared distance from (x, y) to the box of a node"""
+    dx = max(node[0] - x, 0, x - node[2])
+    dy = max(node[1] - y, 0, y - node[3])
+    return dx*dx + dy*dy
+
+
+class STRtree(object):
+    """A static R-tree over entities that have ``bounds``.
+
+    Queries return indexes into ``entities``, the sequence the tree was built from.
+
+    :param entities: Point2D, Segment2D and Polygon objects. Lines and rays are
+        unbounded and can't be indexed.
+    :param node_capacity: the most children per node
+    """
+
+    def __init__(self, entities, node_capacity=10):
+        if node_capacity < 2:
+            raise ValueError("node_capacity must be at least 2")
+        self.entities = list(entities)
+        self.node_capacity = node_capacity
+        self._bounds = [e.bounds for e in self.entities]
+        self._root = self._build(self._bounds)
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __repr__(self):
+        return "%s(%d entities)" % (type(self).__name__, len(self))
+
+    def _build(self, bounds):
+        """Pack the boxes level by level. A node is a tuple
+        (xmin, ymin, xmax, ymax, children, is_leaf)."""
+        if not bounds:
+            return None
+        m = self.node_capacity
+        level = [(b[0], b[1], b[2], b[3], i, True) for i, b in enumerate(bounds)]
+        leaf = True
+        while True:
+            nodes = []
+            n_nodes = int(math.ceil(len(level) / float(m)))
+            n_slices = int(math.ceil(math.sqrt(n_nodes)))
+            per_slice = n_slices * m
+            level.sort(key=lambda e: e[0] + e[2])
+            for s in range(0, len(level), per_slice):
+                tile = sorted(level[s:s + per_slice], key=lambda e: e[1] + e[3])
+                for k in range(0, len(tile), m):
+                    group = tile[k:k + m]
+                    kids = [e[4] for e in group] if leaf else group
+                    nodes.append((min(e[0] for e in group), min(e[1] for e in group),
+                                  max(e[2] for e in group), max(e[3] for e in group),
+                                  kids, leaf))
+            if len(nodes) == 1:
+                return nodes[0]
+            level = nodes
+            leaf = False
+
+    @property
+    def bounds(self):
+        """Return a tuple (xmin, ymin, xmax, ymax) covering every entity"""
+        if self._root is None:
+            return None
+        return self._root[:4]
+
+    def query(self, window):
+        """Return the indexes of the entities whose bounds overlap ``window``.
+
+        :param window: (xmin, ymin, xmax, ymax) tuple, or an entity whose bounds are used
+        """
+        if self._root is None:
+            return []
+        xmin, ymin, xmax, ymax = _window(window)
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node[0] > xmax or node[2] < xmin or node[1] > ymax or node[3] < ymin:
+                continue
+            if node[5]:
+                boxes = self._bounds
+                for i in node[4]:
+                    b = boxes[i]
+                    if b[0] <= xmax and b[2] >= xmin and b[1] <= ymax and b[3] >= ymin:
+                        found.append(i)
+            else:
+                stack.extend(node[4])
+        found.sort()
+        return found
+
+    def intersection_candidates(self, entity):
+        """Return the indexes of the entities that may intersect ``entity``:
+        those whose bounds overlap its bounds."""
+        return self.query(entity.bounds)
+
+    def containing(self, point):
+        """Return the indexes of the polygons that enclose ``point``.
+
+        Only polygons whose bounds hold the point are tested. Points on a
+        polygon's boundary aren't enclosed by it, as in ``Polygon.encloses_point``.
+        For many queries against the same polygons, build the tree from
+        ``geometry.prepared.PreparedPolygon`` objects instead of the polygons.
+        """
+        p = Point._convert(point)
+        return [i for i in self.query((p.x, p.y, p.x, p.y))
+                if hasattr(self.entities[i], 'encloses_point') and self.entities[i].encloses_point(p)]
+
+    def nearest(self, point, k=1):
+        """Return the indexes of the k entities nearest to ``point``, nearest first.
+
+        Boxes are searched best-first, so only the entities that could be among
+        the k nearest have their exact ``distance`` computed.
+        """
+        if self._root is None or k < 1:
+            return []
+        p = Point._convert(point)
+        x, y = p.x, p.y
+        heap = [(_box_dist2(self._root, x, y), 0, False, self._root)]
+        counter = 1
+        found = []
+        while heap and len(found) < k:
+            d2, _, exact, item = heapq.heappop(heap)
+            if exact:
+                found.append(item)
+            elif item[5]:
+                for i in item[4]:
+                    d = self.entities[i].distance(p)
+                    heapq.heappush(heap, (d*d, counter, True, i))
+                    counter += 1
+            else:
+                for child in item[4]:
+                    heapq.heappush(heap, (_box_dist2(child, x, y), counter, False, child))
+                    counter += 1
+        return found
+
+    def save(self, path):
+        """Write the tree and its entities to ``path``.
+
+        Point2D, Segment2D, Polygon (read back as Polygon, or Triangle for
+        triangles) and PreparedPolygon entities can be saved.
+        """
+        out = [struct.pack('<4sHI', _MAGIC, _FORMAT_VERSION, self.node_capacity),
+               struct.pack('<I', len(self.entities))]
+        for e in self.entities:
+            _write_entity(e, out)
+        if self._root is not None:
+            _write_node(self._root, out)
+        with open(path, 'wb') as f:
+            f.write(b''.join(out))
+
+    @classmethod
+    def load(cls, path):
+        """Read a tree written by ``save``, without rebuilding it"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        try:
+            magic, version, node_capacity = struct.unpack_from('<4sHI', data, 0)
+            if magic != _MAGIC:
+                raise ValueError("not an STRtree file")
+            if version != _FORMAT_VERSION:
+                raise ValueError("unsupported STRtree file version %s" % version)
+            n, = struct.unpack_from('<I', data, 10)
+            pos = 14
+            entities = []
+            for _ in range(n):
+                e, pos = _read_entity(data, pos)
+                entities.append(e)
+            root = None
+            if n:
+                root, pos = _read_node(data, pos, n)
+        except struct.error:
+            raise ValueError("truncated STRtree file")
+        if pos != len(data):
+            raise ValueError("trailing data after the STRtree")
+        tree = cls.__new__(cls)
+        tree.entities = entities
+        tree.node_capacity = node_capacity
+        tree._bounds = [e.bounds for e in entities]
+        tree._root = root
+        return tree
+
+
+def _write_ring(points, out):
+    flat = [c for p in points for c in (p.x, p.y)]
+    out.append(struct.pack('<I%dd' % len(flat), len(points), *flat))
+
+
+def _write_entity(e, out):
+    if isinstance(e, Point2D):
+        out.append(struct.pack('<B2d', _POINT, e.x, e.y))
+    elif isinstance(e, Segment2D):
+        out.append(struct.pack('<B4d', _SEGMENT, e.p1.x, e.p1.y, e.p2.x, e.p2.y))
+    elif isinstance(e, Polygon):
+        out.append(struct.pack('<B', _TRIANGLE if isinstance(e, Triangle) else _POLYGON))
+        _write_ring(e.vertices, out)
+    elif type(e).__name__ == 'PreparedPolygon':
+        out.append(struct.pack('<BI', _PREPARED, e.bands))
+        _write_entity(e.polygon, out)
+    else:
+        raise ValueError("can't save %s in an STRtree file" % type(e).__name__)
+
+
+def _read_entity(data, pos):
+    code, = struct.unpack_from('<B', data, pos)
+    pos += 1
+    if code == _POINT:
+        x, y = struct.unpack_from('<2d', data, pos)
+        return Point(x, y), pos + 16
+    if code == _SEGMENT:
+        x1, y1, x2, y2 = struct.unpack_from('<4d', data, pos)
+        return Segment(Point(x1, y1), Point(x2, y2)), pos + 32
+    if code in (_POLYGON, _TRIANGLE):
+        n, = struct.unpack_from('<I', data, pos)
+        flat = struct.unpack_from('<%dd' % (2*n), data, pos + 4)
+        vertices = [Point._trusted(flat[k], flat[k + 1]) for k in range(0, 2*n, 2)]
+        cls = Triangle if code == _TRIANGLE else Polygon
+        return cls(*vertices, validate=False), pos + 4 + 16*n
+    if code == _PREPARED:
+        from .prepared import PreparedPolygon
+        bands, = struct.unpack_from('<I', data, pos)
+        polygon, pos = _read_entity(data, pos + 4)
+        return PreparedPolygon(polygon, bands), pos
+    raise ValueError("unknown entity type %d in STRtree file" % code)
+
+
+def _write_node(node, out):
+    out.append(struct.pack('<4dBI', node[0], node[1], node[2], node[3], node[5], len(node[4])))
+    if node[5]:
+        out.append(struct.pack('<%dI' % len(node[4]), *node[4]))
+    else:
+        for child in node[4]:
+            _write_node(child, out)
+
+
+def _read_node(data, pos, n):
+    """Read a node written by _write_node; n is the number of entities"""
+    xmin, ymin, xmax, ymax, leaf, count = struct.unpack_from('<4dBI', data, pos)
+    pos += 37
+    if leaf:
+        kids = list(struct.unpack_from('<%dI' % count, data, pos))
+        pos += 4*count
+        if any(i >= n for i in kids):
+            raise ValueError("entity index out of range in STRtree file")
+    else:
+        kids = []
+        for _ in range(count):
+            child, pos = _read_node(data, pos, n)
+            kids.append(child)
+    return (xmin, ymin, xmax, ymax, kids, bool(leaf)), pos
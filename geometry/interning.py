@@ -0,0 +1,70 @@
+"""
+Interning of points and segments.
+
+A mesh shares each vertex between several polygons and each edge between two.
+An ``InternPool`` hands out one object per distinct coordinate tuple, so the
+shared vertices and sides are built once, compare by identity first and hash
+once. The pool is bounded and forgets the least recently used entries.
+
+Points have ``__slots__`` and no ``__weakref__``, so the pool keeps strong
+references; ``maxsize`` bounds the memory it holds on to.
+
+Polygons use the active pool for their vertices and sides::
+
+    from geometry import interning
+    interning.enable(100000)
+    ...
+    print(interning.active_pool().stats())
+    interning.disable()
+"""
+from .cache import LRUCache
+from .point import Point
+from .line import Segment
+
+
+class InternPool(LRUCache):
+    """A bounded LRU pool of Point2D, Point3D and Segment objects keyed on coordinates.
+
+    :param maxsize: the most entries kept; points and segments count alike
+    """
+
+    def __init__(self, maxsize=65536):
+        super(InternPool, self).__init__(maxsize)
+
+    def point(self, p):
+        """Return the pooled point equal to p, a Point or coordinate sequence"""
+        key = tuple(p)
+        obj = self.get(key)
+        if obj is None:
+            obj = self.put(key, Point._convert(p))
+        return obj
+
+    def segment(self, p1, p2):
+        """Return the pooled segment from p1 to p2, with pooled endpoints.
+        Segments are directed: (p1, p2) and (p2, p1) are separate entries."""
+        key = (tuple(p1), tuple(p2))
+        obj = self.get(key)
+        if obj is None:
+            obj = self.put(key, Segment(self.point(p1), self.point(p2)))
+        return obj
+
+
+_active = None
+
+
+def enable(maxsize=65536):
+    """Make a new pool of the given size the active one and return it"""
+    global _active
+    _active = InternPool(maxsize)
+    return _active
+
+
+def disable():
+    """Stop interning; entities already built keep their pooled parts"""
+    global _active
+    _active = None
+
+
+def active_pool():
+    """Return the active InternPool, or None when interning is off"""
+    return _active
@@ -0,0 +1,335 @@
+"""
+Vectorized intersection of many 2D lines, rays and segments at once.
+
+``LinearEntity.intersection`` answers one pair at a time. ``batch_intersection``
+takes two whole sets (or one set, for self-intersections) and finds every
+intersecting pair with numpy, after a bounding box prefilter. Its answers
+agree with the scalar ``intersection``; the only difference is that whether a
+crossing point lies on a segment or ray is decided from the input coordinates,
+not from the rounded crossing point.
+
+This module needs numpy.
+"""
+import numpy as np
+
+from .basic import GeometryEntity
+from .line import LinearEntity, Line, Ray, Segment, _exact_crossing, _crossing_point
+from .point import Point
+from .predicates import orient2d, cross2d, _ORIENT2D_BOUND
+
+# kinds of linear entity
+LINE = 0
+RAY = 1
+SEGMENT = 2
+
+# kinds of intersection result
+POINT = 0
+OVERLAP_SEGMENT = 1
+OVERLAP_RAY = 2
+OVERLAP_LINE = 3
+
+# how many candidate pairs are tested in one vectorized step
+CHUNK_PAIRS = 1 << 20
+
+
+def _kind_of(entity):
+    if isinstance(entity, Segment):
+        return SEGMENT
+    if isinstance(entity, Ray):
+        return RAY
+    if isinstance(entity, Line):
+        return LINE
+    raise TypeError("%s is not a line, ray or segment" % type(entity).__name__)
+
+
+def linear_array(entities, kind=SEGMENT):
+    """Return ``(coords, kinds)`` for a set of linear entities.
+
+    ``coords`` is an ``(N, 4)`` array of ``x1, y1, x2, y2`` rows and ``kinds``
+    holds LINE, RAY or SEGMENT for every row.
+    ``entities`` may be a Polygon (its sides are used), a sequence of
+    Line2D/Ray2D/Segment2D objects, or an ``(N, 4)`` array whose rows all have
+    the given ``kind``.
+    """
+    if isinstance(entities, GeometryEntity) and not isinstance(entities, LinearEntity):
+        # a Polygon: side k runs from vertex k to vertex k + 1
+        v = np.array([p.args for p in entities.args], dtype=float)
+        coords = np.hstack((v, np.roll(v, -1, axis=0)))
+        return coords, np.full(len(coords), SEGMENT, dtype=np.int8)
+    if isinstance(entities, np.ndarray):
+        coords = np.asarray(entities, dtype=float).reshape(-1, 4)
+        return coords, np.full(len(coords), kind, dtype=np.int8)
+    entities = list(entities)
+    coords = np.array([e.p1.args + e.p2.args for e in entities], dtype=float).reshape(-1, 4)
+    kinds = np.array([_kind_of(e) for e in entities], dtype=np.int8)
+    return coords, kinds
+
+
+def _bounds(coords, kinds):
+    """Bounding boxes of the rows; rays and lines reach to infinity."""
+    x1, y1, x2, y2 = coords.T
+    xmin, xmax = np.minimum(x1, x2), np.maximum(x1, x2)
+    ymin, ymax = np.minimum(y1, y2), np.maximum(y1, y2)
+    line = kinds == LINE
+    ray = kinds == RAY
+    inf = np.inf
+    xmin = np.where(line | (ray & (x2 < x1)), -inf, xmin)
+    xmax = np.where(line | (ray & (x2 > x1)), inf, xmax)
+    ymin = np.where(line | (ray & (y2 < y1)), -inf, ymin)
+    ymax = np.where(line | (ray & (y2 > y1)), inf, ymax)
+    # a horizontal or vertical line is still thin in the other direction
+    xmin = np.where(line & (x1 == x2), x1, xmin)
+    xmax = np.where(line & (x1 == x2), x1, xmax)
+    ymin = np.where(line & (y1 == y2), y1, ymin)
+    ymax = np.where(line & (y1 == y2), y1, ymax)
+    return xmin, ymin, xmax, ymax
+
+
+def _coefficients(x1, y1, x2, y2):
+    """Vectorized ``Line2D.coefficients``."""
+    vertical = x1 == x2
+    horizontal = (y1 == y2) & ~vertical
+    a = np.where(vertical, 1.0, np.where(horizontal, 0.0, y1 - y2))
+    b = np.where(vertical, 0.0, np.where(horizontal, 1.0, x2 - x1))
+    c = np.where(vertical, -x1, np.where(horizontal, -y1, x1*y2 - y1*x2))
+    return a, b, c
+
+
+def _in_span(num, den, kind):
+    """Whether the parameter num/den lies on the entity: [0, 1] for a segment,
+    [0, inf) for a ray, anything for a line."""
+    s = np.sign(den)
+    num = num * s
+    den = den * s
+    ok = (kind == LINE) | (num >= 0)
+    return ok & ((kind != SEGMENT) | (num <= den))
+
+
+class BatchIntersection(object):
+    """The intersecting pairs found by ``batch_intersection``.
+
+    ``i`` and ``j`` index the first and second input, ``kind`` is POINT,
+    OVERLAP_SEGMENT, OVERLAP_RAY or OVERLAP_LINE and ``coords`` holds one row per
+    pair: ``x, y, nan, nan`` for a point, otherwise the two points that define the
+    overlap (for a ray, its source and a second point on it).
+    """
+    __slots__ = ('i', 'j', 'kind', 'coords')
+
+    def __init__(self, i, j, kind, coords):
+        self.i = i
+        self.j = j
+        self.kind = kind
+        self.coords = coords
+
+    def __len__(self):
+        return len(self.i)
+
+    def __repr__(self):
+        return "%s(%d pairs)" % (type(self).__name__, len(self))
+
+    def pairs(self):
+        """Return the intersecting ``(i, j)`` pairs as a list of tuples"""
+        return list(zip(self.i.tolist(), self.j.tolist()))
+
+    def entity(self, k):
+        """Return the k-th result as a Point, Segment, Ray or Line"""
+        x1, y1, x2, y2 = self.coords[k].tolist()
+        kind = self.kind[k]
+        if kind == POINT:
+            return Point._trusted(x1, y1)
+        p1, p2 = Point._trusted(x1, y1), Point._trusted(x2, y2)
+        if kind == OVERLAP_SEGMENT:
+            return Segment(p1, p2)
+        if kind == OVERLAP_RAY:
+            return Ray(p1, p2)
+        return Line(p1, p2)
+
+    def to_entities(self):
+        """Return a list of ``(i, j, entity)`` tuples"""
+        return [(i, j, self.entity(k))
+                for k, (i, j) in enumerate(zip(self.i.tolist(), self.j.tolist()))]
+
+
+def _empty():
+    return (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp),
+            np.empty(0, dtype=np.int8), np.empty((0, 4)))
+
+
+def _orient_zero(ax, ay, bx, by, cx, cy):
+    """Vectorized ``predicates.orient2d(a, b, c) == 0``. The float filter
+    settles almost every row; the uncertain ones are decided exactly one by one."""
+    detleft = (ax - cx) * (by - cy)
+    detright = (ay - cy) * (bx - cx)
+    det = detleft - detright
+    zero = np.zeros(len(det), dtype=bool)
+    unsure = np.flatnonzero(np.abs(det) <= _ORIENT2D_BOUND * (np.abs(detleft) + np.abs(detright)))
+    for k in unsure.tolist():
+        zero[k] = orient2d((float(ax[k]), float(ay[k])), (float(bx[k]), float(by[k])),
+                           (float(cx[k]), float(cy[k]))) == 0
+    return zero
+
+
+def _cross_zero(rx, ry, sx, sy, den):
+    """Vectorized ``predicates.cross2d(...) == 0`` for the directions (rx, ry)
+    and (sx, sy), where den = rx*sy - ry*sx; filtered as _orient_zero."""
+    bound = _ORIENT2D_BOUND * (np.abs(rx*sy) + np.abs(ry*sx))
+    zero = np.zeros(len(den), dtype=bool)
+    for k in np.flatnonzero(np.abs(den) <= bound).tolist():
+        zero[k] = cross2d((0.0, 0.0), (float(rx[k]), float(ry[k])),
+                          (0.0, 0.0), (float(sx[k]), float(sy[k]))) == 0
+    return zero
+
+
+def _in_span_exact(t, kind):
+    """_in_span for one exact parameter t"""
+    return kind == LINE or (t >= 0 and (kind != SEGMENT or t <= 1))
+
+
+def _intersect_pairs(ca, ka, cb, kb):
+    """Intersect row k of (ca, ka) with row k of (cb, kb), for every k."""
+    x1, y1, x2, y2 = ca.T
+    x3, y3, x4, y4 = cb.T
+    rx, ry = x2 - x1, y2 - y1
+    sx, sy = x4 - x3, y4 - y3
+    n = len(ca)
+    kind = np.full(n, -1, dtype=np.int8)
+    out = np.full((n, 4), np.nan)
+
+    # the same tests as Point2D.is_collinear(p2, q1, q2) called on p1
+    collinear = _orient_zero(x1, y1, x2, y2, x3, y3)
+    collinear[collinear] = _orient_zero(*(v[collinear] for v in (x1, y1, x2, y2, x4, y4)))
+    den = rx*sy - ry*sx
+
+    # -- crossing lines, same formula as LinearEntity.intersection
+    cross = ~collinear
+    cross[cross] = ~_cross_zero(rx[cross], ry[cross], sx[cross], sy[cross], den[cross])
+    if cross.any():
+        rows = np.flatnonzero(cross)
+        a2, b2, c2 = _coefficients(x1[rows], y1[rows], x2[rows], y2[rows])
+        a1, b1, c1 = _coefficients(x3[rows], y3[rows], x4[rows], y4[rows])
+        d = a1*b2 - a2*b1
+        dc = den[rows]
+        # nearly parallel: d or den rounds to zero though the lines cross, so
+        # these rows are solved exactly, as the scalar intersection does
+        near = (d == 0) | (dc == 0)
+        for k in rows[near].tolist():
+            p1, p2 = (float(x1[k]), float(y1[k])), (float(x2[k]), float(y2[k]))
+            t, u = _exact_crossing(p1, p2, (float(x3[k]), float(y3[k])), (float(x4[k]), float(y4[k])))
+            if _in_span_exact(t, ka[k]) and _in_span_exact(u, kb[k]):
+                kind[k] = POINT
+                out[k, :2] = _crossing_point(p1, p2, t)
+        with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+            px = (b1*c2 - b2*c1)/d
+            py = (a2*c1 - a1*c2)/d
+        qpx, qpy = x3[rows] - x1[rows], y3[rows] - y1[rows]
+        t_num = qpx*sy[rows] - qpy*sx[rows]
+        u_num = qpx*ry[rows] - qpy*rx[rows]
+        hit = ~near & _in_span(t_num, dc, ka[rows]) & _in_span(u_num, dc, kb[rows])
+        idx = rows[hit]
+        kind[idx] = POINT
+        out[idx, 0] = px[hit]
+        out[idx, 1] = py[hit]
+
+    # -- collinear entities: intersect their parameter intervals along self
+    if collinear.any():
+        idx = np.flatnonzero(collinear)
+        ka_c, kb_c = ka[idx], kb[idx]
+        p = ca[idx, :2]
+        r = ca[idx, 2:] - p
+        rr = np.einsum('ij,ij->i', r, r)
+        q1, q2 = cb[idx, :2], cb[idx, 2:]
+        t1 = np.einsum('ij,ij->i', q1 - p, r) / rr
+        t2 = np.einsum('ij,ij->i', q2 - p, r) / rr
+        inf = np.inf
+
+        # interval of self, [0, 1] / [0, inf) / (-inf, inf)
+        a_lo = np.where(ka_c == LINE, -inf, 0.0)
+        a_hi = np.where(ka_c == SEGMENT, 1.0, inf)
+        a_lo_pt, a_hi_pt = p, ca[idx, 2:]
+        # interval of other, with the endpoint that bounds it on each side
+        forward = t2 >= t1
+        b_lo = np.where(forward, t1, t2)
+        b_hi = np.where(forward, t2, t1)
+        b_lo_pt = np.where(forward[:, None], q1, q2)
+        b_hi_pt = np.where(forward[:, None], q2, q1)
+        ray_b = kb_c == RAY
+        b_lo = np.where(kb_c == LINE, -inf, np.where(ray_b & ~forward, -inf, b_lo))
+        b_hi = np.where(kb_c == LINE, inf, np.where(ray_b & forward, inf, b_hi))
+
+        use_a_lo = a_lo >= b_lo
+        lo = np.where(use_a_lo, a_lo, b_lo)
+        lo_pt = np.where(use_a_lo[:, None], a_lo_pt, b_lo_pt)
+        use_a_hi = a_hi <= b_hi
+        hi = np.where(use_a_hi, a_hi, b_hi)
+        hi_pt = np.where(use_a_hi[:, None], a_hi_pt, b_hi_pt)
+
+        ok = lo <= hi
+        lo_fin, hi_fin = np.isfinite(lo), np.isfinite(hi)
+        point = ok & lo_fin & hi_fin & (lo == hi)
+        seg = ok & lo_fin & hi_fin & (lo < hi)
+        ray_fwd = ok & lo_fin & ~hi_fin
+        ray_back = ok & ~lo_fin & hi_fin
+        line = ok & ~lo_fin & ~hi_fin
+
+        res = np.full((len(idx), 4), np.nan)
+        ck = np.full(len(idx), -1, dtype=np.int8)
+        ck[point] = POINT
+        res[point, :2] = lo_pt[point]
+        ck[seg] = OVERLAP_SEGMENT
+        res[seg] = np.hstack((lo_pt[seg], hi_pt[seg]))
+        ck[ray_fwd] = OVERLAP_RAY
+        res[ray_fwd] = np.hstack((lo_pt[ray_fwd], lo_pt[ray_fwd] + r[ray_fwd]))
+        ck[ray_back] = OVERLAP_RAY
+        res[ray_back] = np.hstack((hi_pt[ray_back], hi_pt[ray_back] - r[ray_back]))
+        ck[line] = OVERLAP_LINE
+        res[line] = ca[idx][line]
+        kind[idx] = ck
+        out[idx] = res
+
+    return kind, out
+
+
+def _candidates(ba, bb, start, stop, self_mode):
+    """Pairs (i, j), i in [start, stop), whose bounding boxes touch."""
+    axmin, aymin, axmax, aymax = (b[start:stop, None] for b in ba)
+    bxmin, bymin, bxmax, bymax = (b[None, :] for b in bb)
+    touch = (axmin <= bxmax) & (bxmin <= axmax) & (aymin <= bymax) & (bymin <= aymax)
+    if self_mode:
+        # only i < j
+        touch &= np.arange(start, stop)[:, None] < np.arange(touch.shape[1])[None, :]
+    i, j = np.nonzero(touch)
+    return i + start, j
+
+
+def batch_intersection(a, b=None, kind_a=SEGMENT, kind_b=SEGMENT):
+    """Find every intersecting pair between two sets of linear entities.
+
+    :param a: Polygon, sequence of Line2D/Ray2D/Segment2D, or (N, 4) array
+    :param b: the same, or None to intersect ``a`` with itself (pairs i < j)
+    :param kind_a, kind_b: LINE, RAY or SEGMENT for rows given as arrays
+    :return: BatchIntersection
+    """
+    ca, ka = linear_array(a, kind_a)
+    self_mode = b is None
+    if self_mode:
+        cb, kb = ca, ka
+    else:
+        cb, kb = linear_array(b, kind_b)
+
+    if not len(ca) or not len(cb):
+        return BatchIntersection(*_empty())
+
+    ba, bb = _bounds(ca, ka), _bounds(cb, kb)
+    rows = max(1, CHUNK_PAIRS // len(cb))
+    parts = []
+    for start in range(0, len(ca), rows):
+        i, j = _candidates(ba, bb, start, min(start + rows, len(ca)), self_mode)
+        if not len(i):
+            continue
+        kind, out = _intersect_pairs(ca[i], ka[i], cb[j], kb[j])
+        hit = kind >= 0
+        parts.append((i[hit], j[hit], kind[hit], out[hit]))
+
+    if not parts:
+        return BatchIntersection(*_empty())
+    return BatchIntersection(*(np.concatenate(col) for col in zip(*parts)))
@@ -1,8 +1,27 @@
 import math
+from fractions import Fraction
 
 from .settings import pi, PI_HALF, nearly_eq
 from .point import Point
-from .basic import GeometryEntity
+from .basic import GeometryEntity, cached_property
+from .predicates import orient2d, cross2d, parallel3d
+from .tolerance import resolve
+
+
+def _exact_crossing(a1, a2, b1, b2):
+    """Return ``(t, u)``, exact Fractions, where the line through the 2D points
+    a1, a2 crosses the line through b1, b2: at a1 + t (a2 - a1) = b1 + u (b2 - b1).
+    The lines must not be parallel."""
+    x1, y1, x2, y2, x3, y3, x4, y4 = [Fraction(v) for v in tuple(a1) + tuple(a2) + tuple(b1) + tuple(b2)]
+    rx, ry, sx, sy = x2 - x1, y2 - y1, x4 - x3, y4 - y3
+    qx, qy = x3 - x1, y3 - y1
+    den = rx*sy - ry*sx
+    return (qx*sy - qy*sx) / den, (qx*ry - qy*rx) / den
+
+
+def _crossing_point(a1, a2, t):
+    """The point a1 + t (a2 - a1) for an exact t, rounded once"""
+    return tuple(float(p + t*(q - p)) for p, q in zip(map(Fraction, a1), map(Fraction, a2)))
 
 
 class LinearEntity(GeometryEntity):
@@ -50,6 +69,15 @@ class LinearEntity(GeometryEntity):
     def contains(self, other):
         raise NotImplementedError()
 
+    def _near(self, p, tol, lo, hi):
+        """Whether the point p is within tolerance of the point of self nearest
+        to it, for self parametrized as p1 + t * direction with lo <= t <= hi"""
+        p1, d = self.p1._args, self.direction._args
+        dd = sum(c*c for c in d)
+        t = sum((a - b)*c for a, b, c in zip(p._args, p1, d)) / dd
+        t = min(max(t, lo), hi)
+        return tol.points_eq([a + t*c for a, c in zip(p1, d)], p._args)
+
     def _span_test(self, other):
         """Test whether the point `other` lies in the positive span of `self`."""
         if self.p1 == other:
@@ -95,14 +123,28 @@ class LinearEntity(GeometryEntity):
         if not isinstance(self, LinearEntity) and not isinstance(line, LinearEntity):
             raise TypeError('Must pass only LinearEntity objects')
 
-        a = self.direction
-        b = line.direction
-
-        if isinstance(line, LinearEntity2D):
-            return a.cross(b) == 0
-
-        # 三维直线判断平行
-        raise NotImplementedError()
+        # exact sign of the cross product of the directions, computed from
+        # the defining points rather than the rounded directions
+        a1, a2 = self.p1._args, self.p2._args
+        b1, b2 = line.p1._args, line.p2._args
+        if len(a1) == 2:
+            return cross2d(a1, a2, b1, b2) == 0
+        return parallel3d(a1, a2, b1, b2)
+
+    def _meets_line(self, a, b):
+        """Whether self meets the line through the points a and b, which must
+        not be parallel to self. Exact, see predicates."""
+        if isinstance(self, Line):
+            return True
+        a, b = a._args, b._args
+        p1, p2 = self.p1._args, self.p2._args
+        o1 = orient2d(a, b, p1)
+        if isinstance(self, Segment):
+            o2 = orient2d(a, b, p2)
+            return o1 <= 0 <= o2 or o2 <= 0 <= o1
+        # a ray starting at p1 heads towards the line if moving to p2
+        # changes the orientation towards the other sign
+        return o1 == 0 or (o1 > 0) != (cross2d(a, b, p1, p2) > 0)
 
     def is_perpendicular(self, line):
         """
@@ -132,7 +174,7 @@ class LinearEntity(GeometryEntity):
         """
         return line in self
 
-    @property
+    @cached_property
     def direction(self):
         """Return the direction of line"""
         return self.p2 - self.p1
@@ -145,7 +187,7 @@ class LinearEntity(GeometryEntity):
         """
         d = self.direction
         # to get the left hand direction: return Point(-d.y, d.x)
-        return Point(d.y, -d.x)
+        return Point._trusted(d.y, -d.x)
 
     @property
     def p1(self):
@@ -236,7 +278,7 @@ class LinearEntity(GeometryEntity):
 
         def intersect_parallel_rays(ray1, ray2):
             if ray1.direction.dot(ray2.direction) > 0:
-                return [ray2] if ray1._span_test(ray2.p1) else [ray1]
+                return [ray2] if ray1._span_test(ray2.p1) >= 0 else [ray1]
 
             st = ray1._span_test(ray2.p1)
             if st > 0:
@@ -255,6 +297,8 @@ class LinearEntity(GeometryEntity):
                 return [Segment(ray.p1, seg.p1)]
             elif st1 <= 0 and st2 > 0:
                 return [Segment(ray.p1, seg.p2)]
+            # only an endpoint of seg touches the source of ray
+            return [ray.p1]
 
         if not isinstance(other, GeometryEntity):
             other = Point._convert(other)
@@ -279,54 +323,30 @@ class LinearEntity(GeometryEntity):
                 if isinstance(self, Segment) and isinstance(other, Ray):
                     return intersect_parallel_segment_and_ray(self, other)
                 if isinstance(self, Ray) and isinstance(other, Segment):
-                    return intersect_parallel_rays(other, self)
+                    return intersect_parallel_segment_and_ray(other, self)
             if self.is_parallel(other):
                 return []
             else:
-                l1 = Line(self.p1, self.p2)
-                l2 = Line(other.p1, other.p2)
+                # lines keep their coefficients cached; rays and segments
+                # need the line through them
+                l1 = self if isinstance(self, Line2D) else Line(self.p1, self.p2)
+                l2 = other if isinstance(other, Line2D) else Line(other.p1, other.p2)
                 if isinstance(l1, LinearEntity2D) and isinstance(l2, LinearEntity2D):
 
+                    # the crossing point is rounded, so testing it with `in`
+                    # would be unreliable; decide from the defining points instead
+                    if not (self._meets_line(other.p1, other.p2) and other._meets_line(self.p1, self.p2)):
+                        return []
+
                     a1, b1, c1 = l2.coefficients
                     a2, b2, c2 = l1.coefficients
                     d = a1*b2 - a2*b1
-
-                    p_inter = Point((b1*c2 - b2*c1)/d, (a2*c1 - a1*c2)/d)
-
-                    if isinstance(self, Line2D) and isinstance(other, Line2D):
-                        return [p_inter]
-                    elif isinstance(self, Line2D) and isinstance(other, Ray2D):
-                        if other._span_test(p_inter) >= 0:
-                            return [p_inter]
-                        return []
-                    elif isinstance(self, Line2D) and isinstance(other, Segment2D):
-                        if p_inter in other:
-                            return [p_inter]
-                        return []
-                    elif isinstance(self, Segment2D) and isinstance(other, Segment2D):
-                        if p_inter in self and p_inter in other:
-                            return [p_inter]
-                        return []
-                    elif isinstance(self, Segment2D) and isinstance(other, Ray2D):
-                        if p_inter in self and other._span_test(p_inter) >=0:
-                            return [p_inter]
-                        return []
-                    elif isinstance(self, Segment2D) and isinstance(other, Line2D):
-                        if p_inter in self:
-                            return [p_inter]
-                        return []
-                    elif isinstance(self, Ray2D) and isinstance(other, Segment2D):
-                        if p_inter in other and self._span_test(p_inter) >= 0:
-                            return [p_inter]
-                        return []
-                    elif isinstance(self, Ray2D) and isinstance(other, Ray2D):
-                        if other._span_test(p_inter) >= 0 and self._span_test(p_inter) >= 0:
-                            return [p_inter]
-                        return []
-                    elif isinstance(self, Ray2D) and isinstance(other, Line2D):
-                        if self._span_test(p_inter) >=0:
-                            return [p_inter]
-                        return []
+                    if not d:
+                        # nearly parallel: d rounds to zero though the lines cross
+                        a1, a2 = self.p1._args, self.p2._args
+                        t, _ = _exact_crossing(a1, a2, other.p1._args, other.p2._args)
+                        return [Point._trusted(*_crossing_point(a1, a2, t))]
+                    return [Point._trusted((b1*c2 - b2*c1)/d, (a2*c1 - a1*c2)/d)]
 
                 return []
                 #三维有待补充
@@ -352,9 +372,18 @@ class Line(LinearEntity):
             return Line3D(p1, p2, **kwargs)
         return LinearEntity.__new__(cls, p1, p2, **kwargs)
 
-    def contains(self, item):
+    def contains(self, item, tol=None):
+        """Return whether the point or line item lies on self, within the
+        tolerance ``tol`` or the one in effect (see geometry.tolerance)"""
         if not isinstance(item, GeometryEntity):
             item = Point._convert(item)
+        tol = resolve(tol)
+        if not tol.exact:
+            if isinstance(item, Point):
+                return self._near(item, tol, -math.inf, math.inf)
+            if isinstance(item, Line):
+                return self._near(item.p1, tol, -math.inf, math.inf) and self._near(item.p2, tol, -math.inf, math.inf)
+            return False
         if isinstance(item, Point):
             return self.p1.is_collinear(item, self.p2)
         if isinstance(item, Line):
@@ -450,7 +479,7 @@ class Line2D(LinearEntity2D, Line):
 
         return LinearEntity.__new__(cls, p1, p2, **kwargs)
 
-    @property
+    @cached_property
     def coefficients(self):
         """The coefficients (`a`, `b`, `c`) for a standard linear equation `ax + by + c = 0`."""
         p1, p2 = self.args
@@ -503,17 +532,27 @@ class Segment(LinearEntity):
     def vertices(self):
         return list(self.args)
 
-    def contains(self, item):
+    def contains(self, item, tol=None):
+        """Return whether the point or segment item lies on self, within the
+        tolerance ``tol`` or the one in effect (see geometry.tolerance)"""
         if not isinstance(item, GeometryEntity):
             item = Point._convert(item)
+        tol = resolve(tol)
+        if not tol.exact:
+            if isinstance(item, Point):
+                return self._near(item, tol, 0, 1)
+            if isinstance(item, Segment):
+                return self._near(item.p1, tol, 0, 1) and self._near(item.p2, tol, 0, 1)
+            return False
         if isinstance(item, Point):
             if self.p1.is_collinear(item, self.p2):
-                d = self.direction
+                # item is between the endpoints when they lie on opposite sides of it.
+                # Comparing |d| with |d1| + |d2| fails on rounding of the square roots.
                 d1, d2 = self.p1 - item, self.p2 - item
-                return (abs(d) - abs(d1) - abs(d2)) == 0
+                return d1.dot(d2) <= 0
 
         if isinstance(item, Segment):
-            return item.p1 in self and item.p2 in self
+            return self.contains(item.p1, tol) and self.contains(item.p2, tol)
 
         return False
 
@@ -596,9 +635,21 @@ class Ray(LinearEntity):
             return False
         return self.source == other.source and other.p2 in self
 
-    def contains(self, other):
+    def contains(self, other, tol=None):
+        """Return whether the point, ray or segment other lies on self, within
+        the tolerance ``tol`` or the one in effect (see geometry.tolerance)"""
         if not isinstance(other, GeometryEntity):
             other = Point._convert(other)
+        tol = resolve(tol)
+        if not tol.exact:
+            if isinstance(other, Point):
+                return self._near(other, tol, 0, math.inf)
+            if isinstance(other, Ray):
+                return (self._near(other.p1, tol, 0, math.inf) and self._near(other.p2, tol, 0, math.inf)
+                        and self.direction.dot(other.direction) > 0)
+            if isinstance(other, Segment):
+                return self._near(other.p1, tol, 0, math.inf) and self._near(other.p2, tol, 0, math.inf)
+            return False
         if isinstance(other, Point):
             if self.p1.is_collinear(self.p2, other):
                 return self.direction.dot(other - self.p1) >= 0
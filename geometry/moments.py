@@ -0,0 +1,80 @@
+"""
+Area, centroid and second moments of area of many polygons at once.
+
+``moments`` takes the polygons as packed arrays, ``(coords, offsets)`` as in
+geometry.wkb, or as a sequence of Polygons, and computes every quantity with
+one segmented sum per term over all the sides, the batched counterpart of
+``Polygon.area``, ``Polygon.centroid`` and ``Polygon.second_moment_of_area``.
+Each ring is summed relative to its first vertex, as the scalar version does.
+
+This module needs numpy.
+"""
+import numpy as np
+
+from .wkb import _pack_arrays, polygons_to_arrays
+
+
+def _arrays(polygons):
+    if isinstance(polygons, tuple) and len(polygons) == 2 and isinstance(polygons[0], np.ndarray):
+        return _pack_arrays(*polygons)
+    return polygons_to_arrays(polygons)
+
+
+def _segments(offsets):
+    """Return (ring, nxt): the ring of every vertex and the index of the vertex
+    after it in its ring"""
+    counts = np.diff(offsets)
+    if (counts < 3).any():
+        raise ValueError("every polygon needs at least 3 vertices")
+    ring = np.repeat(np.arange(len(counts)), counts)
+    nxt = np.arange(1, offsets[-1] + 1)
+    nxt[offsets[1:] - 1] = offsets[:-1]
+    return ring, nxt
+
+
+def _sides(coords, offsets, ring, nxt):
+    """Return x1, y1, x2, y2: the sides of every ring, relative to the first
+    vertex of the ring, as Polygon.area and Polygon._moments sum them"""
+    xy = coords - coords[offsets[:-1]][ring]
+    x1, y1 = xy[:, 0], xy[:, 1]
+    return x1, y1, x1[nxt], y1[nxt]
+
+
+def moments(polygons, point=None):
+    """Return ``(area, cx, cy, ixx, iyy, ixy)``, six arrays with one value per
+    polygon; the moments are about the centroid, or about ``point``.
+
+    Areas and moments are signed like ``Polygon.area``; polygons with no area
+    get a nan centroid and nan moments.
+
+    :param polygons: ``(coords, offsets)`` arrays or a sequence of 2D Polygons
+    :param point: (x, y) to take the moments about, the same for every polygon
+    """
+    coords, offsets = _arrays(polygons)
+    if coords.shape[1] != 2:
+        raise ValueError("moments of area need 2D polygons")
+    starts = offsets[:-1]
+    if not len(starts):
+        empty = np.empty(0)
+        return empty, empty, empty, empty, empty, empty
+    x1, y1, x2, y2 = _sides(coords, offsets, *_segments(offsets))
+    c = x1*y2 - x2*y1
+
+    def total(v):
+        return np.add.reduceat(v, starts)
+
+    a = total(c) / 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cx = total((x1 + x2)*c) / (6*a)
+        cy = total((y1 + y2)*c) / (6*a)
+    ixx = total((y1*y1 + y1*y2 + y2*y2)*c)/12 - a*cy*cy
+    iyy = total((x1*x1 + x1*x2 + x2*x2)*c)/12 - a*cx*cx
+    ixy = total((x1*y2 + 2*x1*y1 + 2*x2*y2 + x2*y1)*c)/24 - a*cx*cy
+    cx += coords[starts, 0]
+    cy += coords[starts, 1]
+    if point is not None:
+        dx, dy = point[0] - cx, point[1] - cy
+        ixx += a*dy*dy
+        iyy += a*dx*dx
+        ixy += a*dx*dy
+    return a, cx, cy, ixx, iyy, ixy
@@ -0,0 +1,173 @@
+"""
+Bulk polygon operations on a process pool.
+
+``batch_map`` runs one operation over many polygons (or pairs of polygons for
+``intersection``) with ``concurrent.futures.ProcessPoolExecutor``. The input is
+cut into chunks, and each chunk travels to a worker as one flat ``array('d')``
+of coordinates plus an ``array('l')`` of vertex counts instead of a pickled
+graph of Polygon and Point objects. Results come back as plain numbers and
+tuples and are turned into Points and Segments again in the calling process.
+They are yielded in input order while later chunks are still running.
+"""
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import os
+
+from .point import Point
+from .line import Segment
+from .polygon import Polygon
+
+
+def _area(pg):
+    return pg.area
+
+
+def _perimeter(pg):
+    return pg.perimeter
+
+
+def _centroid(pg):
+    return pg.centroid.args
+
+
+def _is_convex(pg):
+    return pg.is_convex()
+
+
+def _is_simple(pg):
+    return pg.is_simple()
+
+
+def _bounds(pg):
+    return pg.bounds
+
+
+def _intersection(a, b):
+    # points as coordinate tuples, segments as pairs of them
+    return [e.args if isinstance(e, Point) else (e.p1.args, e.p2.args) for e in a.intersection(b)]
+
+
+# name: (function run in the worker, number of polygons it takes)
+OPERATIONS = {
+    'area': (_area, 1),
+    'perimeter': (_perimeter, 1),
+    'centroid': (_centroid, 1),
+    'is_convex': (_is_convex, 1),
+    'is_simple': (_is_simple, 1),
+    'bounds': (_bounds, 1),
+    'intersection': (_intersection, 2),
+}
+
+
+def encode(polygons):
+    """Pack polygons into ``(dim, coords, counts)``: the flat coordinates of all
+    vertices and the number of vertices of each polygon. The polygons must be
+    all 2D or all 3D."""
+    coords = array('d')
+    counts = array('l')
+    dim = None
+    for pg in polygons:
+        args = pg.args
+        if dim is None:
+            dim = len(args[0])
+        elif len(args[0]) != dim:
+            raise ValueError("can't mix 2D and 3D polygons")
+        for p in args:
+            coords.extend(p.args)
+        counts.append(len(args))
+    return dim or 2, coords, counts
+
+
+def decode(dim, coords, counts):
+    """Rebuild the polygons packed by ``encode``"""
+    polygons = []
+    k = 0
+    for n in counts:
+        flat = coords[k:k + n * dim]
+        pts = [Point._trusted(*flat[i:i + dim]) for i in range(0, len(flat), dim)]
+        # the vertices were normalized when the polygon was first built
+        polygons.append(Polygon(*pts, validate=False))
+        k += n * dim
+    return polygons
+
+
+def _run_chunk(operation, packed):
+    func, arity = OPERATIONS[operation]
+    polygons = decode(*packed)
+    if arity == 1:
+        return [func(pg) for pg in polygons]
+    return [func(polygons[i], polygons[i + 1]) for i in range(0, len(polygons), 2)]
+
+
+def _unpack(operation, result):
+    if operation == 'centroid':
+        return Point._trusted(*result)
+    if operation == 'intersection':
+        return [Segment(Point._trusted(*e[0]), Point._trusted(*e[1])) if isinstance(e[0], tuple)
+                else Point._trusted(*e) for e in result]
+    return result
+
+
+def _chunks(operation, items, chunksize):
+    arity = OPERATIONS[operation][1]
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, chunksize))
+        if not chunk:
+            return
+        if arity == 2:
+            chunk = [pg for pair in chunk for pg in pair]
+        yield encode(chunk)
+
+
+def batch_map(operation, items, workers=None, chunksize=1000, executor=None):
+    """Yield ``operation`` applied to every item, in order.
+
+    :param operation: one of the names in ``OPERATIONS``: 'area', 'perimeter',
+        'centroid', 'is_convex', 'is_simple', 'bounds' or 'intersection'
+    :param items: iterable of Polygons, or of (Polygon, Polygon) pairs for
+        'intersection'. It is consumed lazily, chunk by chunk.
+    :param workers: number of processes, by default ``os.cpu_count()``.
+        0 runs everything in this process, still through the wire format.
+    :param chunksize: items per task sent to a worker
+    :param executor: an Executor to use instead of starting a process pool
+    """
+    if operation not in OPERATIONS:
+        raise ValueError("unknown operation %r, expected one of %s" % (operation, ', '.join(sorted(OPERATIONS))))
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    chunks = _chunks(operation, items, chunksize)
+
+    if executor is None and workers == 0:
+        for packed in chunks:
+            for result in _run_chunk(operation, packed):
+                yield _unpack(operation, result)
+        return
+
+    own = executor is None
+    if own:
+        executor = ProcessPoolExecutor(workers or os.cpu_count())
+    try:
+        # keep a couple of chunks per worker queued, so memory stays bounded
+        # however long the input is
+        limit = 2 * (getattr(executor, '_max_workers', None) or os.cpu_count() or 1)
+        pending = deque()
+        for packed in chunks:
+            pending.append(executor.submit(_run_chunk, operation, packed))
+            if len(pending) >= limit:
+                for result in pending.popleft().result():
+                    yield _unpack(operation, result)
+        while pending:
+            for result in pending.popleft().result():
+                yield _unpack(operation, result)
+    finally:
+        if own and _CAN_CANCEL:
+            executor.shutdown(cancel_futures=True)
+        elif own:
+            executor.shutdown()
+
+
+# Executor.shutdown got cancel_futures in Python 3.9
+_CAN_CANCEL = 'cancel_futures' in ProcessPoolExecutor.shutdown.__code__.co_varnames
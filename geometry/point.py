@@ -4,11 +4,15 @@ from functools import reduce
 from .basic import GeometryEntity
 from .exception import filldedent
 from .settings import pi
+from .predicates import orient2d, collinear3d
+from .tolerance import resolve
 
 
 class Point(GeometryEntity):
     """A 2D or 3D point. A n-dimensional point in the future
     """
+    __slots__ = ()
+
     def __new__(cls, *args, **kwargs):
         coords = args[0] if len(args) == 1 else args
         if isinstance(coords, Point):
@@ -24,30 +28,42 @@ class Point(GeometryEntity):
         elif len(coords) == 3:
             return Point3D(*coords, **kwargs)
 
+    @staticmethod
+    def _trusted(*coords):
+        """Build a Point2D/Point3D straight from 2 or 3 coordinates.
+
+        It skips the conversions and checks of ``Point.__new__``, so only use it
+        for coordinates computed inside the package.
+        """
+        if len(coords) == 2:
+            obj = object.__new__(Point2D)
+            obj._x, obj._y = coords
+        else:
+            obj = object.__new__(Point3D)
+            obj._x, obj._y, obj._z = coords
+        obj._args = coords
+        obj._mhash = None
+        return obj
+
     def __len__(self):
         return len(self.args)
 
     def __abs__(self):
-        """Return the distance between self point and origin(0, 0)"""
-        origin = Point(0, 0)
-        return self.distance(origin)
+        """Return the distance between self point and origin"""
+        return math.sqrt(sum(x*x for x in self._args))
 
     def __add__(self, other):
         """Add two points' coordinates"""
-        p1 = Point._convert(self)
         p2 = Point._convert(other)
-        coords = [(a + b) for a, b in zip(p1, p2)]
-        return Point(coords)
+        return Point._trusted(*[(a + b) for a, b in zip(self._args, p2)])
 
     def __sub__(self, other):
         """subtract two points' coordinates"""
-        coords = [(a - b) for a, b in zip(self, other)]
-        return Point(coords)
+        return Point._trusted(*[(a - b) for a, b in zip(self._args, other)])
 
     def __mul__(self, factor):
         """Multiply point's coordinates by a factor."""
-        coords = [(x*factor) for x in self.args]
-        return Point(coords)
+        return Point._trusted(*[(x*factor) for x in self._args])
 
     def __contains__(self, item):
         return item in self.args
@@ -59,8 +75,7 @@ class Point(GeometryEntity):
 
     def __neg__(self):
         """Negate the point."""
-        ps = [-x for x in self.args]
-        return Point(ps)
+        return Point._trusted(*[-x for x in self._args])
 
     def __iter__(self):
         return self.args.__iter__()
@@ -69,7 +84,11 @@ class Point(GeometryEntity):
         return self.args[item]
 
     def __hash__(self):
-        return hash(self.args)
+        """The hash is computed once and kept in _mhash"""
+        h = self._mhash
+        if h is None:
+            h = self._mhash = hash(self._args)
+        return h
 
     @classmethod
     def _convert(cls, p):
@@ -90,11 +109,15 @@ class Point(GeometryEntity):
         """Return dot product of self with p"""
         return reduce(lambda x, y: x + y, ((a * b) for a, b in zip(self, p)))
 
-    def equals(self, p):
-        """Return whether self and p are the same point"""
+    def equals(self, p, tol=None):
+        """Return whether self and p are the same point, within the tolerance
+        ``tol`` or the one in effect (see geometry.tolerance)"""
         if not isinstance(p, Point) or len(self) != len(p):
             return False
-        return all(a == b for a,b in zip(self, p))
+        tol = resolve(tol)
+        if tol.exact:
+            return self._args == p._args
+        return tol.points_eq(self._args, p._args)
 
     @property
     def is_zero(self):
@@ -109,23 +132,22 @@ class Point(GeometryEntity):
 
     @property
     def origin(self):
-        return Point([0]*len(self))
+        return Point._trusted(*[0]*len(self))
 
     def midpoint(self, p):
         """Return midpoint between self and p"""
-        p1 = Point._convert(self)
         p2 = Point._convert(p)
-        return Point([(a + b)/2 for a, b in zip(p1, p2)])
+        return Point._trusted(*[(a + b)/2 for a, b in zip(self._args, p2)])
 
     @property
     def orthogonal_direction(self):
         """Returns a non-zero point orthogonal to the line containing `self` and the origin."""
         dim = len(self)
         if self[0] == 0:
-            return Point([1] + (dim - 1)*[0])
+            return Point._trusted(*([1] + (dim - 1)*[0]))
         if self[1] == 0:
-            return Point([0, 1] + (dim - 2)*[0])
-        return Point([-self[1], self[0]] + (dim - 2)*[0])
+            return Point._trusted(*([0, 1] + (dim - 2)*[0]))
+        return Point._trusted(*([-self[1], self[0]] + (dim - 2)*[0]))
 
     def taxicab_distance(self, p):
         """Return the Taxicab Distance from self to point p."""
@@ -142,7 +164,8 @@ class Point(GeometryEntity):
 
     def unit(self):
         """Return the normalized line of the line between self and origin(0, 0)"""
-        return Point(x / abs(self) for x in self.args)
+        length = abs(self)
+        return Point._trusted(*[x / length for x in self._args])
 
     @classmethod
     def are_coplanar(cls, *points):
@@ -157,13 +180,53 @@ class Point(GeometryEntity):
 
 
 class Point2D(Point):
+    """Coordinates are stored in slots as well as in args, and there is no
+    __dict__. ``x``/``y`` are read-only: points are hashed and interned by
+    their coordinates, so they must not change."""
+    __slots__ = ('_x', '_y')
 
     def __new__(cls, *args, **kwargs):
-        return GeometryEntity.__new__(cls, *args)
+        obj = GeometryEntity.__new__(cls, *args)
+        obj._x, obj._y = obj._args
+        return obj
+
+    @property
+    def x(self):
+        return self._x
+
+    @property
+    def y(self):
+        return self._y
+
+    # The arithmetic below repeats the generic Point versions without the
+    # zip() and list, since 2D arithmetic is the inner loop of every predicate.
+    def __add__(self, other):
+        if not isinstance(other, Point):
+            other = Point(other)
+        return Point._trusted(self._x + other._x, self._y + other._y)
+
+    def __sub__(self, other):
+        if not isinstance(other, Point):
+            other = Point(other)
+        return Point._trusted(self._x - other._x, self._y - other._y)
+
+    def __mul__(self, factor):
+        return Point._trusted(self._x*factor, self._y*factor)
+
+    def __neg__(self):
+        return Point._trusted(-self._x, -self._y)
+
+    def __abs__(self):
+        return math.sqrt(self._x*self._x + self._y*self._y)
+
+    def midpoint(self, p):
+        if not isinstance(p, Point):
+            p = Point(p)
+        return Point._trusted((self._x + p._x)/2, (self._y + p._y)/2)
 
     def cross(self, point):
         """Return cross product of self with another Point"""
-        return self.x*point.y - self.y*point.x
+        return self._x*point._y - self._y*point._x
 
     def rotate(self, angle, pt=(0, 0)):
         """Rotate a point counterclockwise about Point ``pt``
@@ -176,82 +239,63 @@ class Point2D(Point):
         s, c = math.sin(angle), math.cos(angle)
         rotated_pt = self - pt
         x, y = rotated_pt.args
-        rotated_pt = Point(round(x * c - y * s, 6), round(x * s + y * c, 6))
+        rotated_pt = Point._trusted(round(x * c - y * s, 6), round(x * s + y * c, 6))
         return rotated_pt
 
     def translate(self, x=0, y=0):
-        return Point(self.x + x, self.y + y)
+        return Point._trusted(self._x + x, self._y + y)
 
     @property
     def bounds(self):
-        return (self.x, self.y, self.x, self.y)
+        return (self._x, self._y, self._x, self._y)
 
     def is_collinear(self, *args):
+        """Return whether self and the points args lie on one line.
+        Exact for any float coordinates, see predicates.orient2d."""
         if len(args) == 1:
             return True
-        else:
-            slope_x = self.x - args[0].x
-            slope_y = self.y - args[0].y
-            flag = True
-            for i in args[1:]:
-                # 平行线斜率 叉乘 为零
-                if not slope_x * (self.y - i.y) == slope_y * (self.x - i.x):
-                    flag = False
-                    break
-            return flag
-
-    @property
-    def x(self):
-        return self.args[0]
-
-    @property
-    def y(self):
-        return self.args[1]
+        a, b = self._args, args[0]._args
+        for i in args[1:]:
+            # 平行线斜率 叉乘 为零
+            if orient2d(a, b, i._args) != 0:
+                return False
+        return True
 
     def scale(self, x=1, y=1):
-        return Point(self.x*x, self.y*y)
+        return Point._trusted(self._x*x, self._y*y)
 
 
 class Point3D(Point):
+    """Stored as Point2D, with read-only ``x``/``y``/``z``."""
+    __slots__ = ('_x', '_y', '_z')
+
     def __new__(cls, *args, **kwargs):
-        return GeometryEntity.__new__(cls, *args)
+        obj = GeometryEntity.__new__(cls, *args)
+        obj._x, obj._y, obj._z = obj._args
+        return obj
 
     @property
     def x(self):
-        return self.args[0]
+        return self._x
 
     @property
     def y(self):
-        return self.args[1]
+        return self._y
 
     @property
     def z(self):
-        return self.args[2]
+        return self._z
 
     def scale(self, x=1, y=1, z=1):
-        return Point(self.x*x, self.y*y, self.z*z)
+        return Point._trusted(self._x*x, self._y*y, self._z*z)
 
     def is_collinear(self, *args):
-        # 判断点是否为同一维度，不必要，可以不用
-        # for p in args:
-        #     if not len(self.args) == len(p.args):
-        #         raise ValueError("points are not same dimentional")
+        """Return whether self and the points args lie on one line.
+        Exact for any float coordinates, see predicates.collinear3d."""
         if len(args) == 1:
             return True
-        else:
-            slope_x = self.x - args[0].x
-            slope_y = self.y - args[0].y
-            slope_z = self.z - args[0].z
-            flag = True
-            for i in args[1:]:
-                # 平行线斜率 叉乘 为零
-                if not slope_x * (self.y - i.y) == slope_y * (self.x - i.x):
-                    flag = False
-                    break
-                elif not slope_x * (self.z - i.z) == slope_z * (self.x - i.x):
-                    flag = False
-                    break
-                elif not slope_y * (self.z - i.z) == slope_z * (self.y - i.y):
-                    flag = False
-                    break
-            return flag
+        a, b = self._args, args[0]._args
+        for i in args[1:]:
+            if not collinear3d(a, b, i._args):
+                return False
+        return True
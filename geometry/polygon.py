@@ -1,64 +1,83 @@
+import copyreg
 import math
-from functools import reduce
 
 from .settings import pi
 from .point import Point
 from .line import Line, Ray, Segment
-from .basic import GeometryEntity
+from .basic import GeometryEntity, cached_property
+from .sweep import sweep_intersections
+from .predicates import orient2d, _ORIENT2D_BOUND
+from .tolerance import EXACT, resolve
+from . import interning
+from .cache import intersection_cache
 
 
 class Polygon(GeometryEntity):
 
-    def __new__(cls, *args, **kwargs):
-        vertices = [Point._convert(a) for a in args]
-
-        # remove same points
-        nsp = []
-        for p in vertices:
-            if nsp and p == nsp[-1]:
-                continue
-            nsp.append(p)
-
-        if len(nsp) > 1 and nsp[0] == nsp[-1]:
-            nsp.pop()
-
-        # remove collinear points
-        i = -3
-        while i < len(nsp) - 3 and len(nsp) > 2:
-            a, b, c = nsp[i], nsp[i + 1], nsp[i + 2]
-            if a.is_collinear(b, c):
-                nsp[i] = a
-                nsp[i + 1] = None
-                nsp.pop(i + 1)
-            i += 1
+    def __new__(cls, *args, validate=True, **kwargs):
+        """
+        :param validate: drop repeated and collinear vertices (the default).
+            Pass False for rings known to be clean, e.g. loaded from storage,
+            to skip that pass; the vertices are then used as given.
 
-        vertices = list(nsp)
+        The vertices come from ``interning.active_pool()`` when one is enabled.
+        """
+        pool = interning.active_pool()
+        if pool is None:
+            vertices = [Point._convert(a) for a in args]
+        else:
+            vertices = [pool.point(a) for a in args]
+        if validate:
+            vertices = _normalize_ring(vertices)
 
         if len(vertices) > 3:
             return GeometryEntity.__new__(cls, *vertices, **kwargs)
         elif len(vertices) == 3:
-            return Triangle(*vertices, **kwargs)
+            return Triangle(*vertices, validate=False, **kwargs)
         elif len(vertices) == 2:
             return Segment(*vertices, **kwargs)
         else:
             return Point(*vertices, **kwargs)
 
+    def __reduce__(self):
+        # the vertices were normalized when self was built
+        return (copyreg.__newobj_ex__, (type(self), self.args, {'validate': False}))
+
     def __hash__(self):
-        return super(Polygon, self).__hash__()
+        """Equal polygons list the same vertices, from another start or the
+        other way round, so the hash is that of the vertex set; computed once"""
+        h = self._mhash
+        if h is None:
+            h = self._mhash = hash(frozenset(self.args))
+        return h
 
     def __eq__(self, other):
+        """Exact, like Point.__eq__, so that equal polygons have equal hashes;
+        use ``equals`` to compare within a tolerance"""
+        return self.equals(other, EXACT)
+
+    def equals(self, other, tol=None):
+        """Return whether other has the same vertices in the same cyclic order,
+        either way round, within the tolerance ``tol`` or the one in effect
+        (see geometry.tolerance)"""
         if not isinstance(other, Polygon) or len(self.args) != len(other.args):
             return False
 
+        tol = resolve(tol)
+        if tol.exact:
+            same = Point.__eq__
+        else:
+            def same(p, q):
+                return tol.points_eq(p._args, q._args)
         args = self.args
         oargs = other.args
         n = len(args)
         o0 = oargs[0]
         for i0 in range(n):
-            if args[i0] == o0:
-                if all(args[(i0 + i) % n] == oargs[i] for i in range(1, n)):
+            if same(args[i0], o0):
+                if all(same(args[(i0 + i) % n], oargs[i]) for i in range(1, n)):
                     return True
-                if all(args[(i0 - i) % n] == oargs[i] for i in range(1, n)):
+                if all(same(args[(i0 - i) % n], oargs[i]) for i in range(1, n)):
                     return True
         return False
 
@@ -73,11 +92,11 @@ class Polygon(GeometryEntity):
         if isinstance(o, Polygon):
             return self == o
         elif isinstance(o, Segment):
-            return any(o in s for s in self.sides)
+            return any(o in s for s in self._sides)
         elif isinstance(o, Point):
             if o in self.vertices:
                 return True
-            for side in self.sides:
+            for side in self._sides:
                 if o in side:
                     return True
 
@@ -86,16 +105,13 @@ class Polygon(GeometryEntity):
     @staticmethod
     def _isright(a, b, c):
         """Return True/False for cw/ccw orientation."""
-        ab = b - a
-        ac = c - a
-        t_cross = ab.cross(ac)
-        return t_cross < 0
+        return orient2d(a._args, b._args, c._args) < 0
 
     @property
     def vertices(self):
         return list(self.args)
 
-    @property
+    @cached_property
     def bounds(self):
         verts = self.args
         xs = [p.x for p in verts]
@@ -130,34 +146,47 @@ class Polygon(GeometryEntity):
                 angle[b] = agn / pi * 180
         return angle
 
-    @property
+    @cached_property
     def perimeter(self):
         """The perimeter of polygon"""
-        p = 0
-        args = self.args
-        for i in range(len(args)):
-            p += args[i - 1].distance(args[i])
-        return p
-
-    @property
+        args = [p.args for p in self.args]
+        if len(args[0]) == 2:
+            x1, y1 = args[-1]
+            p = 0
+            for x2, y2 in args:
+                p += math.hypot(x2 - x1, y2 - y1)
+                x1, y1 = x2, y2
+            return p
+        return sum(math.sqrt(sum((a - b)**2 for a, b in zip(args[i - 1], args[i]))) for i in range(len(args)))
+
+    @cached_property
     def area(self):
-        """The area of polygon"""
-        a = 0
+        """The signed area of polygon, positive when counterclockwise. As in
+        _moments, the shoelace sum runs relative to the first vertex."""
         args = self.args
-        for i in range(len(args)):
-            x1, y1 = args[i-1].args
-            x2, y2 = args[i].args
+        x0, y0 = args[0].args
+        x1, y1 = args[-1].args
+        x1, y1 = x1 - x0, y1 - y0
+        a = 0
+        for p in args:
+            x2, y2 = p.args
+            x2, y2 = x2 - x0, y2 - y0
             a += x1*y2 - x2*y1
+            x1, y1 = x2, y2
         return a/2
 
     @property
     def sides(self):
         """The directed line segments that form the sides of the polygon."""
-        s = []
+        return list(self._sides)
+
+    @cached_property
+    def _sides(self):
         args = self.args
-        for i in range(-len(args), 0):
-            s.append(Segment(args[i], args[i + 1]))
-        return s
+        pool = interning.active_pool()
+        if pool is not None:
+            return tuple(pool.segment(args[i], args[i + 1]) for i in range(-len(args), 0))
+        return tuple(Segment(args[i], args[i + 1]) for i in range(-len(args), 0))
 
     def is_convex(self):
         """Return whether the polygon is convex"""
@@ -166,40 +195,79 @@ class Polygon(GeometryEntity):
         for i in range(1, len(args)):
             if cw_sign ^ self._isright(args[i - 2], args[i - 1], args[i]):
                 return False
-        # sides intersecting check
-        sides = self.sides
-        for i, si in enumerate(sides):
-            pts = si.args
-            # exclude the sides connected to si
-            for j in range(1 if i == len(sides) - 1 else 0, i - 1):
-                sj = sides[j]
-                if sj.p1 not in pts and sj.p2 not in pts:
-                    hit = si.intersection(sj)
-                    if hit:
-                        return False
+        # turning the same way at every vertex still allows a star that winds twice
+        return self.is_simple()
 
+    def _side_meetings(self):
+        """Yield (point, side indexes) for the places where sides meet, other than
+        the vertex shared by two consecutive sides.
+        Side i runs from vertex i - 1 to vertex i.
+        """
+        args = self.args
+        n = len(args)
+        segments = [(args[i - 1].args, args[i].args) for i in range(n)]
+        for p, ids in sweep_intersections(segments):
+            if len(ids) == 2 and (ids[1] - ids[0] == 1 or (ids[0] == 0 and ids[1] == n - 1)):
+                continue
+            yield p, ids
+
+    def is_simple(self):
+        """Return whether no two sides cross or touch, except consecutive sides
+        at their shared vertex. Uses a sweep line, O(n log n)."""
+        for _ in self._side_meetings():
+            return False
         return True
 
-    def encloses_point(self, p):
-        """Return whether the point p is enclosed by self"""
+    def self_intersections(self):
+        """Return the points where sides cross or touch each other, other than
+        the vertices shared by consecutive sides. Uses a sweep line,
+        O((n + k) log n) for k such points."""
+        return [Point._trusted(*p) for p, ids in self._side_meetings()]
+
+    @cached_property
+    def _edges(self):
+        """The sides as (x1, y1, x2, y2) tuples"""
+        args = self.args
+        return tuple(args[i - 1].args + args[i].args for i in range(len(args)))
+
+    def winding_number(self, p):
+        """Return how many times the boundary winds counterclockwise around p,
+        or None if p lies on the boundary."""
         p = Point._convert(p)
-        if any(p in s for s in self.sides):
-            return False
-        # Still need to complement !!!
+        return _winding(p.x, p.y, self._edges)
 
-        return True
+    def encloses_point(self, p):
+        """Return whether the point p is enclosed by self.
+        Points on the boundary are not enclosed. A self-intersecting polygon
+        encloses the points it winds around (the nonzero rule)."""
+        return bool(self.winding_number(p))
 
     def distance(self, other):
         """
-        Returns the shortest distance between self and o.
+        Returns the shortest distance between self and a point,
+        0 if the point is enclosed by self.
         """
-        raise NotImplementedError()
+        if isinstance(other, GeometryEntity) and not isinstance(other, Point):
+            raise NotImplementedError()
+        p = Point._convert(other)
+        if self.encloses_point(p):
+            return 0.0
+        return min(side.distance(p) for side in self._sides)
 
     def intersection(self, other):
-        """the intersection of polygon and other geometry entity"""
+        """the intersection of polygon and other geometry entity
+
+        Results are memoized while ``cache.enable_intersection_cache()`` is in effect.
+        """
+        cache = intersection_cache()
+        if cache is not None:
+            return cache.intersection(self, other, Polygon._intersection)
+        return self._intersection(other)
+
+    def _intersection(self, other):
         intersection_result = []
-        k = other.sides if isinstance(other, Polygon) else [other]
-        for side in self.sides:
+        k = other._sides if isinstance(other, Polygon) else [other]
+        for side in self._sides:
             for side1 in k:
                 intersection_result.extend(side.intersection(side1))
 
@@ -216,18 +284,159 @@ class Polygon(GeometryEntity):
         else:
             return list(intersection_result)
 
+    def union(self, other):
+        """Return the union of self and the polygon other as a list of
+        Polygons, holes clockwise (see geometry.boolean)"""
+        from .boolean import union
+        return union(self, other)
+
+    def difference(self, other):
+        """Return the part of self outside the polygon other as a list of
+        Polygons, holes clockwise (see geometry.boolean)"""
+        from .boolean import difference
+        return difference(self, other)
+
+    def symmetric_difference(self, other):
+        """Return the region covered by exactly one of self and the polygon
+        other as a list of Polygons, holes clockwise (see geometry.boolean)"""
+        from .boolean import symmetric_difference
+        return symmetric_difference(self, other)
+
+    def intersection_area(self, other):
+        """Return the area self shares with the polygon other. ``intersection``
+        gives the points and segments where the boundaries meet; the shared
+        region itself is ``geometry.boolean.intersection``."""
+        from .boolean import intersection_area
+        return intersection_area(self, other)
+
+    def clip(self, bounds):
+        """Return the part of self inside the rectangle (xmin, ymin, xmax, ymax),
+        or None (see geometry.boolean.clip)"""
+        from .boolean import clip
+        return clip(self, bounds)
+
+    def triangulate(self, triangles=False, method='auto'):
+        """Return the triangulation of the polygon as a flat ``array('l')`` of
+        vertex indexes, three per counterclockwise triangle, or with
+        ``triangles=True`` as a list of Triangles (see geometry.triangulate)"""
+        from .triangulate import triangulate
+        tri = triangulate(self, method)
+        if not triangles:
+            return tri
+        args = self.args
+        return [Triangle(args[tri[k]], args[tri[k + 1]], args[tri[k + 2]], validate=False)
+                for k in range(0, len(tri), 3)]
+
+    @cached_property
+    def _moments(self):
+        """(area, cx, cy, ixx, iyy, ixy) from one pass over the sides, with the
+        second moments about the centroid. The sums run relative to the first
+        vertex so that polygons far from the origin keep their precision."""
+        args = self.args
+        x0, y0 = args[0].args
+        x1, y1 = args[-1].args
+        x1, y1 = x1 - x0, y1 - y0
+        a = sx = sy = sxx = syy = sxy = 0
+        for p in args:
+            x2, y2 = p.args
+            x2, y2 = x2 - x0, y2 - y0
+            c = x1*y2 - x2*y1
+            a += c
+            sx += (x1 + x2)*c
+            sy += (y1 + y2)*c
+            sxx += (y1*y1 + y1*y2 + y2*y2)*c
+            syy += (x1*x1 + x1*x2 + x2*x2)*c
+            sxy += (x1*y2 + 2*x1*y1 + 2*x2*y2 + x2*y1)*c
+            x1, y1 = x2, y2
+        if not a:
+            raise ValueError("the polygon has no area")
+        a /= 2
+        cx, cy = sx/(6*a), sy/(6*a)
+        return a, cx + x0, cy + y0, sxx/12 - a*cy*cy, syy/12 - a*cx*cx, sxy/24 - a*cx*cy
+
     @property
     def centroid(self):
-        """Return the centroid of th polygon"""
-        v = self.vertices
-        d = reduce(lambda x, y: x+y, ((a.x * a.y) for a in v))
-        dx = reduce(lambda x, y: x+y, ((a.x) for a in v))
-        dy = reduce(lambda x, y: x+y, ((a.y) for a in v))
-        return Point(d/dy, d/dx)
+        """Return the centroid of the polygon"""
+        m = self._moments
+        return Point._trusted(m[1], m[2])
 
     def second_moment_of_area(self, point=None):
-        """Returns the second moment and product moment of area of a two dimensional polygon."""
-        raise NotImplementedError()
+        """Returns the second moment and product moment of area of a two dimensional polygon.
+
+        :param point: the point the moments are taken about; the centroid if None
+        :return: (I_xx, I_yy, I_xy), signed like ``area``
+        """
+        a, cx, cy, ixx, iyy, ixy = self._moments
+        if point is None:
+            return ixx, iyy, ixy
+        dx, dy = point[0] - cx, point[1] - cy
+        return ixx + a*dy*dy, iyy + a*dx*dx, ixy + a*dx*dy
+
+
+def _collinear(a, b, c):
+    """Same test as Point2D.is_collinear(a, b, c), without the varargs loop"""
+    if len(a._args) != 2:
+        return a.is_collinear(b, c)
+    return orient2d(a._args, b._args, c._args) == 0
+
+
+def _normalize_ring(vertices):
+    """Drop repeated vertices and the middle one of every collinear triple,
+    including around the closing vertex, in one O(n) pass."""
+    ring = []
+    for p in vertices:
+        if ring and p == ring[-1]:
+            continue
+        while len(ring) >= 2 and _collinear(ring[-2], ring[-1], p):
+            ring.pop()
+        # a spike folding straight back can leave p on top of its twin
+        if not ring or p != ring[-1]:
+            ring.append(p)
+
+    # the ring wraps around: clean up where the end meets the start
+    start = 0
+    while len(ring) - start > 1:
+        if ring[-1] == ring[start]:
+            ring.pop()
+        elif len(ring) - start > 2 and _collinear(ring[-2], ring[-1], ring[start]):
+            ring.pop()
+        elif len(ring) - start > 2 and _collinear(ring[-1], ring[start], ring[start + 1]):
+            start += 1
+        else:
+            break
+    return ring[start:] if start else ring
+
+
+def _winding(px, py, edges):
+    """Winding number of the closed chain of edges (x1, y1, x2, y2) around
+    (px, py), or None if the point is on one of the edges.
+
+    An upward edge that has the point strictly to its left counts +1, a downward
+    edge with the point strictly to its right counts -1. Which side of an edge
+    the point is on is decided exactly (see predicates.orient2d).
+    """
+    wn = 0
+    for x1, y1, x2, y2 in edges:
+        if (y1 > py) == (y2 > py):
+            # the edge doesn't cross the horizontal through p, but p may lie on it
+            if (y1 == py or y2 == py) and min(x1, x2) <= px <= max(x1, x2) \
+                    and orient2d((x1, y1), (x2, y2), (px, py)) == 0:
+                return None
+            continue
+        detleft = (x2 - x1)*(py - y1)
+        detright = (px - x1)*(y2 - y1)
+        cross = detleft - detright
+        bound = _ORIENT2D_BOUND*(abs(detleft) + abs(detright))
+        if -bound <= cross <= bound:
+            cross = orient2d((x1, y1), (x2, y2), (px, py))
+            if cross == 0:
+                return None
+        if y2 > y1:
+            if cross > 0:
+                wn += 1
+        elif cross < 0:
+            wn -= 1
+    return wn
 
 
 class RegularPolygon(Polygon):
@@ -266,34 +475,15 @@ class RegularPolygon(Polygon):
 
 
 class Triangle(Polygon):
-    def __new__(cls, *args, **kwargs):
+    def __new__(cls, *args, validate=True, **kwargs):
         vertices = [Point._convert(a) for a in args]
-
-        # remove same points
-        nsp = []
-        for p in vertices:
-            if nsp and p == nsp[-1]:
-                continue
-            nsp.append(p)
-
-        if len(nsp) > 1 and nsp[0] == nsp[-1]:
-            nsp.pop()
-
-        # remove collinear points
-        i = -3
-        while i < len(nsp) - 3 and len(nsp) > 2:
-            a, b, c = nsp[i], nsp[i + 1], nsp[i + 2]
-            if a.is_collinear(b, c):
-                nsp[i] = a
-                nsp[i + 1] = None
-                nsp.pop(i + 1)
-            i += 1
-
-        vertices = list(filter(lambda x: x is not None, nsp))
+        if validate:
+            vertices = _normalize_ring(vertices)
 
         if len(vertices) == 3:
             return GeometryEntity.__new__(cls, *vertices, **kwargs)
         elif len(vertices) == 2:
             return Segment(*vertices, **kwargs)
-        else:
-            return Point(*vertices, **kwargs)
\ No newline at end of file
+        elif len(vertices) == 1:
+            return Point(*vertices, **kwargs)
+        raise ValueError("Triangle needs 3 vertices, got %s" % len(vertices))
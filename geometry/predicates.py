@@ -0,0 +1,147 @@
+"""
+Robust geometric predicates.
+
+``orient2d``, ``cross2d``, ``orient3d`` and ``incircle`` return a value whose sign is
+exactly right for the given coordinates, in the manner of Shewchuk's adaptive
+predicates ("Adaptive Precision Floating-Point Arithmetic and Fast Robust
+Geometric Predicates", 1997): the determinant is first evaluated in floats
+and kept when it is larger than the worst-case rounding error; only when the
+float result can't be trusted is it evaluated again exactly, with Python
+integers. For random input the float filter decides almost every call.
+
+Coordinates may be ints, floats or Fractions. Only the sign of the result is
+meaningful: when the exact stage ran, the magnitude is scaled.
+
+``stats`` counts the calls that needed the exact stage.
+"""
+from fractions import Fraction
+
+from .settings import Epsilon
+
+# error bounds of the float determinants, from Shewchuk's predicates.c
+_ORIENT2D_BOUND = (3 + 16 * Epsilon) * Epsilon
+_ORIENT3D_BOUND = (7 + 56 * Epsilon) * Epsilon
+_INCIRCLE_BOUND = (10 + 96 * Epsilon) * Epsilon
+
+# number of calls that fell back to exact arithmetic, per predicate
+stats = {'orient2d': 0, 'cross2d': 0, 'orient3d': 0, 'incircle': 0}
+
+
+def _exact(values):
+    """Return the values scaled by one common factor to exact ints or Fractions"""
+    if any(isinstance(v, Fraction) for v in values):
+        return [Fraction(v) for v in values]
+    # floats are m / 2**k: scale everything by the largest 2**k
+    ratios = [v.as_integer_ratio() for v in values]
+    den = max(d for _, d in ratios)
+    return [n * (den // d) for n, d in ratios]
+
+
+def orient2d(a, b, c):
+    """Positive if a, b, c turn counterclockwise, negative if clockwise, 0 if
+    they are collinear. a, b, c are (x, y) sequences."""
+    detleft = (a[0] - c[0]) * (b[1] - c[1])
+    detright = (a[1] - c[1]) * (b[0] - c[0])
+    det = detleft - detright
+    if not isinstance(det, float):
+        # ints and Fractions are already exact
+        return det
+    bound = _ORIENT2D_BOUND * (abs(detleft) + abs(detright))
+    if det > bound or -det > bound:
+        return det
+    stats['orient2d'] += 1
+    ax, ay, bx, by, cx, cy = _exact((a[0], a[1], b[0], b[1], c[0], c[1]))
+    return (ax - cx) * (by - cy) - (ay - cy) * (bx - cx)
+
+
+def cross2d(a, b, c, d):
+    """The sign of the cross product (b - a) x (d - c): 0 when the two
+    directions are parallel, positive when d - c points to the left of b - a."""
+    detleft = (b[0] - a[0]) * (d[1] - c[1])
+    detright = (b[1] - a[1]) * (d[0] - c[0])
+    det = detleft - detright
+    if not isinstance(det, float):
+        return det
+    # the same shape of expression as orient2d, so the same bound applies
+    bound = _ORIENT2D_BOUND * (abs(detleft) + abs(detright))
+    if det > bound or -det > bound:
+        return det
+    stats['cross2d'] += 1
+    ax, ay, bx, by, cx, cy, dx, dy = _exact((a[0], a[1], b[0], b[1], c[0], c[1], d[0], d[1]))
+    return (bx - ax) * (dy - cy) - (by - ay) * (dx - cx)
+
+
+def orient3d(a, b, c, d):
+    """Positive if d lies below the plane through a, b, c, where a, b, c appear
+    counterclockwise seen from above the plane; negative if above; 0 if the
+    four points are coplanar. Arguments are (x, y, z) sequences."""
+    adx, ady, adz = a[0] - d[0], a[1] - d[1], a[2] - d[2]
+    bdx, bdy, bdz = b[0] - d[0], b[1] - d[1], b[2] - d[2]
+    cdx, cdy, cdz = c[0] - d[0], c[1] - d[1], c[2] - d[2]
+    bdxcdy, cdxbdy = bdx * cdy, cdx * bdy
+    cdxady, adxcdy = cdx * ady, adx * cdy
+    adxbdy, bdxady = adx * bdy, bdx * ady
+    det = adz * (bdxcdy - cdxbdy) + bdz * (cdxady - adxcdy) + cdz * (adxbdy - bdxady)
+    if not isinstance(det, float):
+        return det
+    permanent = ((abs(bdxcdy) + abs(cdxbdy)) * abs(adz) + (abs(cdxady) + abs(adxcdy)) * abs(bdz)
+                 + (abs(adxbdy) + abs(bdxady)) * abs(cdz))
+    bound = _ORIENT3D_BOUND * permanent
+    if det > bound or -det > bound:
+        return det
+    stats['orient3d'] += 1
+    ax, ay, az, bx, by, bz, cx, cy, cz, dx, dy, dz = _exact(tuple(a[:3]) + tuple(b[:3]) + tuple(c[:3]) + tuple(d[:3]))
+    adx, ady, adz = ax - dx, ay - dy, az - dz
+    bdx, bdy, bdz = bx - dx, by - dy, bz - dz
+    cdx, cdy, cdz = cx - dx, cy - dy, cz - dz
+    return (adz * (bdx * cdy - cdx * bdy) + bdz * (cdx * ady - adx * cdy)
+            + cdz * (adx * bdy - bdx * ady))
+
+
+def incircle(a, b, c, d):
+    """Positive if d lies inside the circle through a, b, c, where a, b, c
+    appear counterclockwise; negative if outside; 0 if the four points are
+    cocircular. Arguments are (x, y) sequences."""
+    adx, ady = a[0] - d[0], a[1] - d[1]
+    bdx, bdy = b[0] - d[0], b[1] - d[1]
+    cdx, cdy = c[0] - d[0], c[1] - d[1]
+    bdxcdy, cdxbdy = bdx * cdy, cdx * bdy
+    cdxady, adxcdy = cdx * ady, adx * cdy
+    adxbdy, bdxady = adx * bdy, bdx * ady
+    alift = adx * adx + ady * ady
+    blift = bdx * bdx + bdy * bdy
+    clift = cdx * cdx + cdy * cdy
+    det = alift * (bdxcdy - cdxbdy) + blift * (cdxady - adxcdy) + clift * (adxbdy - bdxady)
+    if not isinstance(det, float):
+        return det
+    permanent = ((abs(bdxcdy) + abs(cdxbdy)) * alift + (abs(cdxady) + abs(adxcdy)) * blift
+                 + (abs(adxbdy) + abs(bdxady)) * clift)
+    bound = _INCIRCLE_BOUND * permanent
+    if det > bound or -det > bound:
+        return det
+    stats['incircle'] += 1
+    ax, ay, bx, by, cx, cy, dx, dy = _exact((a[0], a[1], b[0], b[1], c[0], c[1], d[0], d[1]))
+    adx, ady, bdx, bdy, cdx, cdy = ax - dx, ay - dy, bx - dx, by - dy, cx - dx, cy - dy
+    return ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+            + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+            + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+
+
+def collinear3d(a, b, c):
+    """Whether the 3D points a, b, c lie on one line: (b - a) x (c - a) is the
+    zero vector exactly when its three projections onto the axis planes are."""
+    return (orient2d((a[0], a[1]), (b[0], b[1]), (c[0], c[1])) == 0
+            and orient2d((a[0], a[2]), (b[0], b[2]), (c[0], c[2])) == 0
+            and orient2d((a[1], a[2]), (b[1], b[2]), (c[1], c[2])) == 0)
+
+
+def parallel3d(a, b, c, d):
+    """Whether the 3D directions b - a and d - c are parallel"""
+    return (cross2d((a[0], a[1]), (b[0], b[1]), (c[0], c[1]), (d[0], d[1])) == 0
+            and cross2d((a[0], a[2]), (b[0], b[2]), (c[0], c[2]), (d[0], d[2])) == 0
+            and cross2d((a[1], a[2]), (b[1], b[2]), (c[1], c[2]), (d[1], d[2])) == 0)
+
+
+def reset_stats():
+    for k in stats:
+        stats[k] = 0
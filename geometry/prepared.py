@@ -0,0 +1,168 @@
+"""
+Prepared polygons for answering many point-in-polygon queries.
+
+``PreparedPolygon`` copies the sides of a Polygon into edge arrays once and
+buckets them into horizontal bands ("the edge-interval index"). A point only
+needs the edges whose y-range meets its band, so a query costs about
+O(n / bands) instead of O(n). ``encloses_points`` answers a whole array of
+points with numpy, one band at a time.
+
+An edge is listed in every band it crosses. The default number of bands is
+chosen from the total height of the edges so that the bands hold at most
+about ``BAND_ENTRIES`` entries per edge: rings whose edges are long or zigzag
+across the whole polygon get fewer, wider bands instead of O(n^2) entries.
+
+This module needs numpy.
+"""
+import numpy as np
+
+from .point import Point
+from .polygon import _winding
+from .predicates import orient2d, _ORIENT2D_BOUND
+
+# the default bands hold at most about this many entries per edge
+BAND_ENTRIES = 8
+
+
+class PreparedPolygon(object):
+    """A Polygon with its edges indexed for fast point queries.
+
+    It has ``bounds``, ``encloses_point`` and ``distance`` like the polygon
+    itself, so it can stand in for it, e.g. in ``STRtree``.
+
+    :param polygon: the Polygon
+    :param bands: number of horizontal bands; by default about one per 2 edges,
+        fewer when the edges are tall (see BAND_ENTRIES)
+    """
+
+    def __init__(self, polygon, bands=None):
+        self.polygon = polygon
+        edges = np.array(polygon._edges, dtype=float)
+        self.edges = edges
+        self.bounds = polygon.bounds
+        n = len(edges)
+        ymin, ymax = self.bounds[1], self.bounds[3]
+        if bands is None:
+            bands = max(1, min(n // 2, 1 << 16))
+            # an edge of height h lands in about 1 + bands * h / (ymax - ymin)
+            # bands; keep the sum within BAND_ENTRIES * n
+            span = float(np.abs(edges[:, 3] - edges[:, 1]).sum())
+            if span > 0:
+                bands = max(1, min(bands, int((BAND_ENTRIES - 1) * n * (ymax - ymin) / span)))
+        self.bands = bands
+
+        self._ymin = ymin
+        self._scale = bands / (ymax - ymin) if ymax > ymin else 0.0
+        lo = self._band_of(np.minimum(edges[:, 1], edges[:, 3]))
+        hi = self._band_of(np.maximum(edges[:, 1], edges[:, 3]))
+
+        # CSR layout: the edges of band b are edge_ids[offsets[b]:offsets[b + 1]]
+        counts = hi - lo + 1
+        ids = np.repeat(np.arange(n), counts)
+        start = np.repeat(lo, counts)
+        within = np.arange(len(ids)) - np.repeat(np.cumsum(counts) - counts, counts)
+        band = start + within
+        order = np.argsort(band, kind='stable')
+        self._edge_ids = ids[order]
+        self._offsets = np.concatenate(([0], np.cumsum(np.bincount(band, minlength=bands))))
+
+        # plain tuples for the single point queries, where numpy calls cost more than they save
+        edge_list = [tuple(e) for e in edges.tolist()]
+        self._band_edges = [
+            [edge_list[i] for i in self._edge_ids[self._offsets[b]:self._offsets[b + 1]].tolist()]
+            for b in range(bands)]
+
+    def __repr__(self):
+        return "%s(%d edges, %d bands)" % (type(self).__name__, len(self.edges), self.bands)
+
+    def _band_of(self, y):
+        """Band index of the y value(s); must be the same formula for edges and points"""
+        b = np.floor((y - self._ymin) * self._scale).astype(np.intp)
+        return np.clip(b, 0, self.bands - 1)
+
+    def winding_number(self, p):
+        """Return how many times the boundary winds around p, or None if p lies on it"""
+        p = Point._convert(p)
+        x, y = p.x, p.y
+        xmin, ymin, xmax, ymax = self.bounds
+        if x < xmin or x > xmax or y < ymin or y > ymax:
+            return 0
+        b = int((y - self._ymin) * self._scale)
+        b = min(max(b, 0), self.bands - 1)
+        return _winding(x, y, self._band_edges[b])
+
+    def encloses_point(self, p):
+        """Return whether the point p is enclosed by the polygon, as ``Polygon.encloses_point``"""
+        return bool(self.winding_number(p))
+
+    def distance(self, p):
+        """Return the distance from the point p to the polygon, 0 if p is
+        enclosed, as ``Polygon.distance``"""
+        p = Point._convert(p)
+        if self.encloses_point(p):
+            return 0.0
+        return min(side.distance(p) for side in self.polygon._sides)
+
+    def winding_numbers(self, points):
+        """Vectorized ``winding_number``. Points on the boundary get -2**31.
+
+        :param points: PointArray, (N, 2) array or sequence of points
+        :return: int array of length N
+        """
+        if hasattr(points, 'coords'):
+            points = points.coords
+        elif not isinstance(points, np.ndarray):
+            points = [tuple(p) for p in points]
+        pts = np.asarray(points, dtype=float).reshape(-1, 2)
+        px, py = pts[:, 0], pts[:, 1]
+        wn = np.zeros(len(pts), dtype=np.int64)
+        xmin, ymin, xmax, ymax = self.bounds
+        inside_box = np.flatnonzero((px >= xmin) & (px <= xmax) & (py >= ymin) & (py <= ymax))
+        if not len(inside_box):
+            return wn
+
+        band = self._band_of(py[inside_box])
+        order = np.argsort(band, kind='stable')
+        sorted_ids = inside_box[order]
+        sorted_band = band[order]
+        cuts = np.flatnonzero(np.diff(sorted_band)) + 1
+        for chunk in np.split(np.arange(len(sorted_ids)), cuts):
+            b = sorted_band[chunk[0]]
+            e = self.edges[self._edge_ids[self._offsets[b]:self._offsets[b + 1]]]
+            ids = sorted_ids[chunk]
+            wn[ids] = _winding_block(px[ids], py[ids], e)
+        return wn
+
+    def encloses_points(self, points):
+        """Vectorized ``encloses_point``; returns a bool array"""
+        wn = self.winding_numbers(points)
+        return (wn != 0) & (wn != _ON_BOUNDARY)
+
+
+_ON_BOUNDARY = -2**31
+
+
+def _winding_block(px, py, edges):
+    """``_winding`` for k points against m edges at once"""
+    px, py = px[:, None], py[:, None]
+    x1, y1, x2, y2 = (edges[:, k][None, :] for k in range(4))
+    detleft = (x2 - x1)*(py - y1)
+    detright = (px - x1)*(y2 - y1)
+    cross = detleft - detright
+    spans = (y1 > py) != (y2 > py)
+    touches = (((y1 == py) | (y2 == py))
+               & (px >= np.minimum(x1, x2)) & (px <= np.maximum(x1, x2)))
+    # decide the sides the float cross product can't be trusted for exactly
+    unsure = (np.abs(cross) <= _ORIENT2D_BOUND*(np.abs(detleft) + np.abs(detright))) & (spans | touches)
+    if unsure.any():
+        cross = cross.copy()
+        qx, qy = px[:, 0].tolist(), py[:, 0].tolist()
+        for i, j in zip(*np.nonzero(unsure)):
+            ax, ay, bx, by = edges[j].tolist()
+            o = orient2d((ax, ay), (bx, by), (qx[i], qy[i]))
+            cross[i, j] = (o > 0) - (o < 0)
+    on_edge = (cross == 0) & (spans | touches)
+    up = spans & (y2 > y1) & (cross > 0)
+    down = spans & (y2 <= y1) & (cross < 0)
+    wn = up.sum(axis=1) - down.sum(axis=1)
+    return np.where(on_edge.any(axis=1), _ON_BOUNDARY, wn)
@@ -11,6 +11,11 @@ SQRT_2 = 1.4142135623730951
 SQRT_3 = 1.7320508075688772
 Epsilon = float_info.epsilon
 
+# Keep derived values such as Polygon.sides, area and bounds on the entity once
+# computed (see basic.cached_property). Set to False to compute them on every
+# access instead, trading speed for memory.
+CACHE_PROPERTIES = True
+
 
 def nearly_eq(a, b, max_f=float_info.max, min_f=float_info.min, epsilon=Epsilon):
     """
@@ -0,0 +1,205 @@
+"""
+A memory-mapped file of 2D polygons, for datasets larger than RAM.
+
+``PolygonStore.write`` streams polygons to disk and ``PolygonStore(path)``
+maps the file without reading it. The file holds, after a 32 byte header,
+three little endian arrays:
+
+    coords   float64 (m, 2)  the vertices of every polygon, rings open
+    offsets  int64   (n + 1) polygon i is coords[offsets[i]:offsets[i + 1]]
+    bounds   float64 (n, 4)  (xmin, ymin, xmax, ymax) of each polygon
+
+Indexing the store returns a ``PolygonView``. Its ``bounds``, ``area`` and
+point-in-polygon tests work on the mapped arrays; only the pages of that
+polygon are read and no Point objects are built. Anything else a Polygon can
+do is delegated to a real Polygon, built on first use.
+
+The views have ``bounds`` and ``encloses_point``, so ``index.STRtree`` can
+index them directly (see ``PolygonStore.index``). Pickling a store or a
+view records the path of the file, not its contents.
+
+This module needs numpy.
+"""
+from array import array
+import struct
+
+import numpy as np
+
+from .point import Point
+from .polygon import Polygon
+from .prepared import _winding_block, _ON_BOUNDARY
+
+_MAGIC = b'GEOM'
+_VERSION = 1
+# magic, version, dim, polygon count, vertex count, padding to 32 bytes
+_HEADER = struct.Struct('<4sHHQQ8x')
+
+
+class PolygonView(object):
+    """Polygon i of a PolygonStore, read from the mapped file on demand"""
+    __slots__ = ('store', 'index', '_polygon')
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+        self._polygon = None
+
+    def __repr__(self):
+        return "%s(%d of %r)" % (type(self).__name__, self.index, self.store)
+
+    @property
+    def coords(self):
+        """The (k, 2) array of vertices, a view of the mapped file"""
+        off = self.store.offsets
+        return self.store.coords[off[self.index]:off[self.index + 1]]
+
+    @property
+    def bounds(self):
+        return tuple(self.store.bounds[self.index].tolist())
+
+    @property
+    def area(self):
+        """Signed shoelace area, as Polygon.area"""
+        c = self.coords
+        x, y = c[:, 0] - c[0, 0], c[:, 1] - c[0, 1]
+        return float(np.dot(np.roll(x, 1), y) - np.dot(x, np.roll(y, 1))) / 2
+
+    def _edges(self):
+        c = self.coords
+        return np.hstack((np.roll(c, 1, axis=0), c))
+
+    def winding_number(self, p):
+        """As Polygon.winding_number: None if p lies on the boundary"""
+        p = Point._convert(p)
+        xmin, ymin, xmax, ymax = self.store.bounds[self.index]
+        if p.x < xmin or p.x > xmax or p.y < ymin or p.y > ymax:
+            return 0
+        wn = int(_winding_block(np.array([p.x]), np.array([p.y]), self._edges())[0])
+        return None if wn == _ON_BOUNDARY else wn
+
+    def encloses_point(self, p):
+        """As Polygon.encloses_point"""
+        return bool(self.winding_number(p))
+
+    def encloses_points(self, points):
+        """Vectorized encloses_point for an (N, 2) array; returns a bool array"""
+        pts = np.asarray(points, dtype=float).reshape(-1, 2)
+        wn = _winding_block(pts[:, 0], pts[:, 1], self._edges())
+        return (wn != 0) & (wn != _ON_BOUNDARY)
+
+    @property
+    def polygon(self):
+        """The Polygon itself, built once"""
+        if self._polygon is None:
+            self._polygon = Polygon(*[Point._trusted(*c) for c in self.coords.tolist()], validate=False)
+        return self._polygon
+
+    def __getattr__(self, name):
+        # the slots and the special names copy and pickle look for must not
+        # reach self.polygon, which needs the slots itself
+        if name.startswith('_') or name in ('store', 'index', 'polygon'):
+            raise AttributeError(name)
+        return getattr(self.polygon, name)
+
+    def __reduce__(self):
+        return PolygonView, (self.store, self.index)
+
+
+class PolygonStore(object):
+    """A read-only, memory-mapped sequence of 2D polygons written by ``write``.
+
+    :param path: the file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, version, dim, n, m = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError("%s is not a polygon store" % path)
+        if version != _VERSION:
+            raise ValueError("unsupported polygon store version %d" % version)
+        pos = _HEADER.size
+        self.coords = _map(path, '<f8', pos, (m, dim))
+        pos += 8 * m * dim
+        self.offsets = _map(path, '<i8', pos, (n + 1,))
+        pos += 8 * (n + 1)
+        self.bounds = _map(path, '<f8', pos, (n, 4))
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def __reduce__(self):
+        # map the file again rather than copying the arrays
+        return PolygonStore, (self.path,)
+
+    def __repr__(self):
+        return "%s(%r, %d polygons)" % (type(self).__name__, self.path, len(self))
+
+    def __getitem__(self, i):
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("polygon index out of range")
+        return PolygonView(self, i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield PolygonView(self, i)
+
+    def query(self, window):
+        """Return the indexes of the polygons whose bounds overlap ``window``
+        (xmin, ymin, xmax, ymax), by a scan of the bounds array"""
+        xmin, ymin, xmax, ymax = window
+        b = self.bounds
+        hit = (b[:, 0] <= xmax) & (b[:, 2] >= xmin) & (b[:, 1] <= ymax) & (b[:, 3] >= ymin)
+        return np.flatnonzero(hit).tolist()
+
+    def containing(self, point):
+        """Return the indexes of the polygons that enclose ``point``"""
+        p = Point._convert(point)
+        return [i for i in self.query((p.x, p.y, p.x, p.y)) if PolygonView(self, i).encloses_point(p)]
+
+    def index(self, node_capacity=10):
+        """Return an STRtree over the views, for repeated window and point queries"""
+        from .index import STRtree
+        return STRtree(self, node_capacity)
+
+    @staticmethod
+    def write(path, polygons):
+        """Write 2D polygons to ``path``, streaming: only the offsets and bounds
+        (40 bytes per polygon) are kept in memory.
+
+        :param polygons: iterable of Polygons, or a ``(coords, offsets)`` pair of arrays
+        :return: the number of polygons written
+        """
+        if isinstance(polygons, tuple) and len(polygons) == 2 and isinstance(polygons[0], np.ndarray):
+            coords, ring_offsets = polygons
+            polygons = (coords[ring_offsets[i]:ring_offsets[i + 1]] for i in range(len(ring_offsets) - 1))
+        offsets = array('q', [0])
+        bounds = array('d')
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, 2, 0, 0))
+            for pg in polygons:
+                if isinstance(pg, np.ndarray):
+                    c = np.asarray(pg, dtype='<f8')
+                else:
+                    c = np.array([p.args for p in pg.args], dtype='<f8')
+                if c.ndim != 2 or c.shape[1] != 2:
+                    raise ValueError("a polygon store holds 2D polygons only")
+                f.write(c.tobytes())
+                offsets.append(offsets[-1] + len(c))
+                bounds.extend(c.min(axis=0).tolist() + c.max(axis=0).tolist())
+            f.write(np.frombuffer(offsets, dtype=np.int64).astype('<i8').tobytes())
+            f.write(np.frombuffer(bounds, dtype=float).astype('<f8').tobytes())
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, _VERSION, 2, len(offsets) - 1, offsets[-1]))
+        return len(offsets) - 1
+
+
+def _map(path, dtype, offset, shape):
+    """np.memmap, which can't map zero bytes"""
+    if not np.prod(shape):
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape)
@@ -0,0 +1,155 @@
+"""
+Sweep-line (Bentley-Ottmann) intersection reporting for 2D segments.
+
+The sweep line moves from left to right (ties by increasing y) over the segment
+endpoints and the crossings found so far, keeping the segments it currently
+cuts ordered from bottom to top. Only neighbours in that order are tested
+against each other, so all k intersection points of n segments are found in
+O((n + k) log n) comparisons instead of testing every pair.
+
+Orientation signs are exact (see predicates.orient2d), and crossing points
+are kept as Fractions internally so the sweep never loses track of a segment
+through rounding.
+"""
+import heapq
+from fractions import Fraction
+from functools import cmp_to_key
+
+from .predicates import orient2d as _orient, _ORIENT2D_BOUND
+from .settings import Epsilon
+
+
+def _simplify(v):
+    """Return a Fraction as a float when that is exact"""
+    if isinstance(v, Fraction):
+        f = float(v)
+        if f == v:
+            return f
+    return v
+
+
+def _orient_fraction(a, b, c):
+    """orient2d(a, b, c) for a crossing point c kept as Fractions; a and b are
+    input points. Mixed float and Fraction arithmetic rounds to floats, so the
+    float filter runs on c rounded, with the bound widened by how much that
+    rounding can move the determinant; only close calls go exact."""
+    cx, cy = float(c[0]), float(c[1])
+    detleft = (a[0] - cx) * (b[1] - cy)
+    detright = (a[1] - cy) * (b[0] - cx)
+    det = detleft - detright
+    bound = (_ORIENT2D_BOUND * (abs(detleft) + abs(detright))
+             + 2 * Epsilon * (abs(cx) * abs(b[1] - a[1]) + abs(cy) * abs(b[0] - a[0])))
+    if det > bound or -det > bound:
+        return det
+    return _orient(tuple(map(Fraction, a)), tuple(map(Fraction, b)), tuple(map(Fraction, c)))
+
+
+def _crossing(a, b, c, d):
+    """Return the single point shared by segments ab and cd, or None if they
+    don't meet or overlap along a stretch."""
+    o1, o2 = _orient(a, b, c), _orient(a, b, d)
+    if (o1 > 0 and o2 > 0) or (o1 < 0 and o2 < 0):
+        return None
+    o3, o4 = _orient(c, d, a), _orient(c, d, b)
+    if (o3 > 0 and o4 > 0) or (o3 < 0 and o4 < 0):
+        return None
+    if o1 == 0 and o2 == 0:
+        # collinear; the overlap starts and ends at endpoints, which are events anyway
+        return None
+    # an endpoint lying on the other segment is the crossing point itself
+    if o1 == 0:
+        return c
+    if o2 == 0:
+        return d
+    if o3 == 0:
+        return a
+    if o4 == 0:
+        return b
+    ax, ay, bx, by, cx, cy, dx, dy = (Fraction(v) for v in a + b + c + d)
+    t = ((cx - ax) * (dy - cy) - (cy - ay) * (dx - cx)) / ((bx - ax) * (dy - cy) - (by - ay) * (dx - cx))
+    return (_simplify(ax + t * (bx - ax)), _simplify(ay + t * (by - ay)))
+
+
+def sweep_intersections(segments):
+    """Yield every point where two or more of the segments meet.
+
+    :param segments: sequence of ``((x1, y1), (x2, y2))`` pairs or Segment2D
+    :return: generator of ``(point, ids)``, in sweep order, where ``point`` is
+        an ``(x, y)`` tuple (rounded to floats if it is a crossing that floats
+        can't represent) and ``ids`` the sorted indexes of the segments through
+        it. Segments of zero length are ignored. Collinear overlaps are reported at
+        the endpoints of the overlap.
+    """
+    lefts, rights = [], []
+    starts = {}
+    events = []
+    for i, seg in enumerate(segments):
+        p, q = (tuple(v) for v in seg)
+        if p > q:
+            p, q = q, p
+        lefts.append(p)
+        rights.append(q)
+        if p == q:
+            continue
+        starts.setdefault(p, []).append(i)
+        events.append(p)
+        events.append(q)
+    events = list(set(events))
+    heapq.heapify(events)
+    queued = set(events)
+
+    # segment ids cut by the sweep line, bottom to top
+    status = []
+
+    # _orient_fraction while the event is a crossing point kept as Fractions
+    orient = _orient
+
+    def above(s, p):
+        """>0 if p is above segment s, 0 on its line, <0 below"""
+        if p == rights[s] or p == lefts[s]:
+            # the exact answer, which the float filter can't give
+            return 0
+        return orient(lefts[s], rights[s], p)
+
+    def schedule(s, t, p):
+        hit = _crossing(lefts[s], rights[s], lefts[t], rights[t])
+        if hit is not None and hit > p and hit not in queued:
+            queued.add(hit)
+            heapq.heappush(events, hit)
+
+    while events:
+        p = heapq.heappop(events)
+        orient = _orient_fraction if type(p[0]) is Fraction or type(p[1]) is Fraction else _orient
+
+        # status[lo:hi] are the segments through p
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if above(status[mid], p) > 0:
+                lo = mid + 1
+            else:
+                hi = mid
+        hi = lo
+        while hi < len(status) and above(status[hi], p) == 0:
+            hi += 1
+
+        upper = starts.get(p, [])
+        if len(upper) + hi - lo > 1:
+            yield tuple(float(v) if isinstance(v, Fraction) else v for v in p), sorted(upper + status[lo:hi])
+
+        # segments that continue past p, ordered by their direction after it
+        new = [s for s in status[lo:hi] if rights[s] != p] + upper
+        if len(new) > 1:
+            new.sort(key=cmp_to_key(lambda s, t: -orient(rights[s], rights[t], p)))
+        status[lo:hi] = new
+
+        if not new:
+            if 0 < lo < len(status):
+                schedule(status[lo - 1], status[lo], p)
+        else:
+            if lo > 0:
+                schedule(status[lo - 1], new[0], p)
+            end = lo + len(new)
+            if end < len(status):
+                schedule(new[-1], status[end], p)
+
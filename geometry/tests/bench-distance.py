@@ -0,0 +1,46 @@
+"""
+k-nearest neighbours with the KD-tree against the chunked brute force.
+
+For N random 2D points, the 5 nearest neighbours of M query points are found
+with KDTree.query and by reducing cdist_chunks block by block; neither builds
+the full M x N distance matrix. The points within radius R of every query
+point, from one batched KDTree.query_radius call, are checked the same way.
+"""
+import time
+
+import numpy as np
+
+from geometry.distance import KDTree, cdist_chunks
+
+N, M, K, R = 100000, 2000, 5, 0.005
+rs = np.random.RandomState(0)
+points = rs.rand(N, 2)
+queries = rs.rand(M, 2)
+
+t = time.perf_counter()
+tree = KDTree(points)
+build = time.perf_counter() - t
+
+t = time.perf_counter()
+dist, idx = tree.query(queries, K)
+query = time.perf_counter() - t
+
+t = time.perf_counter()
+within = tree.query_radius(queries, R)
+radius = time.perf_counter() - t
+
+t = time.perf_counter()
+brute = np.empty((M, K))
+brute_within = []
+for start, block in cdist_chunks(queries, points):
+    brute[start:start + len(block)] = np.sort(np.partition(block, K, axis=1)[:, :K], axis=1)
+    brute_within.extend(np.flatnonzero(row <= R).tolist() for row in block)
+scan = time.perf_counter() - t
+
+assert np.allclose(dist, brute)
+assert within == brute_within
+assert tree.query_radius(tuple(queries[0]), R) == within[0]
+print("KDTree build  %8.3f s" % build)
+print("KDTree query  %8.3f s  (%.1f us / point)" % (query, query / M * 1e6))
+print("KDTree radius %8.3f s  (%.1f us / point)" % (radius, radius / M * 1e6))
+print("chunked scan  %8.3f s" % scan)
@@ -0,0 +1,33 @@
+"""
+Micro-benchmark of point arithmetic.
+
+Every operation is timed twice: through the public ``Point(...)`` constructor
+(the path the arithmetic used before ``Point._trusted`` existed) and through
+the operator itself, which now builds its result with ``Point._trusted``.
+"""
+import timeit
+
+from geometry.point import Point
+
+p = Point(1.5, -2.25)
+q = Point(0.75, 4.0)
+p3 = Point(1.5, -2.25, 3.0)
+q3 = Point(0.75, 4.0, -1.0)
+
+NUMBER = 200000
+
+cases = [
+    ('Point2D + Point2D', lambda: Point([a + b for a, b in zip(p, q)]), lambda: p + q),
+    ('Point2D - Point2D', lambda: Point([a - b for a, b in zip(p, q)]), lambda: p - q),
+    ('Point2D * 3', lambda: Point([x * 3 for x in p.args]), lambda: p * 3),
+    ('-Point2D', lambda: Point([-x for x in p.args]), lambda: -p),
+    ('Point2D.midpoint', lambda: Point([(a + b) / 2 for a, b in zip(p, q)]), lambda: p.midpoint(q)),
+    ('Point3D + Point3D', lambda: Point([a + b for a, b in zip(p3, q3)]), lambda: p3 + q3),
+    ('Point3D - Point3D', lambda: Point([a - b for a, b in zip(p3, q3)]), lambda: p3 - q3),
+]
+
+print("{:<20} {:>12} {:>12} {:>8}".format('operation', 'Point() ns', 'trusted ns', 'speedup'))
+for name, slow, fast in cases:
+    t_slow = min(timeit.repeat(slow, number=NUMBER, repeat=5)) / NUMBER * 1e9
+    t_fast = min(timeit.repeat(fast, number=NUMBER, repeat=5)) / NUMBER * 1e9
+    print("{:<20} {:>12.1f} {:>12.1f} {:>7.2f}x".format(name, t_slow, t_fast, t_slow / t_fast))
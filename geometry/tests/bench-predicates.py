@@ -0,0 +1,58 @@
+"""
+Filter hit rates and timings of the adaptive predicates.
+
+For each input distribution, orient2d/orient3d/incircle are called on N
+triples (or quadruples) of points. The hit rate is the share of calls the
+float filter decided alone; the rest needed the exact stage.
+"""
+import math
+import random
+import timeit
+
+from geometry import predicates
+from geometry.predicates import incircle, orient2d, orient3d
+
+N = 20000
+random.seed(0)
+
+
+def rnd():
+    return random.uniform(-1, 1)
+
+
+def on_line():
+    a, b = (rnd(), rnd()), (rnd(), rnd())
+    t = rnd()
+    return a, b, (a[0] + t*(b[0] - a[0]), a[1] + t*(b[1] - a[1]))
+
+
+def on_plane():
+    a, b, c = [(rnd(), rnd(), rnd()) for _ in range(3)]
+    s, t = rnd(), rnd()
+    return a, b, c, tuple(a[k] + s*(b[k] - a[k]) + t*(c[k] - a[k]) for k in range(3))
+
+
+def on_circle():
+    t = [random.uniform(0, 6.283185307179586) for _ in range(4)]
+    return tuple((math.cos(a), math.sin(a)) for a in t)
+
+
+cases = [
+    ('orient2d random', orient2d, [((rnd(), rnd()), (rnd(), rnd()), (rnd(), rnd())) for _ in range(N)]),
+    ('orient2d integer grid', orient2d,
+     [tuple((random.randint(0, 9), random.randint(0, 9)) for _ in range(3)) for _ in range(N)]),
+    ('orient2d nearly collinear', orient2d, [on_line() for _ in range(N)]),
+    ('orient3d random', orient3d, [tuple((rnd(), rnd(), rnd()) for _ in range(4)) for _ in range(N)]),
+    ('orient3d nearly coplanar', orient3d, [on_plane() for _ in range(N)]),
+    ('incircle random', incircle, [tuple((rnd(), rnd()) for _ in range(4)) for _ in range(N)]),
+    ('incircle nearly cocircular', incircle, [on_circle() for _ in range(N)]),
+]
+
+print("{:<28} {:>10} {:>12}".format('input', 'hit rate', 'ns / call'))
+for name, func, args in cases:
+    predicates.reset_stats()
+    for a in args:
+        func(*a)
+    exact = predicates.stats[func.__name__]
+    t = min(timeit.repeat(lambda: [func(*a) for a in args], number=1, repeat=3)) / N * 1e9
+    print("{:<28} {:>9.2%} {:>12.1f}".format(name, 1 - exact / float(N), t))
@@ -0,0 +1,127 @@
+"""
+Boolean operations on polygons.
+
+Identical, nested, edge-sharing, touching, disjoint and clockwise inputs
+spelled out, then random star-shaped pairs on a coarse grid (so edges often
+overlap and vertices coincide). Holes come back as clockwise Polygons, so a
+point is in the result when the winding numbers of all the result rings
+around it add up to nonzero; that must match the operation applied to
+a.encloses_point and b.encloses_point, and the areas must add up.
+"""
+import math
+import random
+
+from geometry import boolean
+from geometry.polygon import Polygon
+
+OPS = {
+    'union': lambda a, b: a or b,
+    'intersection': lambda a, b: a and b,
+    'difference': lambda a, b: a and not b,
+    'symmetric_difference': lambda a, b: a != b,
+}
+
+
+def area(result):
+    return sum(p.area for p in result)
+
+
+def inside(result, p):
+    return sum(r.winding_number(p) or 0 for r in result) != 0
+
+
+def square(x, y, size):
+    return Polygon((x, y), (x + size, y), (x + size, y + size), (x, y + size))
+
+
+def check(a, b, samples=200):
+    results = dict((op, boolean.overlay(a, b, op)) for op in OPS)
+    ia, ib = abs(a.area), abs(b.area)
+    i = area(results['intersection'])
+    assert abs(i - boolean.intersection_area(a, b)) <= 1e-9 * (ia + ib)
+    assert abs(area(results['union']) - (ia + ib - i)) <= 1e-9 * (ia + ib)
+    assert abs(area(results['difference']) - (ia - i)) <= 1e-9 * (ia + ib)
+    assert abs(area(results['symmetric_difference']) - (ia + ib - 2 * i)) <= 1e-9 * (ia + ib)
+    xmin = min(a.bounds[0], b.bounds[0]) - 1
+    ymin = min(a.bounds[1], b.bounds[1]) - 1
+    xmax = max(a.bounds[2], b.bounds[2]) + 1
+    ymax = max(a.bounds[3], b.bounds[3]) + 1
+    for _ in range(samples):
+        p = (random.uniform(xmin, xmax), random.uniform(ymin, ymax))
+        if a.winding_number(p) is None or b.winding_number(p) is None:
+            continue
+        for op, result in results.items():
+            assert inside(result, p) == OPS[op](a.encloses_point(p), b.encloses_point(p)), (op, a, b, p)
+    return results
+
+
+random.seed(0)
+a = square(0, 0, 4)
+
+# identical
+r = check(a, square(0, 0, 4))
+assert r['union'] == [a] and r['intersection'] == [a]
+assert r['difference'] == [] and r['symmetric_difference'] == []
+
+# nested: the difference is the outer ring and a clockwise hole
+b = square(1, 1, 2)
+r = check(a, b)
+assert r['union'] == [a] and r['intersection'] == [b]
+hole = [p for p in r['difference'] if p.area < 0]
+assert len(r['difference']) == 2 and len(hole) == 1
+assert hole[0].area == -b.area and hole[0] == b
+assert sorted(p.area for p in r['symmetric_difference']) == [-4, 16]
+assert check(b, a)['difference'] == []
+
+# sharing an edge, part of an edge, or a single vertex
+r = check(a, square(4, 0, 4))
+assert r['union'] == [Polygon((0, 0), (8, 0), (8, 4), (0, 4))]
+assert r['intersection'] == [] and r['difference'] == [a]
+r = check(a, square(4, 1, 2))
+assert len(r['union']) == 1 and r['union'][0].area == 20
+r = check(a, square(4, 4, 4))
+assert len(r['union']) == 2 and r['intersection'] == []
+
+# disjoint
+r = check(a, square(10, 10, 1))
+assert len(r['union']) == 2 and r['intersection'] == [] and r['difference'] == [a]
+
+# clockwise inputs describe the same regions, results stay counterclockwise
+cw = Polygon(*reversed(a.args))
+cb = Polygon(*reversed(b.args))
+assert cw.area < 0
+r = check(cw, cb)
+assert r['union'] == [a] and r['intersection'] == [b]
+assert sorted(p.area for p in r['difference']) == [-4, 16]
+assert all(p.area > 0 for p in check(cw, square(2, 2, 4))['union'])
+
+
+def star(cx, cy):
+    angles = sorted(random.uniform(0, 2 * math.pi) for _ in range(random.randint(3, 10)))
+    ring = [(round(cx + r * math.cos(t)), round(cy + r * math.sin(t)))
+            for t, r in ((t, random.uniform(2, 6)) for t in angles)]
+    if random.random() < 0.3:
+        ring.reverse()
+    return Polygon(*ring)
+
+
+pairs = 0
+while pairs < 300:
+    a = star(random.randint(0, 4), random.randint(0, 4))
+    b = star(random.randint(0, 4), random.randint(0, 4))
+    if not (isinstance(a, Polygon) and isinstance(b, Polygon)) or not (a.is_simple() and b.is_simple()):
+        continue
+    check(a, b, samples=50)
+    pairs += 1
+
+# clip against the intersection with the rectangle
+for _ in range(200):
+    a = star(0, 0)
+    if not isinstance(a, Polygon) or not a.is_convex():
+        continue
+    box = (random.uniform(-6, 0), random.uniform(-6, 0), random.uniform(0, 6), random.uniform(0, 6))
+    clipped = boolean.clip(a, box)
+    rect = Polygon((box[0], box[1]), (box[2], box[1]), (box[2], box[3]), (box[0], box[3]))
+    expected = boolean.intersection_area(a, rect)
+    assert abs((abs(clipped.area) if clipped is not None else 0) - expected) <= 1e-9 * abs(a.area)
+print(pairs, 'pairs ok')
@@ -0,0 +1,50 @@
+"""
+The intersection cache returns what Polygon.intersection computes.
+
+Random pairs of polygons sharing vertices and edges, intersected with the
+cache on and off, and the same pair under different tolerances: a result
+cached under one tolerance must not be returned under another.
+"""
+import random
+
+from geometry import cache
+from geometry.polygon import Polygon
+from geometry.tolerance import tolerance
+
+
+def key(result):
+    return sorted(map(repr, result))
+
+
+# a point 1.5e-10 off the shared stretch of the bottom edges is merged into it
+# within abs=1e-9, and kept exactly
+a = Polygon((0, 0), (4, 0), (4, 4), (0, 4))
+b = Polygon((1, 0), (5, 0), (5, 2e-10))
+exact = a.intersection(b)
+with tolerance(abs=1e-9):
+    tolerant = a.intersection(b)
+assert len(exact) == 2 and len(tolerant) == 1
+
+c = cache.enable_intersection_cache(64)
+try:
+    for _ in range(2):
+        assert key(a.intersection(b)) == key(exact)
+        with tolerance(abs=1e-9):
+            assert key(a.intersection(b)) == key(tolerant)
+        assert key(b.intersection(a)) == key(exact)
+    assert c.stats()['hits'] == 4 and c.stats()['misses'] == 2
+
+    random.seed(0)
+    grid = [(x, y) for x in range(4) for y in range(4)]
+    for _ in range(300):
+        p = Polygon(*random.sample(grid, 3))
+        q = Polygon(*random.sample(grid, 3))
+        if not (isinstance(p, Polygon) and isinstance(q, Polygon)):
+            continue
+        cached = [key(p.intersection(q)) for _ in range(2)]
+        cache.disable_intersection_cache()
+        assert cached == [key(p.intersection(q))] * 2
+        c = cache.enable_intersection_cache(64)
+finally:
+    cache.disable_intersection_cache()
+print('ok')
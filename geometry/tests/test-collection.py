@@ -0,0 +1,49 @@
+"""
+PolygonCollection against the Polygons it was built from.
+
+Random star-shaped polygons, both orientations, far from the origin: area,
+perimeter, bounds, orientation and moments of the collection must agree with
+Polygon.area, perimeter, bounds and second_moment_of_area.
+"""
+import math
+import random
+
+from geometry.collection import PolygonCollection
+from geometry.polygon import Polygon
+
+random.seed(0)
+polygons = []
+while len(polygons) < 500:
+    angles = sorted(random.uniform(0, 2 * math.pi) for _ in range(random.randint(3, 20)))
+    cx, cy = random.uniform(-1e6, 1e6), random.uniform(-1e6, 1e6)
+    ring = [(cx + r * math.cos(a), cy + r * math.sin(a))
+            for a, r in ((a, random.uniform(1, 5)) for a in angles)]
+    if random.random() < 0.5:
+        ring.reverse()
+    pg = Polygon(*ring)
+    if isinstance(pg, Polygon):
+        polygons.append(pg)
+
+pc = PolygonCollection.from_polygons(polygons)
+area, cx, cy, ixx, iyy, ixy = pc.moments()
+
+
+def rel(a, b):
+    return float(abs(a - b) / max(abs(b), 1e-300))
+
+
+worst = {'area': 0, 'perimeter': 0, 'bounds': 0, 'centroid': 0, 'moments': 0}
+for k, pg in enumerate(polygons):
+    worst['area'] = max(worst['area'], rel(pc.area[k], pg.area), rel(area[k], pg.area))
+    worst['perimeter'] = max(worst['perimeter'], rel(pc.perimeter[k], pg.perimeter))
+    worst['bounds'] = max([worst['bounds']] + [float(abs(a - b)) for a, b in zip(pc.bounds[k].tolist(), pg.bounds)])
+    c = pg.centroid
+    worst['centroid'] = max(worst['centroid'], float(abs(cx[k] - c.x)), float(abs(cy[k] - c.y)))
+    worst['moments'] = max([worst['moments']] + [rel(a, b) for a, b in zip((ixx[k], iyy[k], ixy[k]),
+                                                                          pg.second_moment_of_area())])
+    assert pc.orientation[k] == (1 if pg.area > 0 else -1)
+    assert pc[k] == pg
+
+print(worst)
+assert worst['area'] < 1e-12 and worst['perimeter'] < 1e-12 and worst['bounds'] == 0
+assert worst['centroid'] < 1e-6 and worst['moments'] < 1e-6
@@ -0,0 +1,118 @@
+"""
+Delaunay triangulations and their Voronoi diagrams.
+
+Random points, an integer grid and exactly cocircular points (where the
+triangulation isn't unique), repeated and collinear points. Every triangle
+must be counterclockwise with no point strictly inside its circumcircle
+(exact incircle), the neighbours must agree, and the counts must match
+Euler's formula for the hull. The Voronoi diagram must be the dual: its
+vertices equidistant from their triangle's points, each finite ridge on the
+bisector of its edge, and each bounded cell holding the points nearest to
+its site.
+"""
+import random
+
+import numpy as np
+
+from geometry.delaunay import Delaunay
+from geometry.hull import convex_hull
+from geometry.predicates import incircle, orient2d
+
+
+def check(points):
+    d = Delaunay(points)
+    pts = [tuple(p) for p in d.points.tolist()]
+    distinct = len(set(pts))
+    tri, nbr = d.triangles.tolist(), d.neighbors.tolist()
+    used = set()
+    for t, (a, b, c) in enumerate(tri):
+        assert orient2d(pts[a], pts[b], pts[c]) > 0
+        used.update((a, b, c))
+        for q in set(pts) - {pts[a], pts[b], pts[c]}:
+            assert incircle(pts[a], pts[b], pts[c], q) <= 0, (tri[t], q)
+        for k in range(3):
+            s = nbr[t][k]
+            if s >= 0:
+                assert t in nbr[s] and {tri[t][(k + 1) % 3], tri[t][(k + 2) % 3]} < set(tri[s])
+    # every distinct point is a vertex once; copies of a point are not
+    assert len(used) == distinct == len(set(pts[i] for i in used))
+    hull = d.convex_hull.tolist()
+    h = len(hull)
+    assert len(tri) == 2 * distinct - 2 - h and len(d.edges) == 3 * distinct - 3 - h
+    corners = set(p.args for p in convex_hull(pts).args)
+    assert corners <= set(pts[i] for i in hull)
+    for k in range(h):
+        assert orient2d(pts[hull[k - 1]], pts[hull[k]], pts[hull[(k + 1) % h]]) >= 0
+    return d
+
+
+def check_voronoi(d, samples=300):
+    v = d.voronoi()
+    pts = d.points
+    tri = d.triangles
+    for t in range(len(tri)):
+        r = np.hypot(*(pts[tri[t]] - v.vertices[t]).T)
+        assert np.ptp(r) <= 1e-9 * r.max()
+    for (i, j), (s, t) in zip(v.ridge_points.tolist(), v.ridge_vertices.tolist()):
+        for k in (s, t):
+            if k >= 0:
+                di, dj = np.hypot(*(v.vertices[k] - pts[i])), np.hypot(*(v.vertices[k] - pts[j]))
+                assert abs(di - dj) <= 1e-9 * max(di, dj)
+    assert len(v.ridge_points) == len(d.edges)
+    lo, hi = pts.min(axis=0), pts.max(axis=0)
+    cells = [v.cell(i) for i in range(len(pts))]
+    for q in np.random.default_rng(0).uniform(lo, hi, size=(samples, 2)).tolist():
+        dist = np.hypot(*(pts - q).T)
+        i = int(np.argmin(dist))
+        if cells[i] is None or np.sort(dist)[1] - dist[i] < 1e-9:
+            continue
+        assert cells[i].encloses_point(q)
+        assert not any(c is not None and c.encloses_point(q) for k, c in enumerate(cells) if k != i)
+    return v
+
+
+random.seed(0)
+for n in (3, 10, 100, 400):
+    pts = [(random.uniform(-1, 1), random.uniform(-1, 1)) for _ in range(n)]
+    check_voronoi(check(pts))
+    # inserting in batches gives the same triangulation
+    d = Delaunay(pts[:n // 3])
+    d.insert(pts[n // 3:2 * n // 3])
+    d.insert(np.array(pts[2 * n // 3:]))
+    assert sorted(map(sorted, d.triangles.tolist())) == sorted(map(sorted, Delaunay(pts).triangles.tolist()))
+
+# an integer grid: every square is cocircular, both diagonals are Delaunay
+grid = [(x, y) for x in range(8) for y in range(6)]
+random.shuffle(grid)
+d = check(grid)
+assert len(d.triangles) == 2 * 7 * 5
+assert all(abs(d.triangle(k).area) == 0.5 for k in range(len(d.triangles)))
+check_voronoi(d)
+
+# twelve exactly cocircular points, with the centre and without
+circle = [(x, y) for x in range(-5, 6) for y in range(-5, 6) if x * x + y * y == 25]
+assert len(circle) == 12
+assert len(check(circle).triangles) == 10
+assert len(check(circle + [(0, 0)]).triangles) == 12
+check_voronoi(check(circle + [(0, 0)]))
+
+# repeated points
+pts = [(random.randint(0, 5), random.randint(0, 5)) for _ in range(100)]
+d = check(pts)
+assert len(d.triangles) == len(Delaunay(sorted(set(pts))).triangles)
+
+# collinear points: no triangles, the edges join neighbours along the line
+for pts in ([(0, 0), (3, 3), (1, 1), (2, 2), (1, 1)], [(0, 5), (0, 1), (0, 3)], [(2, 2)] * 4):
+    d = Delaunay(pts)
+    line = sorted(set(pts))
+    assert d.triangles.shape == (0, 3) and d.neighbors.shape == (0, 3)
+    # which copy of a repeated point is used depends on the insertion order
+    assert [sorted((pts[i], pts[j])) for i, j in d.edges.tolist()] == [[p, q] for p, q in zip(line, line[1:])]
+    assert [pts[i] for i in d.convex_hull.tolist()] == [line[0], line[-1]][:len(line)]
+    v = d.voronoi()
+    assert len(v.vertices) == 0 and (v.ridge_vertices == -1).all()
+    assert v.ridge_points.tolist() == d.edges.tolist()
+    # one more point off the line makes it a triangulation
+    d.insert([(-1, 7)])
+    assert len(d.triangles) == max(len(line) - 1, 0)
+print('ok')
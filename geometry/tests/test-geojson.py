@@ -0,0 +1,78 @@
+"""
+GeoJSON round trips, whole and streamed.
+
+Random entities of every kind are written with dump as a FeatureCollection
+and read back with loads and with iter_load at chunk sizes that cut strings,
+numbers and brackets at every possible place, with and without properties;
+newline-delimited input and single geometries are streamed too.
+"""
+import io
+import json
+import math
+import random
+
+from geometry import geojson
+from geometry.line import Line, Segment
+from geometry.point import Point
+from geometry.polygon import Polygon
+
+random.seed(0)
+
+
+def coord():
+    return random.choice((random.randint(-9, 9), random.uniform(-1e6, 1e6), random.uniform(-1, 1) * 1e-300))
+
+
+def entity(depth=0):
+    kind = random.randrange(5 if depth < 2 else 4)
+    if kind == 0:
+        return Point(coord(), coord())
+    if kind == 1:
+        return Point(coord(), coord(), coord())
+    if kind == 2:
+        return Segment(Point(coord(), coord()), Point(coord(), coord()))
+    if kind == 3:
+        cx, cy = coord(), coord()
+        angles = sorted(random.uniform(0, 2 * math.pi) for _ in range(random.randint(3, 12)))
+        pg = Polygon(*[(cx + math.cos(a), cy + math.sin(a)) for a in angles])
+        return pg if isinstance(pg, Polygon) else entity(depth)
+    return [entity(depth + 1) for _ in range(random.randrange(4))]
+
+
+entities = [entity() for _ in range(300)]
+props = [{'id': i, 'name': 'feature "%d" ]}' % i} for i in range(len(entities))]
+for e in entities:
+    assert geojson.loads(geojson.dumps(e)) == e, e
+
+out = io.StringIO()
+assert geojson.dump(entities, out, props) == len(entities)
+text = out.getvalue()
+assert geojson.loads(text) == entities
+for chunk_size in (1, 2, 3, 7, 64, 4096, geojson.CHUNK_SIZE):
+    assert list(geojson.iter_load(io.StringIO(text), chunk_size=chunk_size)) == entities, chunk_size
+    pairs = list(geojson.iter_load(io.StringIO(text), properties=True, chunk_size=chunk_size))
+    assert pairs == list(zip(entities, props))
+
+# newline-delimited features with record separators, a bare geometry, a
+# feature without geometry, and members before and after "features"
+lines = ''.join('\x1e' + json.dumps({'type': 'Feature', 'geometry': geojson.to_geometry(e)}) + '\n'
+                for e in entities[:50])
+collection = json.dumps({'bbox': [0, 0, 1, 1], 'type': 'FeatureCollection', 'features': [
+    {'type': 'Feature', 'geometry': None, 'properties': None},
+    {'type': 'Feature', 'geometry': {'type': 'LineString', 'coordinates': [[0, 0], [1, 1]]}}],
+    'crs': None}, indent=2)
+for chunk_size in (1, 7, 64, 4096):
+    assert list(geojson.iter_load(io.StringIO(lines), chunk_size=chunk_size)) == entities[:50]
+    assert list(geojson.iter_load(io.StringIO(geojson.dumps(entities[0])), chunk_size=chunk_size)) == entities[:1]
+    got = list(geojson.iter_load(io.StringIO(collection), linear=Line, chunk_size=chunk_size))
+    assert got == [None, Line(Point(0, 0), Point(1, 1))], got
+
+for bad in ('{"type": "Circle", "coordinates": [0, 0]}',
+            '{"type": "LineString", "coordinates": [[0, 0], [1, 1], [2, 2]]}'):
+    try:
+        geojson.loads(bad)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(bad)
+print(len(entities), 'entities ok')
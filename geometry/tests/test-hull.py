@@ -0,0 +1,74 @@
+"""
+3D convex hulls checked exactly.
+
+Random subsets of a small integer grid (many coplanar and collinear points),
+points on the faces of a cube and random clouds: every input point must be
+on or behind every face (orient3d), the faces must close up into a surface
+(each edge used once in each direction, V - E + F = 2), and every vertex
+must be a corner, no face may be flat, i.e. its faces lie in at least 3 different planes.
+"""
+import itertools
+import random
+from fractions import Fraction
+
+import numpy as np
+
+from geometry.hull import convex_hull_3d
+from geometry.predicates import orient3d
+
+
+def check(points, prefilter=True):
+    vertices, faces = convex_hull_3d(points, prefilter)
+    v = [tuple(p.args) for p in vertices]
+    directed = [(f[i], f[(i + 1) % 3]) for f in faces for i in range(3)]
+    assert len(set(directed)) == len(directed)
+    assert all((b, a) in set(directed) for a, b in directed)
+    assert len(v) - len(directed) // 2 + len(faces) == 2
+    for f in faces:
+        a, b, c = (v[i] for i in f)
+        u = [Fraction(q) - Fraction(p) for p, q in zip(a, b)]
+        w = [Fraction(q) - Fraction(p) for p, q in zip(a, c)]
+        assert (u[1]*w[2] - u[2]*w[1], u[2]*w[0] - u[0]*w[2], u[0]*w[1] - u[1]*w[0]) != (0, 0, 0)
+        assert all(orient3d(a, b, c, p) >= 0 for p in map(tuple, np.asarray(points, dtype=float).tolist()))
+    for i in range(len(v)):
+        around = [f for f in faces if i in f]
+        planes = []
+        for f in around:
+            a, b, c = (v[j] for j in f)
+            if not any(all(orient3d(a, b, c, v[j]) == 0 for j in g) for g in planes):
+                planes.append(f)
+        assert len(planes) >= 3, v[i]
+    return len(v), len(faces)
+
+
+grid = list(itertools.product(range(5), repeat=3))
+assert check(grid) == (8, 12)
+assert check(grid, prefilter=False) == (8, 12)
+
+random.seed(0)
+for _ in range(100):
+    pts = random.sample(grid, random.randint(8, 60))
+    try:
+        counts = check(pts)
+    except ValueError:
+        # a flat sample
+        continue
+    assert check(pts, prefilter=False) == counts
+
+# points on the faces of the unit cube, plus its corners
+rng = np.random.default_rng(0)
+pts = rng.uniform(size=(2000, 3))
+axis = rng.integers(0, 3, 2000)
+pts[np.arange(2000), axis] = rng.integers(0, 2, 2000)
+pts = np.vstack((pts, list(itertools.product((0, 1), repeat=3))))
+assert check(pts) == (8, 12)
+
+for pts in (rng.normal(size=(3000, 3)), rng.uniform(-1e6, 1e6, size=(3000, 3))):
+    print(check(pts))
+
+try:
+    convex_hull_3d([(x, y, 0) for x, y in itertools.product(range(4), repeat=2)])
+except ValueError:
+    pass
+else:
+    raise AssertionError("a flat hull")
@@ -0,0 +1,89 @@
+"""
+STRtree queries against a linear scan, and save/load round trips.
+
+Random points, segments and polygons (some of them prepared): window,
+nearest and containing queries must match testing every entity, before and
+after the tree goes through a file.
+"""
+import math
+import os
+import random
+import tempfile
+
+from geometry.index import STRtree
+from geometry.line import Segment
+from geometry.point import Point
+from geometry.polygon import Polygon, Triangle
+from geometry.prepared import PreparedPolygon
+
+random.seed(0)
+
+
+def star(cx, cy):
+    angles = sorted(random.uniform(0, 2 * math.pi) for _ in range(random.randint(3, 12)))
+    return Polygon(*[(cx + r * math.cos(a), cy + r * math.sin(a))
+                     for a, r in ((a, random.uniform(0.5, 3)) for a in angles)])
+
+
+entities = []
+for _ in range(300):
+    x, y = random.uniform(0, 100), random.uniform(0, 100)
+    kind = random.randrange(5)
+    if kind == 0:
+        entities.append(Point(x, y))
+    elif kind == 1:
+        entities.append(Segment(Point(x, y), Point(x + random.uniform(-3, 3), y + random.uniform(-3, 3))))
+    elif kind == 2:
+        entities.append(Triangle((x, y), (x + 2, y), (x, y + 2)))
+    elif kind == 3:
+        entities.append(star(x, y))
+    else:
+        entities.append(PreparedPolygon(star(x, y)))
+
+
+def overlaps(b, w):
+    return b[0] <= w[2] and b[2] >= w[0] and b[1] <= w[3] and b[3] >= w[1]
+
+
+def check(tree):
+    for _ in range(200):
+        x, y = random.uniform(-5, 105), random.uniform(-5, 105)
+        w = (x, y, x + random.uniform(0, 10), y + random.uniform(0, 10))
+        assert tree.query(w) == [i for i, e in enumerate(entities) if overlaps(e.bounds, w)]
+        p = Point(x, y)
+        assert tree.containing(p) == [i for i, e in enumerate(entities)
+                                      if hasattr(e, 'encloses_point') and e.encloses_point(p)]
+        d = sorted(e.distance(p) for e in entities)
+        got = [entities[i].distance(p) for i in tree.nearest(p, k=5)]
+        assert got == d[:5], (got, d[:5])
+
+
+tree = STRtree(entities, node_capacity=4)
+check(tree)
+
+path = os.path.join(tempfile.mkdtemp(), 'tree.str')
+tree.save(path)
+loaded = STRtree.load(path)
+assert loaded._root == tree._root and loaded.node_capacity == 4
+for a, b in zip(loaded.entities, entities):
+    assert type(a) is type(b)
+    if isinstance(a, PreparedPolygon):
+        assert a.polygon == b.polygon and a.bands == b.bands
+    else:
+        assert a == b
+check(loaded)
+
+# empty trees, and files that aren't STRtree files
+STRtree([]).save(path)
+assert STRtree.load(path).query((0, 0, 1, 1)) == []
+data = open(path, 'rb').read()
+for bad in (b'', b'PK\x03\x04' + data[4:], data + b'\x00'):
+    with open(path, 'wb') as f:
+        f.write(bad)
+    try:
+        STRtree.load(path)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(bad)
+print('ok')
@@ -4,7 +4,7 @@ import sympy.geometry.point
 import sympy.geometry.line
 import time
 
-t0 = time.clock()
+t0 = time.perf_counter()
 
 p1_my = Point(1, 0)
 p2_my = Point(0, 1)
@@ -84,7 +84,7 @@ s2 = Segment(p3_my, p4_my)
 
 # ---------------Ray End --------------#
 
-t1 = time.clock()
+t1 = time.perf_counter()
 
 # print(t1 - t0)
 
@@ -115,7 +115,7 @@ t1 = time.clock()
 # print(l1_sys)
 # print(l2_sys)
 #
-# t2 = time.clock()
+# t2 = time.perf_counter()
 #
 # print(t2 - t1)
 #
@@ -11,7 +11,7 @@ p6_my = Point(1, 2, 4)
 p7_my = Point(1, 3, 5)
 p1_sym = sympy.geometry.point.Point(1, 2)
 
-start_time = time.clock()
+start_time = time.perf_counter()
 
 # ----- 测试点 pass------------ #
 
@@ -32,7 +32,7 @@ start_time = time.clock()
 # print(p2_my.dot(p1_my))
 print(p5_my.is_collinear(p6_my, p7_my))
 
-end_time1 = time.clock()
+end_time1 = time.perf_counter()
 
 # ------------------------------#
 
@@ -41,7 +41,7 @@ end_time1 = time.clock()
 # print(p1_my.unit)
 # print(p1_sym.rotate(90))
 
-# end_time2 = time.clock()
+# end_time2 = time.perf_counter()
 # ----------------------------- #
 # print(end_time1 - start_time)
 # print(end_time2 - end_time1)
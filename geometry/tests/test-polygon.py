@@ -5,7 +5,7 @@ import sympy.geometry.point
 import sympy.geometry.polygon
 
 import time
-start_time = time.clock()
+start_time = time.perf_counter()
 
 p1_my = Point(1, 0)
 p2_my = Point(0, 0)
@@ -35,7 +35,7 @@ poly2 = Polygon(p1_my, p2_my, p3_my, p6_my)
 # print(poly1.intersection(poly2))
 print(poly1.centroid)
 
-end_time = time.clock()
+end_time = time.perf_counter()
 
 # print(end_time - start_time)
 
@@ -0,0 +1,56 @@
+"""
+PolygonStore and its views against the Polygons written to it.
+
+Random polygons go to a store file; every view must give the bounds, area
+and point-in-polygon answers of its Polygon, delegate the rest to it, and
+survive copy, deepcopy and pickle.
+"""
+import copy
+import math
+import os
+import pickle
+import random
+import tempfile
+
+import numpy as np
+
+from geometry.polygon import Polygon
+from geometry.store import PolygonStore, PolygonView
+
+random.seed(0)
+polygons = []
+while len(polygons) < 200:
+    cx, cy = random.uniform(0, 100), random.uniform(0, 100)
+    angles = sorted(random.uniform(0, 2 * math.pi) for _ in range(random.randint(3, 15)))
+    pg = Polygon(*[(cx + r * math.cos(a), cy + r * math.sin(a))
+                   for a, r in ((a, random.uniform(1, 5)) for a in angles)])
+    if isinstance(pg, Polygon):
+        polygons.append(pg)
+
+path = os.path.join(tempfile.mkdtemp(), 'polygons.store')
+assert PolygonStore.write(path, polygons) == len(polygons)
+store = PolygonStore(path)
+assert len(store) == len(polygons)
+
+points = np.random.default_rng(0).uniform(-5, 105, size=(500, 2))
+for view, pg in zip(store, polygons):
+    assert view.bounds == pg.bounds
+    assert abs(view.area - pg.area) <= 1e-12 * abs(pg.area)
+    assert view.encloses_points(points).tolist() == [pg.encloses_point(tuple(p)) for p in points.tolist()]
+    assert view.perimeter == pg.perimeter and view.vertices == pg.vertices
+    for other in (copy.copy(view), copy.deepcopy(view), pickle.loads(pickle.dumps(view))):
+        assert isinstance(other, PolygonView) and other.index == view.index
+        assert other.coords.tolist() == view.coords.tolist() and other.polygon == pg
+
+for name in ('_polygon', '__deepcopy__', 'store', 'no_such_attribute'):
+    try:
+        getattr(PolygonView.__new__(PolygonView), name)
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError(name)
+
+again = pickle.loads(pickle.dumps(store))
+assert again.path == path and (again.coords == store.coords).all()
+assert store.containing((50, 50)) == [i for i, pg in enumerate(polygons) if pg.encloses_point((50, 50))]
+print('ok')
@@ -0,0 +1,73 @@
+"""
+sweep_intersections against testing every pair of segments.
+
+Segments on a small integer grid, so that many are collinear, overlap, touch
+at an endpoint or cross at a vertex of a third, plus random float segments.
+The brute force works in exact Fractions: every crossing, touching endpoint
+and end of a collinear overlap, with all the segments through it, must be
+reported by the sweep, and nothing else. Crossings are compared rounded to floats, as the sweep
+reports them.
+"""
+import itertools
+import random
+from fractions import Fraction
+
+from geometry.sweep import sweep_intersections
+
+
+def orient(a, b, c):
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def on_segment(p, s):
+    a, b = s
+    return (orient(a, b, p) == 0 and min(a[0], b[0]) <= p[0] <= max(a[0], b[0])
+            and min(a[1], b[1]) <= p[1] <= max(a[1], b[1]))
+
+
+def meetings(s, t):
+    """The points where segments s and t meet; both ends for an overlap"""
+    (a, b), (c, d) = s, t
+    den = (b[0] - a[0]) * (d[1] - c[1]) - (b[1] - a[1]) * (d[0] - c[0])
+    if den:
+        u = orient(a, c, d) / den
+        p = (a[0] + u * (b[0] - a[0]), a[1] + u * (b[1] - a[1]))
+        return [p] if on_segment(p, s) and on_segment(p, t) else []
+    return [p for p in (a, b, c, d) if on_segment(p, s) and on_segment(p, t)]
+
+
+def brute(segments):
+    """{point rounded to floats: ids of the segments through it}"""
+    exact = [tuple(tuple(Fraction(v) for v in p) for p in s) for s in segments]
+    ids = [i for i, s in enumerate(exact) if s[0] != s[1]]
+    found = set()
+    for i, j in itertools.combinations(ids, 2):
+        found.update(meetings(exact[i], exact[j]))
+    return {tuple(map(float, p)): tuple(i for i in ids if on_segment(p, exact[i])) for p in found}
+
+
+def check(segments):
+    expected = brute(segments)
+    got = {tuple(map(float, p)): tuple(ids) for p, ids in sweep_intersections(segments)}
+    assert got == expected, (segments, got, expected)
+    return len(got)
+
+
+random.seed(0)
+points = 0
+for _ in range(500):
+    segments = [tuple((random.randint(0, 6), random.randint(0, 6)) for _ in range(2))
+                for _ in range(random.randint(2, 12))]
+    points += check(segments)
+
+# touching and collinear configurations spelled out
+points += check([((0, 0), (4, 0)), ((2, 0), (6, 0)), ((4, 0), (4, 3)), ((0, 0), (0, 3))])
+points += check([((0, 0), (2, 2)), ((2, 2), (4, 0)), ((1, 1), (3, 3)), ((0, 2), (4, 2))])
+points += check([((0, 0), (0, 5)), ((0, 1), (0, 2)), ((0, 2), (0, 4)), ((-1, 3), (1, 3))])
+
+# random float segments, crossings rounded to the nearest float
+for _ in range(100):
+    segments = [tuple((random.uniform(0, 1), random.uniform(0, 1)) for _ in range(2)) for _ in range(20)]
+    points += check(segments)
+
+print('points checked', points)
@@ -0,0 +1,120 @@
+"""
+Polygon triangulation with every method.
+
+Random star-shaped polygons of both orientations, combs with many vertices
+at the same height, and stars snapped to a coarse grid. Every triangulation
+must have n - 2 counterclockwise triangles (exact orient2d) whose areas add
+up to the polygon's, using each side of the polygon once and each diagonal
+once from either side. 'auto' must pick ear clipping or the monotone partition by the
+number of reflex vertices, and fall back to ear clipping with a warning, or
+raise above FALLBACK_MAX, when the partition fails.
+"""
+import math
+import random
+import warnings
+
+from geometry import triangulate as T
+from geometry.polygon import Polygon
+from geometry.predicates import orient2d
+
+
+def check(pg, tri):
+    args = [p.args for p in pg.args]
+    n = len(args)
+    assert len(tri) == 3 * (n - 2)
+    total = 0
+    edges = []
+    for k in range(0, len(tri), 3):
+        a, b, c = (args[i] for i in tri[k:k + 3])
+        assert orient2d(a, b, c) > 0
+        total += ((b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])) / 2
+        edges += [(tri[k], tri[k + 1]), (tri[k + 1], tri[k + 2]), (tri[k + 2], tri[k])]
+    assert abs(total - abs(pg.area)) <= 1e-9 * abs(pg.area)
+    assert len(set(edges)) == len(edges)
+    step = 1 if pg.area > 0 else -1
+    sides = set((i, (i + step) % n) for i in range(n))
+    assert all(e in sides or (e[1], e[0]) in edges for e in edges)
+    assert sides <= set(edges)
+
+
+def star(n):
+    angles = sorted(random.uniform(0, 2 * math.pi) for _ in range(n))
+    ring = [(r * math.cos(a), r * math.sin(a)) for a, r in ((a, random.uniform(0.5, 1)) for a in angles)]
+    if random.random() < 0.5:
+        ring.reverse()
+    return Polygon(*ring, validate=False)
+
+
+def comb(k):
+    ring = [(0, 0), (2 * k, 0)]
+    for i in reversed(range(k)):
+        ring += [(2 * i + 2, 3), (2 * i + 1, 1)]
+    return Polygon(*ring + [(0, 3)])
+
+
+def snapped(n, scale):
+    """A star on the integer grid, so many vertices share a height"""
+    pg = star(n)
+    return Polygon(*[(round(x * scale), round(y * scale)) for x, y in (p.args for p in pg.args)])
+
+
+random.seed(0)
+polygons = [star(n) for n in (3, 4, 5, 10, 30, 100, 300) for _ in range(5)]
+polygons += [comb(k) for k in (1, 2, 5, 20, 60)]
+polygons += [Polygon(*reversed(comb(7).args))]
+while len(polygons) < 80:
+    pg = snapped(random.choice((8, 20, 60)), random.choice((5, 20)))
+    if isinstance(pg, Polygon) and len(pg.args) > 3 and pg.is_simple():
+        polygons.append(pg)
+for pg in polygons:
+    reflex = len(T._reflex([p.args for p in (pg.args if pg.area > 0 else reversed(pg.args))]))
+    for method in T.METHODS:
+        check(pg, T.triangulate(pg, method))
+    expected = 'earclip' if reflex <= T.EARCLIP_MAX_REFLEX else 'monotone'
+    assert T.triangulate(pg) == T.triangulate(pg, expected)
+    tris = pg.triangulate(triangles=True)
+    assert len(tris) == len(pg.args) - 2 and all(t.area > 0 for t in tris)
+assert T.triangulate(comb(60)) == T.triangulate(comb(60), 'monotone')
+
+# a failing partition: 'auto' ear clips with a warning up to FALLBACK_MAX
+# vertices and raises above it; 'monotone' always raises
+diagonals = T._diagonals
+
+
+def fail(pts):
+    raise T._Degenerate()
+
+
+T._diagonals = fail
+try:
+    pg = comb(40)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        tri = pg.triangulate()
+    assert [w.category for w in caught] == [RuntimeWarning]
+    assert tri == T.triangulate(pg, 'earclip')
+    check(pg, tri)
+    for pg, method in ((comb(40), 'monotone'), (star(T.FALLBACK_MAX + 1), 'auto')):
+        try:
+            T.triangulate(pg, method)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(method)
+finally:
+    T._diagonals = diagonals
+
+for bad in (Polygon((0, 0, 0), (1, 0, 0), (0, 1, 0)),):
+    try:
+        T.triangulate(bad)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(bad)
+try:
+    T.triangulate(comb(3), 'fan')
+except ValueError:
+    pass
+else:
+    raise AssertionError('fan')
+print(len(polygons), 'polygons ok')
@@ -0,0 +1,84 @@
+"""
+Point in polygon for points next to the boundary.
+
+Random triangles at scales 1, 1e3 and 1e6, with query points a few ulps off
+an edge (and exactly on it, at vertices and along horizontal edges). Whether
+a point is enclosed, on the boundary or outside is decided exactly with
+orient2d, and Polygon, PreparedPolygon (single and vectorized) and
+PolygonStore must all agree with it, and with Segment.contains.
+"""
+import math
+import os
+import random
+import tempfile
+
+import numpy as np
+
+from geometry.point import Point
+from geometry.polygon import Polygon
+from geometry.predicates import orient2d
+from geometry.prepared import PreparedPolygon
+from geometry.store import PolygonStore
+
+
+def exact_state(tri, p):
+    """1 enclosed, 0 on the boundary, -1 outside, for a counterclockwise triangle"""
+    signs = [orient2d(tri[i - 1], tri[i], p) for i in range(3)]
+    if all(s > 0 for s in signs):
+        return 1
+    if any(s < 0 for s in signs):
+        return -1
+    return 0
+
+
+def state(wn):
+    return 0 if wn is None else (1 if wn else -1)
+
+
+random.seed(0)
+triangles, queries = [], []
+for scale in (1, 1e3, 1e6):
+    while len(triangles) < 700 * (1 + [1, 1e3, 1e6].index(scale)):
+        tri = [(random.uniform(-scale, scale), random.uniform(-scale, scale)) for _ in range(3)]
+        if random.random() < 0.2:
+            tri[1] = (tri[1][0], tri[0][1])   # a horizontal edge
+        if orient2d(*tri) == 0:
+            continue
+        if orient2d(*tri) < 0:
+            tri.reverse()
+        pts = []
+        for _ in range(10):
+            a, b = random.sample(tri, 2)
+            t = random.random()
+            x, y = a[0] + t * (b[0] - a[0]), a[1] + t * (b[1] - a[1])
+            for _ in range(random.randrange(4)):
+                x = math.nextafter(x, random.choice((-math.inf, math.inf)))
+                y = math.nextafter(y, random.choice((-math.inf, math.inf)))
+            pts.append((x, y))
+        pts += tri
+        triangles.append(tri)
+        queries.append(pts)
+
+path = os.path.join(tempfile.mkdtemp(), 'triangles.store')
+PolygonStore.write(path, [Polygon(*t) for t in triangles])
+store = PolygonStore(path)
+
+counts = {-1: 0, 0: 0, 1: 0}
+for k, (tri, pts) in enumerate(zip(triangles, queries)):
+    pg = Polygon(*tri)
+    prepared = PreparedPolygon(pg)
+    view = store[k]
+    expected = [exact_state(tri, p) for p in pts]
+    for s in expected:
+        counts[s] += 1
+    assert [state(pg.winding_number(p)) for p in pts] == expected, (tri, pts)
+    assert [state(prepared.winding_number(p)) for p in pts] == expected, (tri, pts)
+    assert [state(view.winding_number(p)) for p in pts] == expected, (tri, pts)
+    wn = prepared.winding_numbers(np.array(pts))
+    assert [0 if w == -2**31 else (1 if w else -1) for w in wn.tolist()] == expected, (tri, pts)
+    assert prepared.encloses_points(pts).tolist() == [s == 1 for s in expected]
+    assert view.encloses_points(np.array(pts)).tolist() == [s == 1 for s in expected]
+    on_side = [any(side.contains(Point(p)) for side in pg.sides) for p in pts]
+    assert on_side == [s == 0 for s in expected], (tri, pts)
+
+print('outside/boundary/enclosed', counts)
@@ -0,0 +1,95 @@
+"""
+WKB and packed columnar round trips.
+
+Points, segments, lines, rays, polygons and collections, 2D and 3D, in both
+byte orders; EWKB input with flags and an SRID; random polygon sets through
+dumps_polygons/loads_polygons and dump_columnar/load_columnar, as Polygons
+and as (coords, offsets) arrays.
+"""
+import math
+import random
+import struct
+
+import numpy as np
+
+from geometry import wkb
+from geometry.line import Line, Ray, Segment
+from geometry.point import Point
+from geometry.polygon import Polygon
+
+random.seed(0)
+
+
+def star(n, dim=2):
+    cx, cy = random.uniform(-1e6, 1e6), random.uniform(-1e6, 1e6)
+    angles = sorted(random.uniform(0, 2 * math.pi) for _ in range(n))
+    ring = [(cx + math.cos(a) * random.uniform(1, 5), cy + math.sin(a) * random.uniform(1, 5)) for a in angles]
+    if dim == 3:
+        ring = [(x, y, 7.5) for x, y in ring]
+    return Polygon(*ring)
+
+
+polygons = [pg for pg in (star(random.randint(3, 30)) for _ in range(200)) if isinstance(pg, Polygon)]
+entities = [Point(1.5, -2), Point(1, 2, 3), Segment(Point(0, 0), Point(3, 4)),
+            Segment(Point(0, 0, 1), Point(3, 4, 5)), polygons[0], star(6, dim=3)]
+
+for order in '<>':
+    for e in entities:
+        assert wkb.loads(wkb.dumps(e, order)) == e, e
+    assert wkb.loads(wkb.dumps_many(entities, order)) == entities
+    assert wkb.loads(wkb.dumps([entities, []], order)) == [entities, []]
+    line = Line(Point(0, 0), Point(1, 1))
+    assert wkb.loads(wkb.dumps(line, order), linear=Line) == line
+    ray = Ray(Point(0, 0), Point(1, 1))
+    assert wkb.loads(wkb.dumps(ray, order), linear=Ray) == ray
+
+# EWKB: a PostGIS Point Z with SRID 4326, and a plain EWKB polygon
+ewkb = struct.pack('<BII3d', 1, 1 | 0x80000000 | 0x20000000, 4326, 1.0, 2.0, 3.0)
+assert wkb.loads(ewkb) == Point(1, 2, 3)
+ewkb = struct.pack('<BIIII8d', 1, 3 | 0x20000000, 4326, 1, 4, 0, 0, 1, 0, 0, 1, 0, 0)
+assert wkb.loads(ewkb) == Polygon((0, 0), (1, 0), (0, 1))
+
+for bad in (struct.pack('<BI3d', 1, 2001, 1, 2, 3), struct.pack('<BII', 1, 3, 2), struct.pack('<BI', 1, 99)):
+    try:
+        wkb.loads(bad)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(bad)
+
+# polygon sets as arrays
+coords, offsets = wkb.polygons_to_arrays(polygons)
+assert wkb.arrays_to_polygons(coords, offsets) == polygons
+for order in '<>':
+    for data in (wkb.dumps_polygons(polygons, order), wkb.dumps_polygons((coords, offsets), order)):
+        c, o = wkb.loads_polygons(data)
+        assert (c == coords).all() and (o == offsets).all()
+        assert wkb.loads(data) == polygons
+blobs = [wkb.dumps(pg) for pg in polygons]
+c, o = wkb.loads_polygons(blobs)
+assert (c == coords).all() and (o == offsets).all()
+c, o = wkb.loads_polygons(wkb.dumps_many(polygons[:3]))
+assert wkb.arrays_to_polygons(c, o) == polygons[:3]
+c, o = wkb.loads_polygons([])
+assert c.shape == (0, 2) and o.tolist() == [0]
+try:
+    wkb.loads_polygons([wkb.dumps(polygons[0]), wkb.dumps(star(5, dim=3))])
+except ValueError:
+    pass
+else:
+    raise AssertionError("mixed 2D and 3D polygons")
+
+for data in (wkb.dump_columnar(polygons), wkb.dump_columnar((coords, offsets))):
+    c, o = wkb.load_columnar(data)
+    assert (c == coords).all() and (o == offsets).all()
+    assert not c.flags.writeable
+c3, o3 = wkb.polygons_to_arrays([star(5, dim=3), star(9, dim=3)])
+c, o = wkb.load_columnar(wkb.dump_columnar((c3, o3)))
+assert (c == c3).all() and (o == o3).all()
+try:
+    wkb.load_columnar(b'XXXX' + wkb.dump_columnar(polygons)[4:])
+except ValueError:
+    pass
+else:
+    raise AssertionError("bad magic")
+print(len(polygons), 'polygons ok')
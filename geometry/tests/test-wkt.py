@@ -0,0 +1,72 @@
+"""
+WKT round trips, whole and streamed.
+
+Random entities of every kind are written with dump and read back with
+loads and with iter_load at chunk sizes that cut words, numbers and
+parentheses at every possible place; the results must equal the input.
+"""
+import io
+import math
+import random
+
+from geometry import wkt
+from geometry.line import Line, Ray, Segment
+from geometry.point import Point
+from geometry.polygon import Polygon
+
+random.seed(0)
+
+
+def coord():
+    return random.choice((random.randint(-9, 9), random.uniform(-1e6, 1e6), random.uniform(-1, 1) * 1e-300))
+
+
+def entity(depth=0):
+    kind = random.randrange(5 if depth < 2 else 4)
+    if kind == 0:
+        return Point(coord(), coord())
+    if kind == 1:
+        return Point(coord(), coord(), coord())
+    if kind == 2:
+        return Segment(Point(coord(), coord()), Point(coord(), coord()))
+    if kind == 3:
+        cx, cy = coord(), coord()
+        angles = sorted(random.uniform(0, 2 * math.pi) for _ in range(random.randint(3, 12)))
+        pg = Polygon(*[(cx + math.cos(a), cy + math.sin(a)) for a in angles])
+        return pg if isinstance(pg, Polygon) else entity(depth)
+    return [entity(depth + 1) for _ in range(random.randrange(4))]
+
+
+entities = [entity() for _ in range(300)]
+for e in entities:
+    assert wkt.loads(wkt.dumps(e)) == e, e
+
+out = io.StringIO()
+assert wkt.dump(entities, out) == len(entities)
+text = out.getvalue()
+for chunk_size in (1, 2, 3, 7, 64, 4096, wkt.CHUNK_SIZE):
+    assert list(wkt.iter_load(io.StringIO(text), chunk_size=chunk_size)) == entities, chunk_size
+    assert list(wkt.iter_load(io.StringIO(text.replace('\n', ' ')), chunk_size=chunk_size)) == entities
+
+# spelled out input: case, spacing, EMPTY, MULTI types, the linear classes
+text = '''point(1 2)POINT Z(1 2 3)
+  LINESTRING (0 0,1 1) linestring(0 0, 2 2)
+POLYGON ((0 0, 4 0, 4 4, 0 0)) MULTIPOINT ((1 2), (3 4)) MULTIPOINT (5 6, 7 8)
+MULTIPOLYGON (((0 0, 1 0, 0 1, 0 0))) GEOMETRYCOLLECTION EMPTY
+'''
+expected = [Point(1, 2), Point(1, 2, 3), Line(Point(0, 0), Point(1, 1)), Line(Point(0, 0), Point(2, 2)),
+            Polygon((0, 0), (4, 0), (4, 4)), [Point(1, 2), Point(3, 4)], [Point(5, 6), Point(7, 8)],
+            [Polygon((0, 0), (1, 0), (0, 1))], []]
+for chunk_size in (1, 5, 4096):
+    got = list(wkt.iter_load(io.StringIO(text), linear=Line, chunk_size=chunk_size))
+    assert got == expected, got
+assert wkt.loads('LINESTRING (0 0, 1 1)', linear=Ray) == Ray(Point(0, 0), Point(1, 1))
+
+for bad in ('POINT (1 2', 'POINT (1 2) x', 'CIRCLE (1 2)', 'LINESTRING (0 0, 1 1, 2 2)', 'POINT EMPTY', ''):
+    try:
+        wkt.loads(bad)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(bad)
+print(len(entities), 'entities ok')
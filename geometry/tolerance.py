@@ -0,0 +1,122 @@
+"""
+Tolerances for comparing coordinates.
+
+By default every comparison in the package is exact. A ``Tolerance`` makes
+two numbers count as equal when they differ by at most
+
+- ``abs``: an absolute amount,
+- ``rel``: a fraction of the larger magnitude, or
+- ``ulps``: that many representable floats,
+
+whichever is most lenient. Set one for a block of code with the
+``tolerance`` context manager, for the whole program with ``set_tolerance``,
+or pass ``tol=`` to a single call:
+
+    with tolerance(abs=1e-9):
+        seg.contains(p)                 # tolerant
+    seg.contains(p, tol=Tolerance(ulps=4))
+
+``Point.equals``, ``Polygon.equals``, ``Line.contains``, ``Ray.contains``
+and ``Segment.contains`` follow it; ``Point.__eq__`` and ``Polygon.__eq__``
+stay exact so that equal entities keep equal hashes. The array versions are in ``geometry.array``.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import struct
+
+
+def _ordinal(x):
+    """Map a float to an int so that adjacent floats map to adjacent ints"""
+    i = struct.unpack('<q', struct.pack('<d', x))[0]
+    return i if i >= 0 else -(i & 0x7fffffffffffffff)
+
+
+def ulp_distance(a, b):
+    """Number of representable floats between a and b"""
+    return abs(_ordinal(float(a)) - _ordinal(float(b)))
+
+
+class Tolerance(object):
+    """How far apart two numbers may be and still compare equal.
+
+    :param abs: absolute tolerance
+    :param rel: relative tolerance, a fraction of max(|a|, |b|)
+    :param ulps: tolerance in units in the last place
+    """
+    __slots__ = ('abs', 'rel', 'ulps')
+
+    def __init__(self, abs=0.0, rel=0.0, ulps=0):
+        if abs < 0 or rel < 0 or ulps < 0:
+            raise ValueError("tolerances can't be negative")
+        self.abs = abs
+        self.rel = rel
+        self.ulps = int(ulps)
+
+    def __repr__(self):
+        return "%s(abs=%r, rel=%r, ulps=%r)" % (type(self).__name__, self.abs, self.rel, self.ulps)
+
+    def __eq__(self, other):
+        return (isinstance(other, Tolerance)
+                and (self.abs, self.rel, self.ulps) == (other.abs, other.rel, other.ulps))
+
+    def __hash__(self):
+        return hash((self.abs, self.rel, self.ulps))
+
+    @property
+    def exact(self):
+        """True if only equal numbers compare equal"""
+        return not (self.abs or self.rel or self.ulps)
+
+    def eq(self, a, b):
+        """Return whether a and b are equal within the tolerance"""
+        if a == b:
+            return True
+        d = abs(a - b)
+        if d <= self.abs:
+            return True
+        if self.rel and d <= self.rel * max(abs(a), abs(b)):
+            return True
+        return bool(self.ulps) and ulp_distance(a, b) <= self.ulps
+
+    def zero(self, v):
+        """Return whether v is zero within the tolerance"""
+        return self.eq(v, 0.0)
+
+    def points_eq(self, p, q):
+        """Return whether every coordinate of p equals that of q within the tolerance"""
+        return all(self.eq(a, b) for a, b in zip(p, q))
+
+
+EXACT = Tolerance()
+
+_current = ContextVar('geometry_tolerance', default=EXACT)
+
+
+def get_tolerance():
+    """Return the tolerance in effect"""
+    return _current.get()
+
+
+def set_tolerance(tol=None, **kwargs):
+    """Make ``tol``, or ``Tolerance(**kwargs)``, the tolerance in effect"""
+    _current.set(tol if tol is not None else Tolerance(**kwargs))
+
+
+@contextmanager
+def tolerance(tol=None, **kwargs):
+    """Use ``tol``, or ``Tolerance(**kwargs)``, inside a with block"""
+    token = _current.set(tol if tol is not None else Tolerance(**kwargs))
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
+
+
+def resolve(tol):
+    """The tolerance a call should use: ``tol`` if given, a number meaning an
+    absolute tolerance, else the one in effect"""
+    if tol is None:
+        return _current.get()
+    if isinstance(tol, Tolerance):
+        return tol
+    return Tolerance(abs=tol)
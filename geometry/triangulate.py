@@ -0,0 +1,312 @@
+"""
+Triangulation of simple polygons.
+
+``triangulate`` cuts a polygon of n vertices into n - 2 triangles and returns
+them as one flat ``array('l')`` of vertex indexes, three per triangle, so a
+mesh of any size costs a single object. Every triangle is counterclockwise.
+
+Two algorithms are available:
+
+- 'monotone': a sweep from top to bottom adds the diagonals that split the
+  polygon into y-monotone pieces, and each piece is triangulated with a
+  stack in linear time; O(n log n) in all (de Berg et al., "Computational
+  Geometry", ch. 3).
+- 'earclip': repeatedly cut off an ear, a convex vertex whose triangle holds
+  no other vertex; O(n^2), but with less overhead for small polygons.
+
+Ear clipping spends its time testing the reflex vertices, so the default,
+'auto', picks it for polygons with at most ``EARCLIP_MAX_REFLEX`` reflex
+vertices, however many vertices they have, and the monotone partition for the
+rest. Should the partition meet a degenerate configuration, 'auto' falls back
+to ear clipping with a RuntimeWarning, and raises ValueError instead above
+``FALLBACK_MAX`` vertices, where ear clipping could take minutes. Orientation
+tests are exact (see geometry.predicates). The polygon must be simple.
+"""
+from array import array
+import math
+import warnings
+
+from .predicates import orient2d
+
+METHODS = ('auto', 'monotone', 'earclip')
+
+# polygons with at most this many reflex vertices are ear clipped by default;
+# measured, ear clipping is faster up to 12 to 16 whatever the polygon's size
+EARCLIP_MAX_REFLEX = 12
+
+# the most vertices 'auto' will ear clip when the monotone partition fails
+FALLBACK_MAX = 1000
+
+
+class _Degenerate(Exception):
+    """The monotone partition can't go on; ear clipping takes over"""
+
+
+def _above(p, q):
+    """Whether p comes before q in the sweep: higher, or as high and to the left"""
+    return p[1] > q[1] or (p[1] == q[1] and p[0] < q[0])
+
+
+def _reflex(pts):
+    """The indexes of the reflex (and flat) vertices of the counterclockwise ring pts"""
+    n = len(pts)
+    return set(i for i in range(n) if orient2d(pts[i - 1], pts[i], pts[(i + 1) % n]) <= 0)
+
+
+def _earclip(pts, reflex=None):
+    """Triangles (i, j, k) of the counterclockwise ring pts by ear clipping"""
+    n = len(pts)
+    prev = [i - 1 for i in range(n)]
+    prev[0] = n - 1
+    nxt = [i + 1 for i in range(n)]
+    nxt[-1] = 0
+
+    def convex(i):
+        return orient2d(pts[prev[i]], pts[i], pts[nxt[i]]) > 0
+
+    if reflex is None:
+        reflex = _reflex(pts)
+
+    def is_ear(i):
+        if i in reflex:
+            return False
+        a, b, c = pts[prev[i]], pts[i], pts[nxt[i]]
+        for r in reflex:
+            p = pts[r]
+            if r == prev[i] or r == nxt[i] or p == a or p == b or p == c:
+                continue
+            if orient2d(a, b, p) >= 0 and orient2d(b, c, p) >= 0 and orient2d(c, a, p) >= 0:
+                return False
+        return True
+
+    triangles = []
+    i = 0
+    remaining = n
+    misses = 0
+    while remaining > 3:
+        if is_ear(i):
+            p, q = prev[i], nxt[i]
+            triangles.append((p, i, q))
+            nxt[p], prev[q] = q, p
+            remaining -= 1
+            misses = 0
+            for j in (p, q):
+                if j in reflex and convex(j):
+                    reflex.discard(j)
+            i = q
+        else:
+            misses += 1
+            if misses > remaining:
+                raise ValueError("no ear left to cut; is the polygon simple?")
+            i = nxt[i]
+    triangles.append((prev[i], i, nxt[i]))
+    return triangles
+
+
+def _diagonals(pts):
+    """The diagonals (i, j) that cut the counterclockwise ring pts into
+    y-monotone pieces"""
+    n = len(pts)
+    order = sorted(range(n), key=lambda i: (-pts[i][1], pts[i][0]))
+
+    # left boundary edges cut by the sweep line, left to right; edge i runs
+    # from vertex i down to vertex i + 1
+    status = []
+    helper = {}
+    merge = set()
+    diagonals = []
+
+    def upper(e):
+        return pts[e]
+
+    def lower(e):
+        return pts[(e + 1) % n]
+
+    def left_of(v):
+        """Position in status of the first edge that isn't left of the point v"""
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if orient2d(upper(status[mid]), lower(status[mid]), v) > 0:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def insert(e, v):
+        status.insert(left_of(pts[v]), e)
+        helper[e] = v
+
+    def remove(e, v):
+        """Close edge e at its lower vertex v"""
+        if helper[e] in merge:
+            diagonals.append((v, helper[e]))
+        # v is on e, so e is the first edge not left of it
+        k = left_of(pts[v])
+        if k < len(status) and status[k] == e:
+            del status[k]
+            return
+        try:
+            status.remove(e)
+        except ValueError:
+            raise _Degenerate()
+
+    def update_left(v):
+        """Fix up the edge directly left of v, which v becomes the helper of"""
+        k = left_of(pts[v]) - 1
+        if k < 0:
+            raise _Degenerate()
+        e = status[k]
+        if helper[e] in merge:
+            diagonals.append((v, helper[e]))
+        helper[e] = v
+
+    for v in order:
+        p, q, r = pts[v - 1], pts[v], pts[(v + 1) % n]
+        prev_below, next_below = _above(q, p), _above(q, r)
+        turn = orient2d(p, q, r)
+        if prev_below and next_below:
+            if turn > 0:
+                # start vertex
+                insert(v, v)
+            else:
+                # split vertex: connect it to the helper of the edge on its left
+                k = left_of(q) - 1
+                if k < 0:
+                    raise _Degenerate()
+                e = status[k]
+                diagonals.append((v, helper[e]))
+                helper[e] = v
+                insert(v, v)
+        elif not prev_below and not next_below:
+            remove((v - 1) % n, v)
+            if turn <= 0:
+                # merge vertex
+                merge.add(v)
+                update_left(v)
+        elif not prev_below:
+            # on the left boundary, the interior is to the right
+            remove((v - 1) % n, v)
+            insert(v, v)
+        else:
+            update_left(v)
+    return diagonals
+
+
+def _pieces(pts, diagonals):
+    """The rings, counterclockwise, that the diagonals cut the ring pts into"""
+    n = len(pts)
+    out = [[(i + 1) % n] for i in range(n)]
+    for i, j in diagonals:
+        out[i].append(j)
+        out[j].append(i)
+
+    def turn(u, v, w):
+        # clockwise angle from v -> u round to v -> w, in (0, 2 pi]
+        back = math.atan2(pts[u][1] - pts[v][1], pts[u][0] - pts[v][0])
+        ahead = math.atan2(pts[w][1] - pts[v][1], pts[w][0] - pts[v][0])
+        return (back - ahead) % (2 * math.pi) or 2 * math.pi
+
+    used = set()
+    pieces = []
+    for u0 in range(n):
+        for v0 in out[u0]:
+            if (u0, v0) in used:
+                continue
+            ring = [u0]
+            u, v = u0, v0
+            while (u, v) not in used:
+                used.add((u, v))
+                ring.append(v)
+                targets = out[v]
+                w = targets[0] if len(targets) == 1 else min(targets, key=lambda w: turn(u, v, w))
+                u, v = v, w
+            if (u, v) != (u0, v0):
+                raise _Degenerate()
+            ring.pop()
+            pieces.append(ring)
+    return pieces
+
+
+def _monotone(pts, ring):
+    """Triangles of the y-monotone counterclockwise piece ring (indexes into pts)"""
+    m = len(ring)
+    if m == 3:
+        return [tuple(ring)]
+    top = min(range(m), key=lambda k: (-pts[ring[k]][1], pts[ring[k]][0]))
+    bottom = min(range(m), key=lambda k: (pts[ring[k]][1], -pts[ring[k]][0]))
+    # counterclockwise from the top runs down the left chain
+    left = set()
+    k = top
+    while k != bottom:
+        left.add(ring[k])
+        k = (k + 1) % m
+    order = sorted(ring, key=lambda i: (-pts[i][1], pts[i][0]))
+
+    def ccw(a, b, c):
+        return (a, b, c) if orient2d(pts[a], pts[b], pts[c]) >= 0 else (a, c, b)
+
+    triangles = []
+    stack = [order[0], order[1]]
+    for u in order[2:-1]:
+        if (u in left) != (stack[-1] in left):
+            # opposite chains: fan from u to the whole stack
+            for a, b in zip(stack, stack[1:]):
+                triangles.append(ccw(u, a, b))
+            stack = [stack[-1], u]
+        else:
+            last = stack.pop()
+            sign = 1 if u in left else -1
+            while stack and sign * orient2d(pts[stack[-1]], pts[last], pts[u]) > 0:
+                triangles.append(ccw(u, last, stack[-1]))
+                last = stack.pop()
+            stack.append(last)
+            stack.append(u)
+    u = order[-1]
+    for a, b in zip(stack, stack[1:]):
+        triangles.append(ccw(u, a, b))
+    if len(triangles) != m - 2:
+        raise _Degenerate()
+    return triangles
+
+
+def triangulate(polygon, method='auto'):
+    """Return the triangles of a simple 2D polygon as a flat ``array('l')`` of
+    indexes into ``polygon.args``, three per counterclockwise triangle.
+
+    :param method: 'auto', 'monotone' or 'earclip'
+    """
+    if method not in METHODS:
+        raise ValueError("unknown method %r, expected one of %s" % (method, ', '.join(METHODS)))
+    args = polygon.args
+    if len(args[0]) != 2:
+        raise ValueError("only 2D polygons can be triangulated")
+    n = len(args)
+    ids = list(range(n))
+    if polygon.area < 0:
+        ids.reverse()
+    pts = [args[i].args for i in ids]
+
+    reflex = None
+    if method == 'auto':
+        reflex = _reflex(pts)
+        method = 'earclip' if len(reflex) <= EARCLIP_MAX_REFLEX else 'monotone'
+        fallback = True
+    else:
+        fallback = False
+
+    if method == 'monotone':
+        try:
+            triangles = [t for ring in _pieces(pts, _diagonals(pts)) for t in _monotone(pts, ring)]
+        except _Degenerate:
+            if not fallback:
+                raise ValueError("the monotone partition failed; is the polygon simple?")
+            if n > FALLBACK_MAX:
+                raise ValueError("the monotone partition failed on %d vertices; is the polygon simple? "
+                                 "method='earclip' may still work, in O(n^2) time" % n)
+            warnings.warn("the monotone partition failed; ear clipping %d vertices instead" % n,
+                          RuntimeWarning, stacklevel=2)
+            method = 'earclip'
+    if method == 'earclip':
+        triangles = _earclip(pts, reflex)
+    return array('l', (ids[i] for t in triangles for i in t))
@@ -0,0 +1,303 @@
+"""
+Binary serialization: WKB and a packed columnar format.
+
+WKB (Well-Known Binary, OGC Simple Features) is what databases and GIS tools
+exchange. ``dumps``/``loads`` convert single entities:
+
+    ========================  ==========================================
+    Point2D / Point3D         Point / Point Z
+    Segment, Line, Ray        LineString of the two defining points
+    Polygon, Triangle         Polygon with one closed ring
+    list of entities          GeometryCollection (``dumps_many``)
+    ========================  ==========================================
+
+WKB has no infinite lines, so a 2-point LineString is read back as the class
+passed as ``linear`` (Segment by default). Z coordinates are written with ISO
+type codes (1001, 1002, ...); EWKB input (PostGIS, with flag bits and an
+optional SRID) is read too.
+
+Large polygon sets don't go through Polygon objects at all:
+``dumps_polygons``/``loads_polygons`` convert between a WKB MultiPolygon and
+the arrays ``(coords, offsets)``, where the vertices of polygon i are
+``coords[offsets[i]:offsets[i + 1]]`` (rings open, one row per vertex). The
+columnar format of ``dump_columnar``/``load_columnar`` stores exactly those two
+arrays after a small header, so loading is a pair of ``np.frombuffer`` calls.
+
+This module needs numpy.
+"""
+import struct
+
+import numpy as np
+
+from .point import Point
+from .line import LinearEntity, Segment
+from .polygon import Polygon
+
+WKB_POINT = 1
+WKB_LINESTRING = 2
+WKB_POLYGON = 3
+WKB_MULTIPOINT = 4
+WKB_MULTILINESTRING = 5
+WKB_MULTIPOLYGON = 6
+WKB_GEOMETRYCOLLECTION = 7
+
+# EWKB flag bits
+_EWKB_Z = 0x80000000
+_EWKB_M = 0x40000000
+_EWKB_SRID = 0x20000000
+
+_ORDERS = {'<': 1, '>': 0}
+
+
+def _header(kind, dim, order):
+    return struct.pack(order + 'BI', _ORDERS[order], kind + (1000 if dim == 3 else 0))
+
+
+def _coords(points, order):
+    flat = [c for p in points for c in p]
+    return struct.pack('%s%dd' % (order, len(flat)), *flat)
+
+
+def _write(entity, order, out):
+    if isinstance(entity, Point):
+        out.append(_header(WKB_POINT, len(entity), order))
+        out.append(_coords([entity.args], order))
+    elif isinstance(entity, LinearEntity):
+        out.append(_header(WKB_LINESTRING, len(entity.p1), order))
+        out.append(struct.pack(order + 'I', 2))
+        out.append(_coords(entity.args, order))
+    elif isinstance(entity, Polygon):
+        args = entity.args
+        out.append(_header(WKB_POLYGON, len(args[0]), order))
+        out.append(struct.pack(order + 'II', 1, len(args) + 1))
+        out.append(_coords([p.args for p in args] + [args[0].args], order))
+    elif isinstance(entity, (list, tuple)):
+        dim = 3 if any(_dim(e) == 3 for e in entity) else 2
+        out.append(_header(WKB_GEOMETRYCOLLECTION, dim, order))
+        out.append(struct.pack(order + 'I', len(entity)))
+        for e in entity:
+            _write(e, order, out)
+    else:
+        raise ValueError("can't write %s as WKB" % type(entity).__name__)
+
+
+def _dim(entity):
+    if isinstance(entity, Point):
+        return len(entity)
+    if isinstance(entity, (list, tuple)):
+        return max([_dim(e) for e in entity] or [2])
+    return len(entity.args[0])
+
+
+def dumps(entity, byteorder='<'):
+    """Return the WKB of a Point, linear entity or Polygon as bytes.
+
+    :param byteorder: '<' little endian (the usual) or '>' big endian
+    """
+    if byteorder not in _ORDERS:
+        raise ValueError("byteorder must be '<' or '>'")
+    out = []
+    _write(entity, byteorder, out)
+    return b''.join(out)
+
+
+def dumps_many(entities, byteorder='<'):
+    """Return a WKB GeometryCollection of the entities"""
+    return dumps(list(entities), byteorder)
+
+
+def _read_header(data, pos):
+    """Return (type, dim, byte order, position after the header)"""
+    order = '<' if data[pos] == 1 else '>'
+    kind, = struct.unpack_from(order + 'I', data, pos + 1)
+    pos += 5
+    dim = 2
+    if kind & (_EWKB_Z | _EWKB_M | _EWKB_SRID):
+        if kind & _EWKB_M:
+            raise ValueError("WKB with M coordinates isn't supported")
+        if kind & _EWKB_Z:
+            dim = 3
+        if kind & _EWKB_SRID:
+            pos += 4
+        kind &= 0xffff
+    if kind > 1000:
+        if kind // 1000 != 1:
+            raise ValueError("WKB with M coordinates isn't supported")
+        dim = 3
+        kind %= 1000
+    return kind, dim, order, pos
+
+
+def _read_points(data, pos, n, dim, order):
+    flat = struct.unpack_from('%s%dd' % (order, n * dim), data, pos)
+    pts = [Point._trusted(*flat[i:i + dim]) for i in range(0, len(flat), dim)]
+    return pts, pos + 8 * n * dim
+
+
+def _read(data, pos, linear, validate):
+    kind, dim, order, pos = _read_header(data, pos)
+    if kind == WKB_POINT:
+        pts, pos = _read_points(data, pos, 1, dim, order)
+        return pts[0], pos
+    if kind == WKB_LINESTRING:
+        n, = struct.unpack_from(order + 'I', data, pos)
+        if n != 2:
+            raise ValueError("only 2-point LineStrings can be read, got %d points" % n)
+        pts, pos = _read_points(data, pos + 4, 2, dim, order)
+        return linear(*pts), pos
+    if kind == WKB_POLYGON:
+        rings, = struct.unpack_from(order + 'I', data, pos)
+        if rings != 1:
+            raise ValueError("only Polygons without holes can be read, got %d rings" % rings)
+        n, = struct.unpack_from(order + 'I', data, pos + 4)
+        pts, pos = _read_points(data, pos + 8, n, dim, order)
+        if len(pts) > 1 and pts[0] == pts[-1]:
+            pts.pop()
+        return Polygon(*pts, validate=validate), pos
+    if kind in (WKB_MULTIPOINT, WKB_MULTILINESTRING, WKB_MULTIPOLYGON, WKB_GEOMETRYCOLLECTION):
+        n, = struct.unpack_from(order + 'I', data, pos)
+        pos += 4
+        entities = []
+        for _ in range(n):
+            e, pos = _read(data, pos, linear, validate)
+            entities.append(e)
+        return entities, pos
+    raise ValueError("unsupported WKB geometry type %d" % kind)
+
+
+def loads(data, linear=Segment, validate=True):
+    """Return the entity encoded in WKB bytes; a list for multi geometries and collections.
+
+    :param linear: the class built from a 2-point LineString: Segment, Line or Ray
+    :param validate: passed to Polygon; False skips the vertex normalization
+        for data known to be clean
+    """
+    entity, _ = _read(memoryview(data).cast('B'), 0, linear, validate)
+    return entity
+
+
+def _pack_arrays(coords, offsets):
+    """Return (coords, offsets) as an (N, dim) float array and int64 offsets"""
+    coords = np.asarray(coords, dtype=float)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if coords.ndim != 2 or coords.shape[1] not in (2, 3):
+        raise ValueError("coords must have shape (N, 2) or (N, 3)")
+    if offsets.ndim != 1 or not len(offsets) or offsets[0] != 0 or offsets[-1] != len(coords):
+        raise ValueError("offsets must run from 0 to len(coords)")
+    return coords, offsets
+
+
+def polygons_to_arrays(polygons):
+    """Return ``(coords, offsets)`` for a sequence of Polygons"""
+    rows = []
+    offsets = [0]
+    for pg in polygons:
+        rows.extend(p.args for p in pg.args)
+        offsets.append(len(rows))
+    dim = len(rows[0]) if rows else 2
+    return np.array(rows, dtype=float).reshape(-1, dim), np.array(offsets, dtype=np.int64)
+
+
+def arrays_to_polygons(coords, offsets, validate=False):
+    """Build Polygon objects from ``(coords, offsets)``"""
+    rows = coords.tolist()
+    return [Polygon(*[Point._trusted(*r) for r in rows[offsets[i]:offsets[i + 1]]], validate=validate)
+            for i in range(len(offsets) - 1)]
+
+
+def dumps_polygons(polygons, byteorder='<'):
+    """Return a WKB MultiPolygon, from Polygons or from ``(coords, offsets)`` arrays.
+    Each polygon is written with numpy, not vertex by vertex."""
+    if isinstance(polygons, tuple) and len(polygons) == 2 and isinstance(polygons[0], np.ndarray):
+        coords, offsets = _pack_arrays(*polygons)
+    else:
+        coords, offsets = polygons_to_arrays(polygons)
+    if byteorder not in _ORDERS:
+        raise ValueError("byteorder must be '<' or '>'")
+    dim = coords.shape[1]
+    coords = coords.astype(byteorder + 'f8', copy=False)
+    polygon_header = _header(WKB_POLYGON, dim, byteorder)
+    out = [_header(WKB_MULTIPOLYGON, dim, byteorder), struct.pack(byteorder + 'I', len(offsets) - 1)]
+    for i in range(len(offsets) - 1):
+        a, b = offsets[i], offsets[i + 1]
+        out.append(polygon_header)
+        out.append(struct.pack(byteorder + 'II', 1, b - a + 1))
+        out.append(coords[a:b].tobytes())
+        out.append(coords[a].tobytes())
+    return b''.join(out)
+
+
+def loads_polygons(data):
+    """Decode polygons straight into ``(coords, offsets)`` arrays without
+    building Point or Polygon objects.
+
+    :param data: WKB bytes of a Polygon, MultiPolygon or GeometryCollection of
+        Polygons, or an iterable of such blobs (e.g. rows from a database)
+    """
+    blocks = []
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = [data]
+    for blob in data:
+        _collect_rings(memoryview(blob).cast('B'), 0, blocks)
+    if not blocks:
+        return np.empty((0, 2)), np.zeros(1, dtype=np.int64)
+    dims = set(b.shape[1] for b in blocks)
+    if len(dims) > 1:
+        raise ValueError("can't mix 2D and 3D polygons")
+    offsets = np.zeros(len(blocks) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in blocks], out=offsets[1:])
+    return np.concatenate(blocks).astype(float, copy=False), offsets
+
+
+def _collect_rings(data, pos, blocks):
+    kind, dim, order, pos = _read_header(data, pos)
+    if kind == WKB_POLYGON:
+        rings, n = struct.unpack_from(order + 'II', data, pos)
+        if rings != 1:
+            raise ValueError("only Polygons without holes can be read, got %d rings" % rings)
+        ring = np.frombuffer(data, dtype=order + 'f8', count=n * dim, offset=pos + 8).reshape(n, dim)
+        if n > 1 and (ring[0] == ring[-1]).all():
+            ring = ring[:-1]
+        blocks.append(ring)
+        return pos + 8 + 8 * n * dim
+    if kind in (WKB_MULTIPOLYGON, WKB_GEOMETRYCOLLECTION):
+        n, = struct.unpack_from(order + 'I', data, pos)
+        pos += 4
+        for _ in range(n):
+            pos = _collect_rings(data, pos, blocks)
+        return pos
+    raise ValueError("expected WKB polygons, got geometry type %d" % kind)
+
+
+# ---------------- packed columnar format ----------------
+# little endian: magic, format version, dim, polygon count, vertex count,
+# then offsets as int64 and coords as float64
+
+_MAGIC = b'GEOC'
+_COLUMNAR_VERSION = 1
+_COLUMNAR_HEADER = struct.Struct('<4sHHQQ')
+
+
+def dump_columnar(polygons):
+    """Return Polygons or ``(coords, offsets)`` arrays in the packed columnar format"""
+    if isinstance(polygons, tuple) and len(polygons) == 2 and isinstance(polygons[0], np.ndarray):
+        coords, offsets = _pack_arrays(*polygons)
+    else:
+        coords, offsets = polygons_to_arrays(polygons)
+    header = _COLUMNAR_HEADER.pack(_MAGIC, _COLUMNAR_VERSION, coords.shape[1], len(offsets) - 1, len(coords))
+    return b''.join((header, offsets.astype('<i8', copy=False).tobytes(),
+                     coords.astype('<f8', copy=False).tobytes()))
+
+
+def load_columnar(data):
+    """Return the ``(coords, offsets)`` arrays stored by ``dump_columnar``.
+    The arrays are read-only views of ``data``, nothing is copied."""
+    magic, version, dim, n, m = _COLUMNAR_HEADER.unpack_from(data, 0)
+    if magic != _MAGIC:
+        raise ValueError("not packed columnar geometry data")
+    if version != _COLUMNAR_VERSION:
+        raise ValueError("unsupported columnar format version %d" % version)
+    pos = _COLUMNAR_HEADER.size
+    offsets = np.frombuffer(data, dtype='<i8', count=n + 1, offset=pos)
+    coords = np.frombuffer(data, dtype='<f8', count=m * dim, offset=pos + 8 * (n + 1)).reshape(m, dim)
+    return coords, offsets
@@ -0,0 +1,241 @@
+"""
+Streaming WKT (Well-Known Text) reading and writing.
+
+    POINT (1 2)                          Point2D
+    POINT Z (1 2 3)                      Point3D
+    LINESTRING (0 0, 1 1)                Segment2D (or Line2D, Ray2D, see ``linear``)
+    POLYGON ((0 0, 4 0, 4 4, 0 0))       Polygon / Triangle
+    MULTIPOINT, MULTILINESTRING,
+    MULTIPOLYGON, GEOMETRYCOLLECTION     list of the above
+
+``iter_load`` reads a file of WKT geometries, one after another (usually one
+per line), in chunks, and yields each entity as soon as its text is complete,
+so files of any size are read in constant memory. ``dump`` writes entities
+one per line from any iterable.
+
+WKT has no infinite lines: Line and Ray are written as the LINESTRING of
+their two defining points and read back as the ``linear`` class.
+"""
+import re
+
+from .point import Point
+from .line import LinearEntity, Segment
+from .polygon import Polygon
+
+CHUNK_SIZE = 1 << 16
+
+_TOKEN = re.compile(r'[A-Za-z_]+|[-+.\d][-+.\deE]*|\S')
+_DELIMITERS = ' \t\r\n(),;='
+
+
+def _tokens(fp, chunk_size=CHUNK_SIZE):
+    """Yield the WKT tokens of a text file read chunk by chunk"""
+    carry = ''
+    while True:
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            break
+        text = carry + chunk
+        tokens = _TOKEN.findall(text)
+        carry = ''
+        # a word or number at the very end may go on in the next chunk
+        if tokens and text[-1] not in _DELIMITERS:
+            carry = tokens.pop()
+        for t in tokens:
+            yield t
+    if carry:
+        yield carry
+
+
+class _Parser(object):
+
+    def __init__(self, tokens, linear, validate):
+        self.tokens = tokens
+        self.linear = linear
+        self.validate = validate
+        self.ahead = None
+
+    def peek(self):
+        if self.ahead is None:
+            self.ahead = next(self.tokens, None)
+        return self.ahead
+
+    def take(self, expected=None):
+        t = self.peek()
+        self.ahead = None
+        if t is None:
+            raise ValueError("unexpected end of WKT")
+        if expected is not None and t != expected:
+            raise ValueError("expected %r in WKT, got %r" % (expected, t))
+        return t
+
+    def number(self):
+        t = self.take()
+        try:
+            return int(t) if t.lstrip('+-').isdigit() else float(t)
+        except ValueError:
+            raise ValueError("expected a number in WKT, got %r" % t)
+
+    def coords(self):
+        """One vertex, up to the next ',' or ')'"""
+        c = [self.number(), self.number()]
+        while self.peek() not in (',', ')'):
+            c.append(self.number())
+        if len(c) > 3:
+            raise ValueError("WKT with M coordinates isn't supported")
+        return Point._trusted(*c)
+
+    def points(self):
+        """'(' vertex, vertex, ... ')'"""
+        self.take('(')
+        pts = [self.coords()]
+        while self.take() == ',':
+            pts.append(self.coords())
+        return pts
+
+    def empty(self):
+        if (self.peek() or '').upper() == 'EMPTY':
+            self.take()
+            return True
+        return False
+
+    def polygon(self):
+        self.take('(')
+        ring = self.points()
+        if self.take() != ')':
+            raise ValueError("only POLYGONs without holes can be read")
+        if len(ring) > 1 and ring[0] == ring[-1]:
+            ring.pop()
+        return Polygon(*ring, validate=self.validate)
+
+    def linestring(self):
+        pts = self.points()
+        if len(pts) != 2:
+            raise ValueError("only 2-point LINESTRINGs can be read, got %d points" % len(pts))
+        return self.linear(*pts)
+
+    def members(self, read):
+        self.take('(')
+        items = [read()]
+        while self.take() == ',':
+            items.append(read())
+        return items
+
+    def multipoint(self):
+        # both MULTIPOINT (1 2, 3 4) and MULTIPOINT ((1 2), (3 4)) are valid
+        self.take('(')
+        pts = []
+        while True:
+            if self.peek() == '(':
+                self.take()
+                pts.append(self.coords())
+                self.take(')')
+            else:
+                pts.append(self.coords())
+            if self.take() != ',':
+                return pts
+
+    def geometry(self):
+        """Parse one tagged geometry, or return None at the end of the input"""
+        word = self.peek()
+        if word is None:
+            return None
+        word = self.take().upper()
+        if word == 'SRID':
+            self.take('=')
+            self.number()
+            self.take(';')
+            word = self.take().upper()
+        if (self.peek() or '').upper() in ('Z', 'M', 'ZM'):
+            if self.take().upper() != 'Z':
+                raise ValueError("WKT with M coordinates isn't supported")
+        if self.empty():
+            if word in ('POINT', 'LINESTRING', 'POLYGON'):
+                raise ValueError("empty %s can't be represented" % word)
+            return []
+        if word == 'POINT':
+            pts = self.points()
+            if len(pts) != 1:
+                raise ValueError("POINT with %d coordinates" % len(pts))
+            return pts[0]
+        if word == 'LINESTRING':
+            return self.linestring()
+        if word == 'POLYGON':
+            return self.polygon()
+        if word == 'MULTIPOINT':
+            return self.multipoint()
+        if word == 'MULTILINESTRING':
+            return self.members(self.linestring)
+        if word == 'MULTIPOLYGON':
+            return self.members(self.polygon)
+        if word == 'GEOMETRYCOLLECTION':
+            return self.members(self.geometry)
+        raise ValueError("unknown WKT geometry %r" % word)
+
+
+def iter_load(source, linear=Segment, validate=True, chunk_size=CHUNK_SIZE):
+    """Yield the entities of a WKT file one at a time.
+
+    :param source: a text file object, or a path
+    :param linear: the class built from a 2-point LINESTRING: Segment, Line or Ray
+    :param validate: passed to Polygon; False skips the vertex normalization
+        for input known to be clean
+    """
+    if isinstance(source, str):
+        with open(source) as fp:
+            for e in iter_load(fp, linear, validate, chunk_size):
+                yield e
+        return
+    parser = _Parser(_tokens(source, chunk_size), linear, validate)
+    while True:
+        e = parser.geometry()
+        if e is None:
+            return
+        yield e
+
+
+def loads(text, linear=Segment, validate=True):
+    """Return the entity described by a WKT string (a list for multi geometries)"""
+    parser = _Parser(iter(_TOKEN.findall(text)), linear, validate)
+    e = parser.geometry()
+    if e is None:
+        raise ValueError("empty WKT")
+    if parser.peek() is not None:
+        raise ValueError("unexpected %r after the WKT geometry" % parser.peek())
+    return e
+
+
+def _num(v):
+    return repr(v) if isinstance(v, float) else str(v)
+
+
+def _coords(points):
+    return ', '.join(' '.join(_num(c) for c in p.args) for p in points)
+
+
+def dumps(entity):
+    """Return the WKT of a Point, linear entity, Polygon, or a list of them
+    (as a GEOMETRYCOLLECTION)"""
+    if isinstance(entity, Point):
+        return 'POINT%s (%s)' % (' Z' if len(entity) == 3 else '', _coords([entity]))
+    if isinstance(entity, LinearEntity):
+        return 'LINESTRING%s (%s)' % (' Z' if len(entity.p1) == 3 else '', _coords(entity.args))
+    if isinstance(entity, Polygon):
+        args = entity.args
+        return 'POLYGON%s ((%s))' % (' Z' if len(args[0]) == 3 else '', _coords(args + args[:1]))
+    if isinstance(entity, (list, tuple)):
+        if not entity:
+            return 'GEOMETRYCOLLECTION EMPTY'
+        return 'GEOMETRYCOLLECTION (%s)' % ', '.join(dumps(e) for e in entity)
+    raise ValueError("can't write %s as WKT" % type(entity).__name__)
+
+
+def dump(entities, fp):
+    """Write the entities to a text file object, one WKT per line.
+    Returns the number written."""
+    n = 0
+    for e in entities:
+        fp.write(dumps(e))
+        fp.write('\n')
+        n += 1
+    return n